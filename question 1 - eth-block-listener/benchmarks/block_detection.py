@@ -0,0 +1,140 @@
+"""
+Compare block detection latency and RPC cost of the listener's block sources.
+
+Run from the project root:
+    python -m benchmarks.block_detection --blocks 10 --block-time 2
+
+Each mode watches the same stand-in node for the same number of blocks:
+"fixed" is the original 2-second block_number poll, "adaptive" is
+BlockSource without a WebSocket and "subscription" is BlockSource on
+newHeads. Latency is measured from the moment the node produced a block.
+Results are printed (and optionally written) as JSON.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import time
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from block_source import BlockSource
+from local_node import LocalNode
+
+
+def percentile(sorted_values, fraction):
+    """
+    Read a percentile from pre-sorted values (nearest rank).
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): Percentile as a fraction (0.99 for p99)
+
+    Returns:
+        float: Percentile value or None if there are no values
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def fixed_poll(w3, interval):
+    """
+    Yield new block numbers the way the original listener found them.
+
+    Args:
+        w3 (AsyncWeb3): HTTP connection
+        interval (float): Seconds between polls
+
+    Yields:
+        int: Latest block number, whenever it has changed
+    """
+    current = await w3.eth.block_number
+    while True:
+        await asyncio.sleep(interval)
+        latest = await w3.eth.block_number
+        if latest > current:
+            current = latest
+            yield latest
+
+
+async def measure(mode, num_blocks, block_time, poll_interval):
+    """
+    Watch a fresh stand-in node for num_blocks blocks.
+
+    Args:
+        mode (str): "fixed", "adaptive" or "subscription"
+        num_blocks (int): Blocks to wait for
+        block_time (float): Seconds between blocks on the node
+        poll_interval (float): Poll interval of the fixed mode
+
+    Returns:
+        dict: Latency and RPC call metrics
+    """
+    node = LocalNode(block_time)
+    port = await node.start(port=0)
+    w3 = AsyncWeb3(AsyncHTTPProvider(f"http://127.0.0.1:{port}"))
+    ws_url = f"ws://127.0.0.1:{port}" if mode == "subscription" else None
+
+    if mode == "fixed":
+        numbers = fixed_poll(w3, poll_interval)
+    else:
+        source = BlockSource(w3, ws_url, block_time=block_time)
+        numbers = (header["number"] async for header in source.heads())
+
+    latencies = []
+    first = last = None
+    try:
+        async for number in numbers:
+            latencies.append(time.perf_counter() - node.mined_at[number])
+            first = number if first is None else first
+            last = number
+            if len(latencies) == num_blocks:
+                break
+    finally:
+        await numbers.aclose()
+        await node.stop()
+
+    latencies.sort()
+    to_ms = lambda seconds: None if seconds is None else seconds * 1000
+    produced = last - first + 1
+    return {
+        "blocks_seen": len(latencies),
+        "blocks_missed": produced - len(latencies),
+        "rpc_calls": sum(node.calls.values()),
+        "rpc_calls_per_block": sum(node.calls.values()) / produced,
+        "latency_ms": {
+            "mean": to_ms(sum(latencies) / len(latencies)),
+            "p50": to_ms(percentile(latencies, 0.50)),
+            "max": to_ms(latencies[-1]),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=10)
+    parser.add_argument("--block-time", type=float, default=2.0)
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Interval of the fixed poll")
+    parser.add_argument("--modes", default="fixed,adaptive,subscription")
+    parser.add_argument("--output", help="Also write the JSON result to this file")
+    args = parser.parse_args()
+
+    metrics = {
+        mode: asyncio.run(measure(mode, args.blocks, args.block_time, args.poll_interval))
+        for mode in args.modes.split(",")
+    }
+    result = {
+        "benchmark": "block_detection",
+        "python": platform.python_version(),
+        "params": vars(args),
+        "metrics": metrics,
+    }
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Record, generate and load block fixtures for the log indexing benchmark.
+
+A fixture is a gzipped JSON file with consecutive block headers and all of
+their logs, in JSON-RPC form. Record one from a node (transactions are not
+kept):
+
+    RPC_HTTP_URL=https://... python -m benchmarks.block_fixture --from-block 6000000 --blocks 500 --output sepolia.json.gz
+
+Without a node, a synthetic fixture with a similar shape can be written:
+blocks full of ERC-20 transfers among many accounts, with a few transfers
+of the watched addresses mixed in and logsBloom computed as a node would.
+
+    python -m benchmarks.block_fixture --synthetic --blocks 500 --output synthetic.json.gz
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import random
+from eth_utils import keccak
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from log_indexer import TRANSFER_TOPIC, address_topic, bloom_mask
+
+APPROVAL_TOPIC = "0x" + keccak(text="Approval(address,address,uint256)").hex()
+SWAP_TOPIC = "0x" + keccak(text="Swap(address,uint256,uint256,uint256,uint256,address)").hex()
+
+
+def save_fixture(path, blocks, logs, watched=None):
+    """
+    Write a fixture.
+
+    Args:
+        path (str): Output file
+        blocks (list): Consecutive blocks in JSON-RPC form
+        logs (list): Their logs in JSON-RPC form
+        watched (list, optional): Addresses the fixture is meant to be
+            indexed for
+    """
+    with gzip.open(path, "wt") as f:
+        json.dump({"blocks": blocks, "logs": logs, "watched": watched or []}, f)
+
+
+def load_fixture(path):
+    """
+    Read a fixture.
+
+    Args:
+        path (str): Fixture file
+
+    Returns:
+        dict: Blocks, logs and watched addresses
+    """
+    with gzip.open(path, "rt") as f:
+        return json.load(f)
+
+
+def logs_bloom(logs):
+    """
+    Compute the logsBloom of a block's logs.
+
+    Args:
+        logs (list): Logs in JSON-RPC form
+
+    Returns:
+        str: 256-byte bloom as hex
+    """
+    bloom = 0
+    for log in logs:
+        bloom |= bloom_mask(bytes.fromhex(log["address"][2:]))
+        for topic in log["topics"]:
+            bloom |= bloom_mask(bytes.fromhex(topic[2:]))
+    return "0x" + format(bloom, "0512x")
+
+
+def synthetic_fixture(num_blocks, num_watched=3, watched_rate=0.02, logs_per_block=(20, 120),
+                      accounts=20000, tokens=200, first_block=6000000, seed=1):
+    """
+    Generate blocks of token activity with known watched transfers.
+
+    Args:
+        num_blocks (int): Blocks to generate
+        num_watched (int, optional): Watched addresses
+        watched_rate (float, optional): Chance that a block holds a
+            transfer of a watched address
+        logs_per_block (tuple, optional): Range of logs per block
+        accounts (int, optional): Other accounts sending and receiving
+        tokens (int, optional): Token contracts; a few are far busier
+        first_block (int, optional): Number of the first block
+        seed (int, optional): Random seed
+
+    Returns:
+        dict: Blocks, logs and watched addresses, as load_fixture returns
+    """
+    rng = random.Random(seed)
+    address = lambda: "0x" + rng.getrandbits(160).to_bytes(20, "big").hex()
+    watched = [address() for _ in range(num_watched)]
+    others = [address() for _ in range(accounts)]
+    contracts = [address() for _ in range(tokens)]
+    token_weights = [1 / (rank + 1) for rank in range(tokens)]
+
+    blocks, all_logs = [], []
+    parent_hash = "0x" + "00" * 32
+    for number in range(first_block, first_block + num_blocks):
+        block_hash = "0x" + hashlib.sha256(f"{parent_hash}:{number}".encode()).hexdigest()
+        logs = []
+        for _ in range(rng.randint(*logs_per_block)):
+            kind = rng.random()
+            sender, receiver = rng.choice(others), rng.choice(others)
+            if kind < 0.7:
+                topics = [TRANSFER_TOPIC, address_topic(sender), address_topic(receiver)]
+            elif kind < 0.85:
+                topics = [APPROVAL_TOPIC, address_topic(sender), address_topic(receiver)]
+            else:
+                topics = [SWAP_TOPIC, address_topic(sender), address_topic(receiver)]
+            logs.append((rng.choices(contracts, token_weights)[0], topics))
+        if rng.random() < watched_rate:
+            counterparty = rng.choice(others)
+            pair = [rng.choice(watched), counterparty]
+            rng.shuffle(pair)
+            logs.insert(rng.randrange(len(logs) + 1), (
+                rng.choices(contracts, token_weights)[0],
+                [TRANSFER_TOPIC, address_topic(pair[0]), address_topic(pair[1])],
+            ))
+
+        block_logs = []
+        for index, (contract, topics) in enumerate(logs):
+            block_logs.append({
+                "address": contract,
+                "topics": topics,
+                "data": "0x" + rng.getrandbits(96).to_bytes(32, "big").hex(),
+                "blockNumber": hex(number),
+                "blockHash": block_hash,
+                "transactionHash": "0x" + hashlib.sha256(f"{block_hash}:{index}".encode()).hexdigest(),
+                "transactionIndex": hex(index),
+                "logIndex": hex(index),
+                "removed": False,
+            })
+        blocks.append({
+            "number": hex(number),
+            "hash": block_hash,
+            "parentHash": parent_hash,
+            "timestamp": hex(1700000000 + 12 * (number - first_block)),
+            "logsBloom": logs_bloom(block_logs),
+            "gasLimit": hex(30_000_000),
+            "gasUsed": hex(21000 * len(block_logs)),
+            "baseFeePerGas": hex(1_000_000_000),
+            "transactions": [],
+            "uncles": [],
+        })
+        all_logs.extend(block_logs)
+        parent_hash = block_hash
+    return {"blocks": blocks, "logs": all_logs, "watched": watched}
+
+
+async def record(url, from_block, num_blocks, chunk=10):
+    """
+    Record consecutive blocks and their logs from a node.
+
+    Args:
+        url (str): HTTP RPC endpoint
+        from_block (int): First block
+        num_blocks (int): Blocks to record
+        chunk (int, optional): Blocks per batch request
+
+    Returns:
+        tuple: Blocks and logs in JSON-RPC form
+    """
+    w3 = AsyncWeb3(AsyncHTTPProvider(url))
+    blocks, logs = [], []
+    for start in range(from_block, from_block + num_blocks, chunk):
+        end = min(start + chunk, from_block + num_blocks) - 1
+        requests = [("eth_getBlockByNumber", [hex(number), False]) for number in range(start, end + 1)]
+        requests.append(("eth_getLogs", [{"fromBlock": hex(start), "toBlock": hex(end)}]))
+        responses = await w3.provider.make_batch_request(requests)
+        if not isinstance(responses, list):
+            raise ConnectionError(responses.get("error"))
+        for response in responses:
+            if response.get("error"):
+                raise ConnectionError(response["error"])
+        for block in (response["result"] for response in responses[:-1]):
+            block["transactions"] = []
+            blocks.append(block)
+        logs.extend(responses[-1]["result"])
+        print(f"Recorded blocks {start}-{end}")
+    await w3.provider.disconnect()
+    return blocks, logs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--blocks", type=int, default=500)
+    parser.add_argument("--from-block", type=int, help="First block to record")
+    parser.add_argument("--synthetic", action="store_true", help="Generate instead of recording")
+    parser.add_argument("--watch", nargs="*", default=[], help="Addresses to index a recorded fixture for")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        fixture = synthetic_fixture(args.blocks, seed=args.seed)
+        save_fixture(args.output, fixture["blocks"], fixture["logs"], fixture["watched"])
+    else:
+        url = os.getenv("RPC_HTTP_URL")
+        if not url or args.from_block is None:
+            parser.error("recording needs RPC_HTTP_URL and --from-block")
+        blocks, logs = asyncio.run(record(url, args.from_block, args.blocks))
+        save_fixture(args.output, blocks, logs, args.watch)
+    print(f"Wrote {args.blocks} blocks to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Compare throughput and RPC cost of transfer log fetching strategies.
+
+Run from the project root:
+    python -m benchmarks.log_indexing --blocks 500 --latency 0.05
+    python -m benchmarks.log_indexing --fixture sepolia.json.gz
+
+Each mode indexes the same fixture blocks, served with their logs by the
+stand-in node, as a catch-up after downtime would: "per-block" fetches
+logs for every block, "bloom" only for blocks whose logsBloom matches and
+"bloom+range" also merges the matching blocks into range requests.
+Without --fixture a synthetic fixture is generated (see
+benchmarks.block_fixture). --max-logs makes the node refuse larger results,
+as hosted providers do, to exercise range splitting. Every mode's transfers
+are checked against the fixture. Results are printed (and optionally
+written) as JSON.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import time
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from benchmarks.block_fixture import load_fixture, synthetic_fixture
+from local_node import LocalNode
+from log_indexer import TRANSFER_TOPIC, TransferIndexer, address_topic
+
+
+class UnfilteredIndexer(TransferIndexer):
+    """
+    TransferIndexer without the bloom check, as a baseline.
+    """
+
+    def may_contain_transfers(self, header):
+        return True
+
+
+def expected_transfers(fixture, watched):
+    """
+    Find the watched transfers in a fixture directly.
+
+    Args:
+        fixture (dict): Blocks and logs
+        watched (list): Watched addresses
+
+    Returns:
+        set: (block hash, log index) of each transfer
+    """
+    topics = {address_topic(address) for address in watched}
+    return {
+        (log["blockHash"], int(log["logIndex"], 16))
+        for log in fixture["logs"]
+        if len(log["topics"]) == 3 and log["topics"][0] == TRANSFER_TOPIC
+        and (log["topics"][1] in topics or log["topics"][2] in topics)
+    }
+
+
+async def measure(mode, fixture, watched, max_logs, latency):
+    """
+    Index every fixture block once.
+
+    Args:
+        mode (str): "per-block", "bloom" or "bloom+range"
+        fixture (dict): Blocks and logs
+        watched (list): Addresses to index
+        max_logs (int): Node's eth_getLogs result limit, or None
+        latency (float): Seconds the node adds to each request
+
+    Returns:
+        dict: Throughput, RPC call and correctness metrics
+    """
+    node = LocalNode(0, max_logs=max_logs, latency=latency)
+    node.load_blocks(fixture["blocks"], fixture["logs"])
+    port = await node.start(port=0)
+    w3 = AsyncWeb3(AsyncHTTPProvider(f"http://127.0.0.1:{port}"))
+
+    found = set()
+    on_transfer = lambda transfer: found.add((transfer["block_hash"], transfer["log_index"]))
+    indexer_class = UnfilteredIndexer if mode == "per-block" else TransferIndexer
+    max_range = 2000 if mode == "bloom+range" else 1
+    indexer = indexer_class(w3, watched, on_transfer=on_transfer, max_range=max_range,
+                            reorg_window=len(fixture["blocks"]))
+    headers = [
+        {"number": int(block["number"], 16), "hash": block["hash"], "logsBloom": block["logsBloom"]}
+        for block in fixture["blocks"]
+    ]
+
+    try:
+        await w3.eth.chain_id  # Open the connection before timing
+        node.calls.clear()
+        started = time.perf_counter()
+        indexer.start()
+        for header in headers:
+            await indexer.handle(header)
+        await asyncio.sleep(0)
+        await indexer.wait_idle()
+        elapsed = time.perf_counter() - started
+    finally:
+        await indexer.stop()
+        await w3.provider.disconnect()
+        await node.stop()
+
+    expected = expected_transfers(fixture, watched)
+    stats = indexer.stats()
+    return {
+        "seconds": elapsed,
+        "blocks_per_second": len(headers) / elapsed,
+        "http_requests": stats["requests"],
+        "eth_getLogs_calls": node.calls["eth_getLogs"],
+        "blocks_skipped": stats["blocks_skipped"],
+        "skip_ratio": stats["blocks_skipped"] / len(headers),
+        "range_splits": stats["splits"],
+        "transfers": len(found),
+        "complete": found == expected,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixture", help="Recorded fixture; synthetic if omitted")
+    parser.add_argument("--blocks", type=int, default=500, help="Blocks of the synthetic fixture")
+    parser.add_argument("--watch", nargs="*", help="Addresses to index; the fixture's by default")
+    parser.add_argument("--max-logs", type=int, help="Node's eth_getLogs result limit")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each request")
+    parser.add_argument("--modes", default="per-block,bloom,bloom+range")
+    parser.add_argument("--output", help="Also write the JSON result to this file")
+    args = parser.parse_args()
+
+    fixture = load_fixture(args.fixture) if args.fixture else synthetic_fixture(args.blocks)
+    watched = args.watch or fixture["watched"]
+    if not watched:
+        parser.error("the fixture names no watched addresses; pass --watch")
+
+    metrics = {
+        mode: asyncio.run(measure(mode, fixture, watched, args.max_logs, args.latency))
+        for mode in args.modes.split(",")
+    }
+    result = {
+        "benchmark": "log_indexing",
+        "python": platform.python_version(),
+        "params": dict(vars(args), fixture_blocks=len(fixture["blocks"]), fixture_logs=len(fixture["logs"])),
+        "metrics": metrics,
+    }
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
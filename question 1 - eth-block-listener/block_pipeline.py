@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+# Overflow policies for a handler whose queue is full
+DROP_OLDEST = "drop_oldest"  # Discard the oldest queued block; intake never waits
+WAIT = "wait"  # Hold up intake until the handler catches up; no block is skipped
+
+
+class HandlerStats:
+    """
+    Counters and recent latencies for one block handler.
+    """
+
+    def __init__(self, window=1024):
+        """
+        Creates empty stats.
+
+        Args:
+            window (int, optional): Recent latencies kept for percentiles
+        """
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_seconds = 0.0
+        self.total_seconds = 0.0
+        self.run_seconds = deque(maxlen=window)  # Time spent in the handler
+        self.lag_seconds = deque(maxlen=window)  # Time from dispatch to completion
+
+    def record(self, run_seconds, lag_seconds, ok):
+        """
+        Record one handled block.
+
+        Args:
+            run_seconds (float): Time spent in the handler
+            lag_seconds (float): Time since the block was dispatched
+            ok (bool): False if the handler raised
+        """
+        if ok:
+            self.processed += 1
+        else:
+            self.failed += 1
+        self.total_seconds += run_seconds
+        self.max_seconds = max(self.max_seconds, run_seconds)
+        self.run_seconds.append(run_seconds)
+        self.lag_seconds.append(lag_seconds)
+
+    def summary(self):
+        """
+        Summarise the stats.
+
+        Returns:
+            dict: Counts plus p50/p99/max handler latency and p99 lag, in
+                milliseconds
+        """
+        run = sorted(self.run_seconds)
+        lag = sorted(self.lag_seconds)
+        to_ms = lambda values, fraction: (
+            values[min(len(values) - 1, int(fraction * len(values)))] * 1000 if values else None
+        )
+        handled = self.processed + self.failed
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "mean_ms": self.total_seconds / handled * 1000 if handled else None,
+            "p50_ms": to_ms(run, 0.50),
+            "p99_ms": to_ms(run, 0.99),
+            "max_ms": self.max_seconds * 1000,
+            "lag_p99_ms": to_ms(lag, 0.99),
+        }
+
+
+class _Handler:
+    def __init__(self, name, callback, concurrency, queue_size, overflow):
+        self.name = name
+        self.callback = callback
+        self.concurrency = concurrency
+        self.overflow = overflow
+        self.queue = asyncio.Queue(queue_size)
+        self.stats = HandlerStats()
+        self.workers = []
+
+
+class BlockPipeline:
+    """
+    Fans each block out to registered handlers running concurrently.
+
+    Every handler has its own bounded queue and pool of worker tasks, so a
+    slow or failing handler only delays itself. With one worker a handler
+    sees blocks in order; with more, up to that many blocks are handled at
+    once. When a handler's queue is full its overflow policy applies:
+    DROP_OLDEST discards the stalest queued block, keeping intake at full
+    speed, while WAIT makes dispatch wait for room, pushing back on intake
+    instead of skipping a block.
+
+    An on_complete callback learns when blocks are done with: it is called
+    with each block, in dispatch order, once every handler has handled,
+    failed or dropped it and every earlier block is done too.
+    """
+
+    def __init__(self, on_complete=None):
+        """
+        Creates a pipeline with no handlers.
+
+        Args:
+            on_complete (callable, optional): Called with each block header
+                once every handler is done with it, in dispatch order
+        """
+        self.handlers = {}
+        self.on_complete = on_complete
+        self._in_flight = deque()  # [header, handlers not done] per block, in dispatch order
+        self._started = False
+
+    def register(self, name, callback, concurrency=1, queue_size=64, overflow=DROP_OLDEST):
+        """
+        Add a block handler.
+
+        Args:
+            name (str): Unique handler name, used in stats and logs
+            callback (coroutine function): Called with each block header
+            concurrency (int, optional): Blocks handled at once
+            queue_size (int, optional): Blocks queued before overflow
+            overflow (str, optional): DROP_OLDEST or WAIT
+
+        Raises:
+            ValueError: If the name is taken or the overflow policy unknown
+        """
+        if name in self.handlers:
+            raise ValueError(f"Handler {name} is already registered")
+        if overflow not in (DROP_OLDEST, WAIT):
+            raise ValueError(f"Unknown overflow policy {overflow}")
+        handler = _Handler(name, callback, concurrency, queue_size, overflow)
+        self.handlers[name] = handler
+        if self._started:
+            self._start_workers(handler)
+
+    async def dispatch(self, header):
+        """
+        Queue a block for every handler.
+
+        Returns as soon as the block is queued; it only waits if a WAIT
+        handler's queue is full, and then only after the block is queued
+        for every other handler, so they keep working meanwhile.
+
+        Args:
+            header (AttributeDict): Block header
+        """
+        if self.on_complete is not None:
+            progress = [header, len(self.handlers)]
+            self._in_flight.append(progress)
+            if not self.handlers:
+                self._done(progress)
+        else:
+            progress = None
+        item = (header, time.perf_counter(), progress)
+        waiting = []
+        for handler in self.handlers.values():
+            queue = handler.queue
+            if not queue.full():
+                queue.put_nowait(item)
+            elif handler.overflow == WAIT:
+                waiting.append(queue)
+            else:
+                dropped, _, dropped_progress = queue.get_nowait()
+                queue.task_done()
+                queue.put_nowait(item)
+                handler.stats.dropped += 1
+                self._done(dropped_progress)
+                logging.warning(f"Handler {handler.name} is behind; skipped block {dropped['number']}")
+
+        for queue in waiting:
+            await queue.put(item)
+
+    async def _work(self, handler):
+        clock = time.perf_counter
+        while True:
+            header, dispatched, progress = await handler.queue.get()
+            started = clock()
+            try:
+                await handler.callback(header)
+                ok = True
+            except Exception as e:
+                logging.error(f"Handler {handler.name} failed on block {header['number']}: {e}")
+                ok = False
+            finished = clock()
+            handler.stats.record(finished - started, finished - dispatched, ok)
+            handler.queue.task_done()
+            self._done(progress)
+
+    def _done(self, progress):
+        # One handler is done with a block; report every block at the
+        # front of the line that all handlers are done with
+        if progress is None:
+            return
+        progress[1] -= 1
+        in_flight = self._in_flight
+        while in_flight and in_flight[0][1] <= 0:
+            header = in_flight.popleft()[0]
+            try:
+                self.on_complete(header)
+            except Exception as e:
+                logging.error(f"Completion callback failed on block {header['number']}: {e}")
+
+    def _start_workers(self, handler):
+        handler.workers = [
+            asyncio.create_task(self._work(handler)) for _ in range(handler.concurrency)
+        ]
+
+    def start(self):
+        """
+        Start every handler's workers on the running event loop.
+        """
+        if self._started:
+            return
+        self._started = True
+        for handler in self.handlers.values():
+            self._start_workers(handler)
+
+    async def drain(self):
+        """
+        Wait until every queued block has been handled.
+        """
+        await asyncio.gather(*(handler.queue.join() for handler in self.handlers.values()))
+
+    async def stop(self):
+        """
+        Cancel the workers; queued blocks are discarded.
+        """
+        workers = [worker for handler in self.handlers.values() for worker in handler.workers]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for handler in self.handlers.values():
+            handler.workers = []
+        self._started = False
+
+    def stats(self):
+        """
+        Summarise every handler's stats.
+
+        Returns:
+            dict: Maps handler name to its summary, plus current queue depth
+        """
+        return {
+            name: dict(handler.stats.summary(), queued=handler.queue.qsize())
+            for name, handler in self.handlers.items()
+        }
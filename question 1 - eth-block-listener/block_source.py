@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import random
+import time
+from web3 import AsyncWeb3, WebSocketProvider
+
+class BlockSource:
+    """
+    Stream of new block headers from an Ethereum node.
+
+    Headers are pushed over an eth_subscribe("newHeads") WebSocket
+    subscription. When the socket drops or stalls, the source reconnects
+    with exponential backoff and, while waiting, polls the HTTP endpoint
+    so blocks keep flowing. Polling is paced by the chain's observed block
+    time: it sleeps through most of the expected interval and only polls
+    quickly once the next block is due, but never more often than
+    min_poll_interval, so fast chains do not cost many calls per block.
+    """
+
+    def __init__(self, http_w3, ws_url=None, block_time=12.0, min_backoff=0.5,
+                 max_backoff=30.0, poll_fraction=0.05, min_poll_interval=0.5, stall_factor=5.0):
+        """
+        Creates a new block source.
+
+        Args:
+            http_w3 (AsyncWeb3): HTTP connection used for polling
+            ws_url (str, optional): WebSocket endpoint; only polling is used
+                if omitted
+            block_time (float, optional): Initial estimate of seconds between
+                blocks, refined from header timestamps
+            min_backoff (float, optional): First reconnect delay in seconds
+            max_backoff (float, optional): Largest reconnect delay in seconds
+            poll_fraction (float, optional): Poll interval once a block is
+                due, as a fraction of the block time
+            min_poll_interval (float, optional): Shortest poll interval in
+                seconds, whatever the block time
+            stall_factor (float, optional): Block times without a pushed
+                header after which the subscription is treated as dead
+        """
+        self.http_w3 = http_w3
+        self.ws_url = ws_url
+        self.block_time = block_time
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.poll_fraction = poll_fraction
+        self.min_poll_interval = min_poll_interval
+        self.stall_factor = stall_factor
+        self.mode = None  # "subscription" or "polling"
+        self.poll_calls = 0  # RPC calls made by polling
+        self.reconnects = 0
+        self._backoff = min_backoff
+        self._last_number = None
+        self._last_hash = None
+        self._last_timestamp = None
+
+    async def heads(self):
+        """
+        Yield new block headers as they arrive, forever.
+
+        Headers already yielded (for example re-sent after a reconnect)
+        and headers older than the last one are skipped. A different block
+        at the last height is passed on, since it signals a reorg.
+
+        Yields:
+            AttributeDict: Block header with at least number, hash,
+                parentHash and timestamp
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.ws_url:
+                try:
+                    async for header in self._subscribe():
+                        if self._accept(header):
+                            yield header
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logging.warning(f"Block subscription lost: {e!r}")
+                self.reconnects += 1
+
+                # Poll through the backoff window, then try the socket again
+                delay = self._backoff * random.uniform(0.8, 1.2)
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+                logging.info(f"Reconnecting to {self.ws_url} in {delay:.1f}s, polling meanwhile")
+                deadline = loop.time() + delay
+            else:
+                deadline = None
+
+            async for header in self._poll(deadline):
+                yield header
+
+    async def _subscribe(self):
+        async with AsyncWeb3(WebSocketProvider(self.ws_url, max_connection_retries=1)) as w3:
+            await w3.eth.subscribe("newHeads")
+            self.mode = "subscription"
+            logging.info(f"Subscribed to new heads on {self.ws_url}")
+
+            messages = w3.socket.process_subscriptions().__aiter__()
+            while True:
+                # A socket can stay open while the node stops pushing;
+                # give up on it after several missed blocks
+                timeout = max(self.block_time * self.stall_factor, 1.0)
+                try:
+                    message = await asyncio.wait_for(messages.__anext__(), timeout)
+                except asyncio.TimeoutError:
+                    raise ConnectionError(f"No new heads for {timeout:.0f}s")
+                self._backoff = self.min_backoff
+                yield message["result"]
+
+    async def _poll(self, deadline=None):
+        self.mode = "polling"
+        loop = asyncio.get_running_loop()
+        while True:
+            self.poll_calls += 1
+            header = await self.http_w3.eth.get_block("latest")
+            fast_delay = max(self.block_time * self.poll_fraction, self.min_poll_interval)
+            if self._accept(header):
+                yield header
+                # Sleep until the next block is due by the chain's clock;
+                # timestamps round down, so this errs on the early side
+                due = header["timestamp"] + self.block_time - time.time()
+                delay = max(min(due, self.block_time), fast_delay)
+            else:
+                delay = fast_delay
+
+            if deadline is not None:
+                # End the window on a poll, so a block produced while the
+                # socket reconnects is not left for the next head
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+
+    def _accept(self, header):
+        number = header["number"]
+        if self._last_number is not None and (
+            number < self._last_number
+            or (number == self._last_number and header["hash"] == self._last_hash)
+        ):
+            return False
+
+        # Track the block time from header timestamps, which are whole
+        # seconds, so smooth it over many blocks
+        timestamp = header["timestamp"]
+        if self._last_timestamp is not None and number == self._last_number + 1:
+            interval = max(timestamp - self._last_timestamp, 0.2)
+            self.block_time += 0.1 * (interval - self.block_time)
+        self._last_number = number
+        self._last_hash = header["hash"]
+        self._last_timestamp = timestamp
+        return True
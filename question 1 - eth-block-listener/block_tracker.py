@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+from collections import deque
+
+class BlockTracker:
+    """
+    Turns a stream of new heads into a gap-free, reorg-aware block sequence.
+
+    Every height after the starting point is handed out exactly once per
+    canonical block, in order. Heights skipped by the head stream are
+    backfilled with batched eth_getBlockByNumber calls, and each batch is
+    handed out as soon as it arrives. Each block's parentHash is checked
+    against the block before it; on a mismatch the tracker walks back to
+    the fork point, fetching ancestors in batches, and hands out the new
+    canonical blocks from there, so heights above the fork appear again.
+
+    The last processed block is checkpointed to a file, and a restarted
+    tracker resumes right after it instead of rescanning or skipping. By
+    default a block counts as processed once the consumer asks for the
+    next one; with auto_commit off, the consumer calls commit itself, for
+    example once every handler has finished with the block.
+    """
+
+    def __init__(self, w3, checkpoint_path=None, max_batch=100, max_reorg_depth=128,
+                 auto_commit=True):
+        """
+        Creates a new block tracker.
+
+        Args:
+            w3 (AsyncWeb3): Connection used for backfill requests
+            checkpoint_path (str, optional): File holding the last processed
+                block; nothing is persisted if omitted
+            max_batch (int, optional): Blocks fetched per batch request
+            max_reorg_depth (int, optional): Recent block hashes kept for
+                finding fork points
+            auto_commit (bool, optional): Checkpoint each block once the
+                consumer asks for the next; if False, only commit does
+        """
+        self.w3 = w3
+        self.checkpoint_path = checkpoint_path
+        self.max_batch = max_batch
+        self.auto_commit = auto_commit
+        self.recent = deque(maxlen=max_reorg_depth)  # (number, hash) of processed blocks
+        self.backfilled = 0
+        self.reorgs = 0
+        self._load_checkpoint()
+
+    @property
+    def last_number(self):
+        """
+        Height of the last processed block, or None before the first.
+        """
+        return self.recent[-1][0] if self.recent else None
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        self.recent.append((checkpoint["number"], checkpoint["hash"]))
+        logging.info(f"Resuming after checkpointed block {checkpoint['number']}")
+
+    def commit(self, header):
+        """
+        Checkpoint a block as processed, so a restart resumes after it.
+
+        Args:
+            header (AttributeDict): Block header handed out by blocks
+        """
+        if not self.checkpoint_path:
+            return
+        # Write then rename, so a crash never leaves a torn checkpoint
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"number": header["number"], "hash": _hex(header["hash"])}, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    async def get_blocks(self, start, end):
+        """
+        Fetch a range of blocks with batched JSON-RPC requests.
+
+        Args:
+            start (int): First height
+            end (int): Last height, inclusive
+
+        Returns:
+            list: Block headers in height order
+        """
+        blocks = []
+        for batch_start in range(start, end + 1, self.max_batch):
+            batch_end = min(batch_start + self.max_batch, end + 1)
+            async with self.w3.batch_requests() as batch:
+                for number in range(batch_start, batch_end):
+                    batch.add(self.w3.eth.get_block(number))
+                blocks.extend(await batch.async_execute())
+        return blocks
+
+    async def blocks(self, heads):
+        """
+        Yield every canonical block from a head stream, in height order.
+
+        With auto_commit, the checkpoint is advanced once the consumer
+        asks for the next block, so a block is only marked processed after
+        its handling. During a backfill that happens batch by batch, so an
+        interrupted catch-up keeps the batches already handled.
+
+        Args:
+            heads (async iterator): New block headers, such as
+                BlockSource.heads()
+
+        Yields:
+            AttributeDict: Block header; after a reorg, heights above the
+                fork point are yielded again with their new blocks
+        """
+        async for head in heads:
+            try:
+                async for chain in self._advance(head):
+                    for header in chain:
+                        yield header
+                        self.recent.append((header["number"], _hex(header["hash"])))
+                        if self.auto_commit:
+                            self.commit(header)
+            except Exception as e:
+                # Only what was handed out is marked processed, so the next
+                # head retries the rest of the gap
+                logging.error(f"Failed to catch up to block {head['number']}: {e}")
+
+    async def _advance(self, head):
+        # Yields runs of blocks to hand out; each run is handed out before
+        # the next is fetched, so last_number follows along
+        number = head["number"]
+        if self.last_number is None:
+            yield [head]
+            return
+
+        if number <= self.last_number and (
+            number < self.recent[0][0] or self._hash_at(number) == _hex(head["hash"])
+        ):
+            return  # Already processed, or too old to place
+
+        # Backfill any heights the head stream skipped, a batch at a time
+        while self.last_number + 1 < number:
+            start = self.last_number + 1
+            batch = await self.get_blocks(start, min(start + self.max_batch, number) - 1)
+            self.backfilled += len(batch)
+            yield await self._link(batch)
+
+        yield await self._link([head])
+
+    async def _link(self, chain):
+        if (chain[0]["number"] == self.last_number + 1
+                and _hex(chain[0]["parentHash"]) == self.recent[-1][1]):
+            return chain
+
+        # The new blocks do not extend the processed chain: walk back
+        return await self._resolve_reorg(chain)
+
+    async def _resolve_reorg(self, chain):
+        # chain runs from some height up to the new head; extend it
+        # downwards until its parent is a block we processed. Ancestors are
+        # fetched in batches that double in size, since most reorgs are
+        # only a block or two deep
+        ancestors = []
+        batch_size = 4
+        while True:
+            parent_number = chain[0]["number"] - 1
+            if parent_number < self.recent[0][0]:
+                # Beyond the tracked hashes; reprocess from the oldest one
+                logging.error(f"Reorg deeper than {len(self.recent)} tracked blocks")
+                break
+            if self._hash_at(parent_number) == _hex(chain[0]["parentHash"]):
+                break
+            if not ancestors:
+                low = max(self.recent[0][0], parent_number - batch_size + 1)
+                ancestors = await self.get_blocks(low, parent_number)
+                batch_size = min(batch_size * 2, self.max_batch)
+            chain.insert(0, ancestors.pop())
+
+        fork_number = chain[0]["number"] - 1
+        dropped = self.last_number - fork_number
+        while self.recent and self.recent[-1][0] > fork_number:
+            self.recent.pop()
+        if not self.recent:
+            self.recent.append((fork_number, _hex(chain[0]["parentHash"])))
+        self.reorgs += 1
+        logging.warning(
+            f"Reorg at block {fork_number + 1}: {dropped} block(s) replaced, "
+            f"new head {chain[-1]['number']}"
+        )
+        return chain
+
+    def _hash_at(self, number):
+        for recent_number, block_hash in reversed(self.recent):
+            if recent_number == number:
+                return block_hash
+            if recent_number < number:
+                break
+        return None
+
+
+def _hex(value):
+    # Header hashes arrive as HexBytes or hex strings
+    return value if isinstance(value, str) else "0x" + bytes(value).hex()
@@ -0,0 +1,465 @@
+"""
+Stand-in Ethereum node for running the listener locally.
+
+Serves the JSON-RPC methods the listener uses over HTTP (including batch
+requests) and eth_subscribe("newHeads") over a WebSocket on the same port,
+and produces a block every block_time seconds. Raw transactions are kept
+in a mempool and mined in nonce order once their gas price reaches the
+node's gas price; balances and execution are not simulated. Recorded
+blocks and their logs can be loaded with load_blocks to serve eth_getLogs.
+
+    python local_node.py --port 8545 --block-time 2
+
+Then point the listener at it:
+
+    RPC_HTTP_URL=http://127.0.0.1:8545 RPC_WS_URL=ws://127.0.0.1:8545 python main.py
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import Counter
+import rlp
+from aiohttp import web, WSMsgType
+from eth_account import Account
+from eth_utils import keccak, to_checksum_address
+
+SEPOLIA_CHAIN_ID = 11155111
+EMPTY_BLOOM = "0x" + "00" * 256
+GWEI = 10**9
+
+
+class LocalNode:
+    """
+    In-memory chain with a JSON-RPC front end.
+    """
+
+    def __init__(self, block_time=1.0, chain_id=SEPOLIA_CHAIN_ID, max_logs=None, latency=0.0):
+        """
+        Creates a node holding only a genesis block.
+
+        Args:
+            block_time (float, optional): Seconds between blocks; 0 disables
+                automatic block production (use mine_block)
+            chain_id (int, optional): Chain ID reported to clients
+            max_logs (int, optional): Most logs one eth_getLogs call may
+                return before it fails, as hosted providers limit it
+            latency (float, optional): Seconds added to each HTTP request,
+                to model a remote provider
+        """
+        self.block_time = block_time
+        self.chain_id = chain_id
+        self.max_logs = max_logs
+        self.latency = latency
+        self.blocks = []
+        self.first_number = 0  # Number of blocks[0]
+        self.logs = {}  # Maps block hash to its logs
+        self.mined_at = {}  # Maps block number to the local time it was produced
+        self.calls = Counter()  # JSON-RPC calls served, by method
+        self.gas_price = GWEI  # Transactions priced below this stay in the mempool
+        self.nonces = Counter()  # Maps sender to its next mined nonce
+        self.mempool = {}  # Maps (sender, nonce) to a pending transaction
+        self.receipts = {}  # Maps transaction hash to its receipt
+        self._subscribers = {}  # Maps subscription ID to (WebSocket, kind)
+        self._next_subscription = 0
+        self._forks = 0
+        self._runner = None
+        self._miner = None
+        self.mine_block()
+
+    def mine_block(self, notify=True, salt=""):
+        """
+        Append a new block to the chain and push it to subscribers.
+
+        Args:
+            notify (bool, optional): Push the block to newHeads subscribers;
+                disable to simulate heads missed by the client
+            salt (str, optional): Varies the block hash, for building forks
+
+        Returns:
+            dict: The new block, in JSON-RPC form
+        """
+        number = self.first_number + len(self.blocks)
+        parent_hash = self.blocks[-1]["hash"] if self.blocks else "0x" + "00" * 32
+        block = self._make_block(number, parent_hash, salt)
+        self._include_transactions(block)
+        self.blocks.append(block)
+        self.mined_at[number] = time.perf_counter()
+        if notify:
+            self._notify("newHeads", block)
+        return block
+
+    def reorg(self, depth, length=None):
+        """
+        Replace the newest blocks with a competing fork.
+
+        Args:
+            depth (int): Number of blocks to drop from the tip
+            length (int, optional): Blocks in the new fork (depth if omitted)
+
+        Returns:
+            dict: The new head
+        """
+        del self.blocks[len(self.blocks) - depth:]
+        self._forks += 1
+        for _ in range((length or depth) - 1):
+            self.mine_block(notify=False, salt=f"fork{self._forks}")
+        return self.mine_block(salt=f"fork{self._forks}")
+
+    def load_blocks(self, blocks, logs):
+        """
+        Replace the chain with recorded blocks.
+
+        Args:
+            blocks (list): Consecutive blocks in JSON-RPC form
+            logs (list): Their logs in JSON-RPC form
+        """
+        self.blocks = list(blocks)
+        self.first_number = int(self.blocks[0]["number"], 16)
+        self.logs = {}
+        for log in logs:
+            self.logs.setdefault(log["blockHash"], []).append(log)
+
+    def _make_block(self, number, parent_hash, salt=""):
+        block_hash = hashlib.sha256(f"{parent_hash}:{number}:{salt}".encode()).hexdigest()
+        return {
+            "number": hex(number),
+            "hash": "0x" + block_hash,
+            "parentHash": parent_hash,
+            "timestamp": hex(int(time.time())),
+            "nonce": "0x0000000000000000",
+            "sha3Uncles": "0x" + "00" * 32,
+            "logsBloom": EMPTY_BLOOM,
+            "transactionsRoot": "0x" + "00" * 32,
+            "stateRoot": "0x" + "00" * 32,
+            "receiptsRoot": "0x" + "00" * 32,
+            "miner": "0x" + "00" * 20,
+            "difficulty": "0x0",
+            "extraData": "0x",
+            "size": "0x200",
+            "gasLimit": hex(30_000_000),
+            "gasUsed": "0x0",
+            "baseFeePerGas": hex(1_000_000_000),
+            "transactions": [],
+            "uncles": [],
+        }
+
+    def _include_transactions(self, block):
+        included = []
+        for sender in {sender for sender, _ in self.mempool}:
+            while True:
+                transaction = self.mempool.get((sender, self.nonces[sender]))
+                if transaction is None or transaction["gas_price"] < self.gas_price:
+                    break
+                del self.mempool[(sender, self.nonces[sender])]
+                self.nonces[sender] += 1
+                included.append(transaction)
+
+        block["transactions"] = [transaction["hash"] for transaction in included]
+        for index, transaction in enumerate(included):
+            self.receipts[transaction["hash"]] = {
+                "transactionHash": transaction["hash"],
+                "transactionIndex": hex(index),
+                "blockHash": block["hash"],
+                "blockNumber": block["number"],
+                "from": transaction["from"],
+                "to": transaction["to"],
+                "cumulativeGasUsed": hex(21000 * (index + 1)),
+                "gasUsed": hex(21000),
+                "effectiveGasPrice": hex(transaction["gas_price"]),
+                "contractAddress": None,
+                "logs": [],
+                "logsBloom": EMPTY_BLOOM,
+                "status": "0x1",
+                "type": "0x0",
+            }
+
+    def send_raw_transaction(self, raw):
+        """
+        Validate a signed transaction and add it to the mempool.
+
+        A transaction with the nonce of one already pending replaces it
+        only if it pays at least 10% more, as geth requires.
+
+        Args:
+            raw (bytes): Signed transaction
+
+        Returns:
+            str: Transaction hash
+
+        Raises:
+            ValueError: If the nonce is used or the replacement underpriced
+        """
+        if raw[0] >= 0xc0:
+            fields = rlp.decode(raw)  # Legacy: nonce, gasPrice, gas, to, ...
+            nonce, gas_price, to = fields[0], fields[1], fields[3]
+        else:
+            fields = rlp.decode(raw[1:])  # Typed: chainId, nonce, ...
+            nonce = fields[1]
+            gas_price, to = (fields[2], fields[4]) if raw[0] == 1 else (fields[3], fields[5])
+        nonce = int.from_bytes(nonce, "big")
+        gas_price = int.from_bytes(gas_price, "big")
+        sender = Account.recover_transaction(raw)
+        tx_hash = "0x" + keccak(raw).hex()
+
+        if nonce < self.nonces[sender]:
+            raise ValueError("nonce too low")
+        pending = self.mempool.get((sender, nonce))
+        if pending is not None:
+            if pending["hash"] == tx_hash:
+                raise ValueError("already known")
+            if gas_price * 10 < pending["gas_price"] * 11:
+                raise ValueError("replacement transaction underpriced")
+        self.mempool[(sender, nonce)] = {
+            "hash": tx_hash,
+            "from": sender,
+            "to": to_checksum_address(to) if to else None,
+            "gas_price": gas_price,
+        }
+        return tx_hash
+
+    def get_transaction_count(self, address, tag="latest"):
+        """
+        Get an account's next nonce.
+
+        Args:
+            address (str): Account address
+            tag (str, optional): "pending" also counts mempool transactions
+
+        Returns:
+            int: Next nonce
+        """
+        sender = to_checksum_address(address)
+        nonce = self.nonces[sender]
+        if tag == "pending":
+            while (sender, nonce) in self.mempool:
+                nonce += 1
+        return nonce
+
+    def _notify(self, kind, result):
+        for subscription_id, (ws, subscription_kind) in list(self._subscribers.items()):
+            if subscription_kind != kind or ws.closed:
+                continue
+            message = {
+                "jsonrpc": "2.0",
+                "method": "eth_subscription",
+                "params": {"subscription": subscription_id, "result": result},
+            }
+            asyncio.ensure_future(ws.send_str(json.dumps(message)))
+
+    def _get_block(self, tag):
+        if tag == "latest" or tag == "pending" or tag == "safe" or tag == "finalized":
+            return self.blocks[-1]
+        if tag == "earliest":
+            return self.blocks[0]
+        index = int(tag, 16) - self.first_number
+        return self.blocks[index] if 0 <= index < len(self.blocks) else None
+
+    def get_logs(self, query):
+        """
+        Find logs matching an eth_getLogs filter.
+
+        Args:
+            query (dict): Filter with blockHash or fromBlock/toBlock, and
+                optional address and topics; a list at any of them matches
+                any of its entries
+
+        Returns:
+            list: Matching logs
+
+        Raises:
+            ValueError: If more than max_logs logs match
+        """
+        if "blockHash" in query:
+            blocks = [block for block in self.blocks if block["hash"] == query["blockHash"]]
+        else:
+            start = self._get_block(query.get("fromBlock", "latest"))
+            end = self._get_block(query.get("toBlock", "latest"))
+            if start is None or end is None:
+                return []
+            first = int(start["number"], 16) - self.first_number
+            blocks = self.blocks[first:int(end["number"], 16) - self.first_number + 1]
+
+        addresses = query.get("address")
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {address.lower() for address in addresses} if addresses else None
+        topics = [
+            None if wanted is None else {topic.lower() for topic in ([wanted] if isinstance(wanted, str) else wanted)}
+            for wanted in query.get("topics") or []
+        ]
+
+        found = []
+        for block in blocks:
+            for log in self.logs.get(block["hash"], []):
+                if addresses is not None and log["address"].lower() not in addresses:
+                    continue
+                if len(log["topics"]) < len(topics) or any(
+                    wanted is not None and topic.lower() not in wanted for topic, wanted in zip(log["topics"], topics)
+                ):
+                    continue
+                found.append(log)
+                if self.max_logs is not None and len(found) > self.max_logs:
+                    raise ValueError(f"query returned more than {self.max_logs} results")
+        return found
+
+    def handle(self, method, params, ws=None):
+        """
+        Execute one JSON-RPC method.
+
+        Args:
+            method (str): Method name
+            params (list): Method parameters
+            ws (WebSocketResponse, optional): Socket the call came in on,
+                needed for subscriptions
+
+        Returns:
+            object: The JSON-RPC result
+
+        Raises:
+            NotImplementedError: If the method is not supported
+        """
+        self.calls[method] += 1
+        if method == "eth_chainId":
+            return hex(self.chain_id)
+        if method == "web3_clientVersion":
+            return "LocalNode/v1"
+        if method == "net_version":
+            return str(self.chain_id)
+        if method == "eth_blockNumber":
+            return hex(self.first_number + len(self.blocks) - 1)
+        if method == "eth_getBlockByNumber":
+            return self._get_block(params[0])
+        if method == "eth_getBlockByHash":
+            return next((block for block in self.blocks if block["hash"] == params[0]), None)
+        if method == "eth_getLogs":
+            return self.get_logs(params[0])
+        if method == "eth_gasPrice":
+            return hex(self.gas_price)
+        if method == "eth_getTransactionCount":
+            return hex(self.get_transaction_count(*params))
+        if method == "eth_sendRawTransaction":
+            return self.send_raw_transaction(bytes.fromhex(params[0][2:]))
+        if method == "eth_getTransactionReceipt":
+            return self.receipts.get(params[0])
+        if method == "eth_subscribe" and ws is not None:
+            if params[0] != "newHeads":
+                raise NotImplementedError(f"Subscription {params[0]} is not supported")
+            self._next_subscription += 1
+            subscription_id = hex(self._next_subscription)
+            self._subscribers[subscription_id] = (ws, params[0])
+            return subscription_id
+        if method == "eth_unsubscribe":
+            return self._subscribers.pop(params[0], None) is not None
+        raise NotImplementedError(f"Method {method} is not supported")
+
+    def _respond(self, request, ws=None):
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            response["result"] = self.handle(request["method"], request.get("params") or [], ws)
+        except NotImplementedError as e:
+            response["error"] = {"code": -32601, "message": str(e)}
+        except Exception as e:
+            response["error"] = {"code": -32000, "message": str(e)}
+        return response
+
+    def _dispatch(self, payload, ws=None):
+        if isinstance(payload, list):
+            return [self._respond(request, ws) for request in payload]
+        return self._respond(payload, ws)
+
+    async def _handle_http(self, request):
+        if request.headers.get("Upgrade", "").lower() == "websocket":
+            return await self._handle_ws(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.json_response(self._dispatch(await request.json()))
+
+    async def _handle_ws(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        try:
+            async for message in ws:
+                if message.type in (WSMsgType.TEXT, WSMsgType.BINARY):
+                    await ws.send_str(json.dumps(self._dispatch(json.loads(message.data), ws)))
+        finally:
+            for subscription_id, (subscriber, _) in list(self._subscribers.items()):
+                if subscriber is ws:
+                    del self._subscribers[subscription_id]
+        return ws
+
+    async def drop_connections(self):
+        """
+        Close every WebSocket, as a node restart or network fault would.
+        """
+        sockets = {ws for ws, _ in self._subscribers.values()}
+        self._subscribers.clear()
+        for ws in sockets:
+            await ws.close()
+
+    async def _mine(self):
+        while True:
+            await asyncio.sleep(self.block_time)
+            self.mine_block()
+
+    async def start(self, host="127.0.0.1", port=8545):
+        """
+        Start serving and producing blocks on the running event loop.
+
+        Args:
+            host (str, optional): Address to listen on
+            port (int, optional): Port to listen on (0 picks a free port)
+
+        Returns:
+            int: Port the node is listening on
+        """
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle_http)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        if self.block_time:
+            self._miner = asyncio.create_task(self._mine())
+        logging.info(f"Local node listening on {host}:{port}")
+        return port
+
+    async def stop(self):
+        """
+        Stop producing blocks and close the server.
+        """
+        if self._miner is not None:
+            self._miner.cancel()
+            self._miner = None
+        if self._runner is not None:
+            await self.drop_connections()
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(args):
+    node = LocalNode(args.block_time, args.chain_id)
+    await node.start(args.host, args.port)
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--block-time", type=float, default=2.0)
+    parser.add_argument("--chain-id", type=int, default=SEPOLIA_CHAIN_ID)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
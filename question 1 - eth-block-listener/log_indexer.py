@@ -0,0 +1,366 @@
+import asyncio
+import logging
+from eth_utils import keccak, to_checksum_address
+
+TRANSFER_TOPIC = "0x" + keccak(text="Transfer(address,address,uint256)").hex()
+
+
+class BlockFetchError(ConnectionError):
+    """
+    The provider refused eth_getLogs for a single block.
+    """
+
+    def __init__(self, block_number, error):
+        """
+        Creates the error.
+
+        Args:
+            block_number (int): Block whose logs could not be fetched
+            error (object): Error returned by the provider
+        """
+        super().__init__(f"eth_getLogs failed for block {block_number}: {error}")
+        self.block_number = block_number
+
+
+def bloom_mask(value):
+    """
+    Get the logsBloom bits an item sets, as an integer mask.
+
+    Follows the yellow paper: three 11-bit indices are taken from the
+    item's keccak hash. Read as a big-endian integer, a 2048-bit bloom has
+    bit i of the spec at integer bit i.
+
+    Args:
+        value (bytes): Log address or topic
+
+    Returns:
+        int: Mask with the item's three bits set
+    """
+    digest = keccak(value)
+    mask = 0
+    for i in (0, 2, 4):
+        mask |= 1 << (((digest[i] << 8) | digest[i + 1]) & 2047)
+    return mask
+
+
+def address_topic(address):
+    """
+    Encode an address as an indexed event topic.
+
+    Args:
+        address (str): Hex address
+
+    Returns:
+        str: 32-byte hex topic
+    """
+    return "0x" + "00" * 12 + address[2:].lower()
+
+
+class TransferIndexer:
+    """
+    Finds ERC-20 Transfer events to or from a set of watched addresses.
+
+    Each block's logsBloom is checked locally first: a block is only
+    fetched if its bloom may hold the Transfer topic together with one of
+    the watched addresses as a topic, which rules out most blocks without
+    a request. Candidate blocks are queued and fetched by a background
+    task with eth_getLogs over block ranges, so blocks that arrive while a
+    fetch is in flight (such as during a backfill) share one request.
+    When the provider refuses a range, for example for returning too many
+    logs, the range is split in half and retried, and the range size used
+    afterwards shrinks with it; it grows back slowly after successes.
+    After a failure only the blocks not yet recorded are fetched again, and
+    a block that fails max_retries times is given up on, so one bad block
+    cannot stall the queue.
+    """
+
+    def __init__(self, w3, addresses, tokens=None, on_transfer=None, max_range=2000,
+                 reorg_window=128, retry_delay=1.0, max_retries=5):
+        """
+        Creates a new transfer indexer.
+
+        Args:
+            w3 (AsyncWeb3): HTTP connection used for eth_getLogs
+            addresses (list): Addresses whose transfers are indexed
+            tokens (list, optional): Token contracts to restrict to; any
+                token if omitted
+            on_transfer (callable, optional): Called with each transfer
+                found, as a dict
+            max_range (int, optional): Most blocks covered by one request
+            reorg_window (int, optional): Recent blocks kept indexed, so a
+                reorg can replace their transfers
+            retry_delay (float, optional): Seconds before retrying a failed
+                fetch
+            max_retries (int, optional): Failed fetches of a block after
+                which it is skipped
+        """
+        self.w3 = w3
+        self.addresses = [to_checksum_address(address) for address in addresses]
+        self.tokens = [to_checksum_address(token) for token in tokens] if tokens else None
+        self.on_transfer = on_transfer
+        self.max_range = max_range
+        self.range_limit = max_range
+        self.reorg_window = reorg_window
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+
+        self._topics = [address_topic(address) for address in self.addresses]
+        self._transfer_mask = bloom_mask(bytes.fromhex(TRANSFER_TOPIC[2:]))
+        self._address_masks = [bloom_mask(bytes.fromhex(topic[2:])) for topic in self._topics]
+        self._token_masks = (
+            [bloom_mask(bytes.fromhex(token[2:])) for token in self.tokens] if self.tokens else None
+        )
+
+        self.transfers = {}  # Maps recent block number to its transfers
+        self._hashes = {}  # Maps recent block number to the hash being indexed
+        self._candidates = {}  # Maps block number to hash, waiting to be fetched
+        self._failures = {}  # Maps block number to its failed fetches so far
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = None
+
+        self.blocks_seen = 0
+        self.blocks_skipped = 0
+        self.requests = 0
+        self.splits = 0
+        self.transfers_found = 0
+        self.blocks_failed = 0
+
+    def may_contain_transfers(self, header):
+        """
+        Check a block's logsBloom for a watched transfer.
+
+        False positives are possible; false negatives are not.
+
+        Args:
+            header (AttributeDict): Block header
+
+        Returns:
+            bool: True if the block may contain a watched transfer
+        """
+        bloom = header["logsBloom"]
+        bloom = int(bloom, 16) if isinstance(bloom, str) else int.from_bytes(bloom, "big")
+
+        mask = self._transfer_mask
+        if bloom & mask != mask:
+            return False
+        if self._token_masks and not any(bloom & mask == mask for mask in self._token_masks):
+            return False
+        return any(bloom & mask == mask for mask in self._address_masks)
+
+    async def handle(self, header):
+        """
+        Block handler: queue the block for fetching if its bloom matches.
+
+        A block at an already indexed height (after a reorg) replaces it.
+
+        Args:
+            header (AttributeDict): Block header
+        """
+        number = header["number"]
+        block_hash = _hex(header["hash"])
+        self.blocks_seen += 1
+        self._hashes[number] = block_hash
+        self._failures.pop(number, None)
+        if self.transfers.pop(number, None):
+            logging.warning(f"Dropped transfers of reorged block {number}")
+
+        if self.may_contain_transfers(header):
+            self._candidates[number] = block_hash
+            self._idle.clear()
+            self._wakeup.set()
+        else:
+            self._candidates.pop(number, None)
+            self.blocks_skipped += 1
+
+        # Forget blocks too old to be reorged
+        oldest = number - self.reorg_window
+        for old in [old for old in self._hashes if old < oldest]:
+            del self._hashes[old]
+            self.transfers.pop(old, None)
+
+    async def run(self):
+        """
+        Fetch logs for queued blocks until cancelled.
+        """
+        while True:
+            if not self._candidates:
+                self._idle.set()
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            candidates, self._candidates = self._candidates, {}
+            try:
+                await self._fetch(candidates)
+            except Exception as e:
+                logging.error(f"Failed to fetch transfer logs: {e}")
+                # Requeue what was neither recorded nor replaced meanwhile
+                # and retry, unless a block has failed too often
+                for number, block_hash in candidates.items():
+                    if self._failures.get(number, 0) >= self.max_retries:
+                        del self._failures[number]
+                        self.blocks_failed += 1
+                        logging.error(f"Skipped transfer logs of block {number} after {self.max_retries} failed fetches")
+                        continue
+                    self._candidates.setdefault(number, block_hash)
+                await asyncio.sleep(self.retry_delay)
+
+    async def _fetch(self, candidates):
+        # Recorded blocks are removed from candidates, so on failure it
+        # holds exactly the blocks still to fetch
+        numbers = sorted(candidates)
+        start = 0
+        while start < len(numbers):
+            end = start
+            while end + 1 < len(numbers) and numbers[end + 1] - numbers[start] < self.range_limit:
+                end += 1
+            try:
+                logs = await self.get_logs(numbers[start], numbers[end])
+            except BlockFetchError as e:
+                self._count_failures([e.block_number])
+                raise
+            except Exception:
+                self._count_failures(numbers[start:end + 1])
+                raise
+            fetched = {number: candidates.pop(number) for number in numbers[start:end + 1]}
+            for number in fetched:
+                self._failures.pop(number, None)
+            self._record(logs, fetched)
+            start = end + 1
+
+    def _count_failures(self, numbers):
+        for number in numbers:
+            self._failures[number] = self._failures.get(number, 0) + 1
+
+    async def get_logs(self, from_block, to_block):
+        """
+        Fetch watched Transfer logs for a block range, splitting it if the
+        provider refuses it.
+
+        Transfers from and to the watched addresses need separate filters;
+        both go out in one batch request.
+
+        Args:
+            from_block (int): First block
+            to_block (int): Last block, inclusive
+
+        Returns:
+            list: Raw logs
+
+        Raises:
+            BlockFetchError: If a single block cannot be fetched
+        """
+        base = {"fromBlock": hex(from_block), "toBlock": hex(to_block)}
+        if self.tokens:
+            base["address"] = self.tokens
+        requests = [
+            ("eth_getLogs", [dict(base, topics=[TRANSFER_TOPIC, self._topics])]),
+            ("eth_getLogs", [dict(base, topics=[TRANSFER_TOPIC, None, self._topics])]),
+        ]
+        self.requests += 1
+        responses = await self.w3.provider.make_batch_request(requests)
+
+        error = responses.get("error") if not isinstance(responses, list) else next(
+            (response["error"] for response in responses if response.get("error")), None
+        )
+        if error is None:
+            self.range_limit = min(self.max_range, self.range_limit + max(1, self.range_limit // 4))
+            seen = set()
+            logs = []
+            for response in responses:
+                for log in response["result"]:
+                    # A transfer between two watched addresses matches both filters
+                    key = (log["blockHash"], log["logIndex"])
+                    if key not in seen:
+                        seen.add(key)
+                        logs.append(log)
+            return logs
+
+        if from_block == to_block:
+            raise BlockFetchError(from_block, error)
+        middle = (from_block + to_block) // 2
+        self.splits += 1
+        self.range_limit = max(1, min(self.range_limit, middle - from_block + 1))
+        logging.info(f"Splitting log range {from_block}-{to_block}: {error.get('message', error)}")
+        return await self.get_logs(from_block, middle) + await self.get_logs(middle + 1, to_block)
+
+    def _record(self, logs, candidates):
+        found = {number: [] for number in candidates}
+        for log in logs:
+            number = int(log["blockNumber"], 16)
+            block_hash = candidates.get(number)
+            # Skip logs from blocks replaced since the header was seen; the
+            # replacement is queued on its own
+            if block_hash is None or log["blockHash"] != block_hash or len(log["topics"]) != 3:
+                continue
+            found[number].append({
+                "block_number": number,
+                "block_hash": block_hash,
+                "transaction_hash": log["transactionHash"],
+                "log_index": int(log["logIndex"], 16),
+                "token": to_checksum_address(log["address"]),
+                "from": to_checksum_address("0x" + log["topics"][1][-40:]),
+                "to": to_checksum_address("0x" + log["topics"][2][-40:]),
+                "value": int(log["data"], 16),
+            })
+
+        for number, transfers in found.items():
+            if self._hashes.get(number) != candidates[number]:
+                continue
+            self.transfers[number] = transfers
+            self.transfers_found += len(transfers)
+            if self.on_transfer is not None:
+                for transfer in transfers:
+                    self.on_transfer(transfer)
+
+    async def wait_idle(self):
+        """
+        Wait until every queued block has been fetched.
+        """
+        await self._idle.wait()
+
+    def start(self):
+        """
+        Start the fetch task on the running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """
+        Stop the fetch task; queued blocks are discarded.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self):
+        """
+        Summarise the indexer's work.
+
+        Returns:
+            dict: Blocks seen and skipped by the bloom check, requests,
+                range splits, transfers found, blocks given up on and the
+                current range limit
+        """
+        return {
+            "blocks_seen": self.blocks_seen,
+            "blocks_skipped": self.blocks_skipped,
+            "requests": self.requests,
+            "splits": self.splits,
+            "transfers_found": self.transfers_found,
+            "blocks_failed": self.blocks_failed,
+            "range_limit": self.range_limit,
+        }
+
+
+def _hex(value):
+    # Header hashes arrive as HexBytes or hex strings
+    return value if isinstance(value, str) else "0x" + bytes(value).hex()
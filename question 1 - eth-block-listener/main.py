@@ -1,9 +1,14 @@
 import os
-import time
+import asyncio
 import logging
 from dotenv import load_dotenv
-from web3 import Web3
+from web3 import AsyncWeb3, AsyncHTTPProvider, Web3
 from eth_account import Account
+from block_pipeline import BlockPipeline, WAIT
+from block_source import BlockSource
+from block_tracker import BlockTracker
+from log_indexer import TransferIndexer
+from tx_sender import TransactionSender
 
 # Load environment variables
 load_dotenv()
@@ -12,23 +17,28 @@ ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY")
 SENDER_PRIVATE_KEY = os.getenv("SENDER_PRIVATE_KEY")
 RECEIVER_ADDRESS = os.getenv("RECEIVER_ADDRESS")
 
+# Endpoints default to Alchemy Sepolia; set these to use another node
+RPC_HTTP_URL = os.getenv("RPC_HTTP_URL")
+RPC_WS_URL = os.getenv("RPC_WS_URL")
+BLOCK_TIME = float(os.getenv("BLOCK_TIME", "12"))  # Sepolia produces a block every 12 seconds
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "checkpoint.json")  # Last processed block
+# Comma-separated addresses whose ERC-20 transfers are logged, besides the receiver
+WATCH_ADDRESSES = [address for address in os.getenv("WATCH_ADDRESSES", "").split(",") if address]
+TRANSFER_EVERY = 10  # Blocks between transfers
+STATS_EVERY = 100  # Blocks between handler stats log lines
+CHAIN_ID = 11155111  # Sepolia chain ID
+
 # Logging config
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # Validate environment variables
-if not all([ALCHEMY_API_KEY, SENDER_PRIVATE_KEY, RECEIVER_ADDRESS]):
+if not all([ALCHEMY_API_KEY or RPC_HTTP_URL, SENDER_PRIVATE_KEY, RECEIVER_ADDRESS]):
     logging.error("One or more environment variables are missing. Please check your .env file.")
     exit(1)
 
-try:
-    provider_url = f"https://eth-sepolia.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-    w3 = Web3(Web3.HTTPProvider(provider_url))
-
-    if not w3.is_connected():
-        raise ConnectionError("Failed to connect to the Ethereum network.")
-except Exception as e:
-    logging.error(f"Error initializing Web3: {e}")
-    exit(1)
+if not RPC_HTTP_URL:
+    RPC_HTTP_URL = f"https://eth-sepolia.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
+    RPC_WS_URL = RPC_WS_URL or f"wss://eth-sepolia.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
 
 # Wallet setup
 try:
@@ -38,44 +48,109 @@ except Exception as e:
     logging.error(f"Invalid private key: {e}")
     exit(1)
 
-# Block listener with send logic
-block_count = 0
-try:
-    current_block = w3.eth.block_number
-    logging.info(f"Starting block: {current_block}")
 
-    while True:
-        latest_block = w3.eth.block_number
-        if latest_block > current_block:
+def log_confirmation(receipt_future):
+    try:
+        receipt = receipt_future.result()
+        logging.info(f"Transaction confirmed! Hash: {receipt['transactionHash']}")
+    except Exception as e:
+        logging.error(f"Transaction error: {e}")
+
+
+def log_transfer(transfer):
+    logging.info(
+        f"Token transfer in block {transfer['block_number']}: {transfer['value']} of {transfer['token']} "
+        f"from {transfer['from']} to {transfer['to']} | Hash: {transfer['transaction_hash']}"
+    )
+
+
+async def send_eth(sender):
+    # Nonce and gas price are filled in by the sender
+    tx = {
+        'to': Web3.to_checksum_address(RECEIVER_ADDRESS),
+        'value': Web3.to_wei(0.001, 'ether'),
+        'gas': 21000,
+    }
+
+    try:
+        pending = await sender.send(tx)
+        logging.info("Sending 0.001 ETH...")
+        pending.receipt.add_done_callback(log_confirmation)
+    except Exception as tx_err:
+        logging.error(f"Transaction error: {tx_err}")
+
+
+async def main():
+    try:
+        w3 = AsyncWeb3(AsyncHTTPProvider(RPC_HTTP_URL))
+        if not await w3.is_connected():
+            raise ConnectionError("Failed to connect to the Ethereum network.")
+    except Exception as e:
+        logging.error(f"Error initializing Web3: {e}")
+        exit(1)
+
+    # Block listener with send logic: new heads are pushed over the
+    # WebSocket, with adaptive polling while it is unavailable. The tracker
+    # fills in skipped heights and replays blocks replaced by a reorg
+    source = BlockSource(w3, RPC_WS_URL, block_time=BLOCK_TIME)
+    tracker = BlockTracker(w3, CHECKPOINT_PATH, auto_commit=False)
+    # Sends are confirmed in the background, so a handler never waits on
+    # a transaction
+    sender = TransactionSender(w3, account, CHAIN_ID)
+    sender.start()
+    block_count = 0
+    highest_block = tracker.last_number
+    start_block = highest_block if highest_block is not None else await w3.eth.block_number
+    logging.info(f"Starting block: {start_block}")
+
+    # Per-block work runs in handlers on their own workers, so a slow one
+    # never holds up block intake. The checkpoint only moves past a block
+    # once every handler is done with it, so blocks still queued at a
+    # crash are handled again after a restart
+    pipeline = BlockPipeline(on_complete=tracker.commit)
+    last_transfer_block = start_block
+
+    async def transfer_every_10_blocks(header):
+        nonlocal last_transfer_block
+        # Go by height rather than by call, so blocks repeated by a reorg
+        # or skipped while the handler was behind keep the cadence
+        if header['number'] - last_transfer_block >= TRANSFER_EVERY:
+            last_transfer_block += (header['number'] - last_transfer_block) // TRANSFER_EVERY * TRANSFER_EVERY
+            await send_eth(sender)
+
+    # Token transfers of the watched addresses are found from each block's
+    # logsBloom, and only matching blocks are fetched, in range requests.
+    # The handler only queues blocks, so it may hold up intake rather than
+    # skip one. It is done with a block once the block is queued, so logs
+    # not yet fetched at a crash are not fetched again
+    indexer = TransferIndexer(w3, [RECEIVER_ADDRESS] + WATCH_ADDRESSES, on_transfer=log_transfer)
+    indexer.start()
+
+    pipeline.register("transfer", transfer_every_10_blocks)
+    pipeline.register("token_transfers", indexer.handle, overflow=WAIT)
+    pipeline.start()
+
+    async for header in tracker.blocks(source.heads()):
+        sender.on_block(header)
+
+        # A reorg hands out heights again; count each height once
+        if highest_block is not None and header['number'] <= highest_block:
+            logging.info(f"Reorged Block: {header['number']}")
+        else:
+            highest_block = header['number']
             block_count += 1
-            current_block = latest_block
-            logging.info(f"New Block: {latest_block} | Block Count: {block_count}")
-
-            if block_count % 10 == 0:
-                try:
-                    nonce = w3.eth.get_transaction_count(account.address)
-                    gas_price = w3.eth.gas_price
-                    tx = {
-                        'to': Web3.to_checksum_address(RECEIVER_ADDRESS),
-                        'value': w3.to_wei(0.001, 'ether'),
-                        'gas': 21000,
-                        'gasPrice': gas_price,
-                        'nonce': nonce,
-                        'chainId': 11155111  # Sepolia chain ID
-                    }
-
-                    signed_tx = w3.eth.account.sign_transaction(tx, private_key=SENDER_PRIVATE_KEY)
-                    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                    logging.info("Sending 0.001 ETH...")
-                    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-                    logging.info(f"Transaction confirmed! Hash: {tx_hash.hex()}")
-
-                except Exception as tx_err:
-                    logging.error(f"Transaction error: {tx_err}")
-
-        time.sleep(2)  # Poll every 2 seconds
-
-except KeyboardInterrupt:
-    logging.warning("Script stopped manually.")
-except Exception as e:
-    logging.error(f"Unexpected error occurred: {e}")
+            logging.info(f"New Block: {header['number']} | Block Count: {block_count}")
+            if block_count % STATS_EVERY == 0:
+                logging.info(f"Handler stats: {pipeline.stats()}")
+                logging.info(f"Transfer indexer stats: {indexer.stats()}")
+
+        await pipeline.dispatch(header)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logging.warning("Script stopped manually.")
+    except Exception as e:
+        logging.error(f"Unexpected error occurred: {e}")
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+from block_pipeline import BlockPipeline, WAIT
+
+
+class BlockPipelineTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await self.pipeline.stop()
+
+    async def test_full_wait_handler_does_not_hold_up_other_handlers(self):
+        release = asyncio.Event()
+        seen = []
+
+        async def slow(header):
+            await release.wait()
+
+        async def fast(header):
+            seen.append(header["number"])
+
+        self.pipeline = BlockPipeline()
+        self.pipeline.register("slow", slow, queue_size=1, overflow=WAIT)
+        self.pipeline.register("fast", fast)
+        self.pipeline.start()
+
+        # One block in the slow handler, one queued: its queue is now full
+        for number in range(2):
+            await self.pipeline.dispatch({"number": number})
+            await asyncio.sleep(0)
+        blocked = asyncio.ensure_future(self.pipeline.dispatch({"number": 2}))
+        await asyncio.sleep(0.05)
+        self.assertFalse(blocked.done())
+        self.assertEqual(seen, [0, 1, 2])
+
+        release.set()
+        await asyncio.wait_for(blocked, 1)
+        await self.pipeline.drain()
+
+    async def test_completion_is_reported_in_dispatch_order(self):
+        gates = {number: asyncio.Event() for number in range(3)}
+        completed = []
+
+        async def gated(header):
+            await gates[header["number"]].wait()
+
+        async def quick(header):
+            pass
+
+        self.pipeline = BlockPipeline(on_complete=lambda header: completed.append(header["number"]))
+        self.pipeline.register("gated", gated, concurrency=3)
+        self.pipeline.register("quick", quick)
+        self.pipeline.start()
+        for number in range(3):
+            await self.pipeline.dispatch({"number": number})
+
+        gates[2].set()
+        gates[1].set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(completed, [])
+
+        gates[0].set()
+        await self.pipeline.drain()
+        self.assertEqual(completed, [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
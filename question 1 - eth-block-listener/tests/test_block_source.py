@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from block_source import BlockSource
+from local_node import LocalNode
+
+
+class BlockSourceTest(unittest.IsolatedAsyncioTestCase):
+    """
+    BlockSource against a stand-in node that only mines when told to.
+    """
+
+    async def asyncSetUp(self):
+        self.node = LocalNode(block_time=0)
+        port = await self.node.start(port=0)
+        self.http_url = f"http://127.0.0.1:{port}"
+        self.ws_url = f"ws://127.0.0.1:{port}"
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(self.http_url))
+        self.heads = None
+
+    async def asyncTearDown(self):
+        if self.heads is not None:
+            await self.heads.aclose()
+        await self.w3.provider.disconnect()
+        await self.node.stop()
+
+    def watch(self, source):
+        self.heads = source.heads()
+        return self.heads
+
+    async def next_head(self, timeout=5.0):
+        return await asyncio.wait_for(self.heads.__anext__(), timeout)
+
+    async def wait_for_mode(self, source, mode, timeout=5.0):
+        # The source connects lazily, from inside the first __anext__
+        async def wait():
+            while source.mode != mode:
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(wait(), timeout)
+
+    async def test_subscription_pushes_new_heads(self):
+        source = BlockSource(self.w3, self.ws_url, block_time=12)
+        self.watch(source)
+        pending = asyncio.ensure_future(self.next_head())
+        await self.wait_for_mode(source, "subscription")
+
+        block = self.node.mine_block()
+        header = await pending
+        self.assertEqual(header["number"], int(block["number"], 16))
+        self.assertEqual(source.poll_calls, 0)
+        self.assertEqual(self.node.calls["eth_getBlockByNumber"], 0)
+
+    async def test_polls_while_socket_is_down_then_resubscribes(self):
+        source = BlockSource(self.w3, self.ws_url, block_time=12, min_backoff=0.5,
+                             min_poll_interval=0.05)
+        self.watch(source)
+        pending = asyncio.ensure_future(self.next_head())
+        await self.wait_for_mode(source, "subscription")
+        first = self.node.mine_block()
+        await pending
+
+        # Heads mined while the socket is down arrive by polling
+        pending = asyncio.ensure_future(self.next_head())
+        await self.node.drop_connections()
+        await self.wait_for_mode(source, "polling")
+        second = self.node.mine_block()
+        header = await pending
+        self.assertEqual(header["number"], int(second["number"], 16))
+        self.assertEqual(source.reconnects, 1)
+        self.assertGreater(source.poll_calls, 0)
+
+        # After the backoff window the subscription takes over again
+        pending = asyncio.ensure_future(self.next_head())
+        await self.wait_for_mode(source, "subscription")
+        polls = source.poll_calls
+        third = self.node.mine_block()
+        header = await pending
+        self.assertEqual(header["number"], int(third["number"], 16))
+        self.assertEqual(source.poll_calls, polls)
+        self.assertEqual(source._backoff, source.min_backoff)
+        self.assertGreater(header["number"], int(first["number"], 16))
+
+    async def test_reconnect_backoff_grows_to_its_cap(self):
+        # Nothing listens on port 1, so every connection attempt fails
+        source = BlockSource(self.w3, "ws://127.0.0.1:1", block_time=12, min_backoff=0.05,
+                             max_backoff=0.2, min_poll_interval=0.05)
+        self.watch(source)
+        self.node.mine_block()
+        await self.next_head()
+
+        async def wait_for_reconnects(count):
+            while source.reconnects < count:
+                self.node.mine_block()
+                await self.next_head()
+        await asyncio.wait_for(wait_for_reconnects(4), 10.0)
+        self.assertEqual(source._backoff, source.max_backoff)
+        self.assertEqual(source.mode, "polling")
+
+    async def test_polling_interval_has_a_floor(self):
+        source = BlockSource(self.w3, block_time=1.0, poll_fraction=0.01, min_poll_interval=0.2)
+        self.watch(source)
+        await self.next_head()  # Current head
+
+        # No new blocks: without the floor this would poll every 10 ms
+        pending = asyncio.ensure_future(self.next_head())
+        await asyncio.sleep(1.0)
+        pending.cancel()
+        self.assertLessEqual(source.poll_calls, 1 + 6)
+
+    async def test_skips_repeated_and_older_heads(self):
+        source = BlockSource(self.w3, block_time=1.0, min_poll_interval=0.05)
+        self.watch(source)
+        head = await self.next_head()
+        self.assertFalse(source._accept(head))
+
+        fork = self.node.reorg(1)
+        header = await self.next_head()
+        self.assertEqual(header["number"], head["number"])
+        self.assertEqual(bytes(header["hash"]), bytes.fromhex(fork["hash"][2:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
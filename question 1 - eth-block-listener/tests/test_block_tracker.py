@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import unittest
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from block_tracker import BlockTracker
+from local_node import LocalNode
+
+
+class BlockTrackerTest(unittest.IsolatedAsyncioTestCase):
+    """
+    BlockTracker against a stand-in node that only mines when told to.
+    """
+
+    async def asyncSetUp(self):
+        self.node = LocalNode(block_time=0)
+        port = await self.node.start(port=0)
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(f"http://127.0.0.1:{port}"))
+        self.checkpoint_path = os.path.join(tempfile.mkdtemp(), "checkpoint.json")
+
+    async def asyncTearDown(self):
+        await self.w3.provider.disconnect()
+        await self.node.stop()
+
+    async def head(self):
+        return await self.w3.eth.get_block("latest")
+
+    def read_checkpoint(self):
+        with open(self.checkpoint_path) as f:
+            return json.load(f)["number"]
+
+    async def test_backfill_is_handed_out_and_checkpointed_per_batch(self):
+        tracker = BlockTracker(self.w3, self.checkpoint_path, max_batch=10)
+        heads = [await self.head()]
+        for _ in range(25):
+            self.node.mine_block()
+        heads.append(await self.head())
+
+        async def stream():
+            for head in heads:
+                yield head
+
+        self.node.calls.clear()
+        numbers = []
+        fetched_before_first = None
+        async for header in tracker.blocks(stream()):
+            numbers.append(header["number"])
+            if header["number"] == 1:
+                fetched_before_first = self.node.calls["eth_getBlockByNumber"]
+            if header["number"] == 12:
+                # Blocks handed out so far are already checkpointed
+                self.assertEqual(self.read_checkpoint(), 11)
+        self.assertEqual(numbers, list(range(26)))
+        self.assertEqual(tracker.backfilled, 24)
+        # Only the first batch had been fetched when its first block came out
+        self.assertEqual(fetched_before_first, 10)
+        self.assertEqual(self.read_checkpoint(), 25)
+
+    async def test_reorg_walks_back_to_the_fork_in_batches(self):
+        tracker = BlockTracker(self.w3, max_batch=100)
+        for _ in range(20):
+            self.node.mine_block()
+        # As if blocks 0-20 had been processed before the reorg
+        for block in self.node.blocks:
+            tracker.recent.append((int(block["number"], 16), block["hash"]))
+        new_head = self.node.reorg(6, 7)
+        head = await self.head()
+
+        async def stream():
+            yield head
+
+        self.node.calls.clear()
+        numbers = [header["number"] async for header in tracker.blocks(stream())]
+        self.assertEqual(numbers, list(range(15, 22)))
+        self.assertEqual(numbers[-1], int(new_head["number"], 16))
+        self.assertEqual(tracker.reorgs, 1)
+        # Six replaced ancestors took two batches, of 4 and then 8 blocks
+        self.assertEqual(self.node.calls["eth_getBlockByNumber"], 12)
+
+    async def test_commit_is_left_to_the_consumer_without_auto_commit(self):
+        tracker = BlockTracker(self.w3, self.checkpoint_path, auto_commit=False)
+        self.node.mine_block()
+        head = await self.head()
+
+        async def stream():
+            yield head
+
+        async for header in tracker.blocks(stream()):
+            pass
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+        tracker.commit(header)
+        self.assertEqual(self.read_checkpoint(), head["number"])
+
+
+if __name__ == "__main__":
+    unittest.main()
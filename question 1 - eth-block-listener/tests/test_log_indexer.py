@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from benchmarks.block_fixture import synthetic_fixture
+from benchmarks.log_indexing import expected_transfers
+from local_node import LocalNode
+from log_indexer import TransferIndexer
+
+
+class TransferIndexerTest(unittest.IsolatedAsyncioTestCase):
+    """
+    TransferIndexer on a synthetic fixture served by the stand-in node.
+    """
+
+    async def asyncSetUp(self):
+        self.fixture = synthetic_fixture(300, watched_rate=0.2, seed=3)
+        self.node = LocalNode(block_time=0)
+        self.node.load_blocks(self.fixture["blocks"], self.fixture["logs"])
+        port = await self.node.start(port=0)
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(f"http://127.0.0.1:{port}"))
+        self.found = []
+        self.indexer = TransferIndexer(
+            self.w3, self.fixture["watched"], max_range=50, reorg_window=300, retry_delay=0,
+            max_retries=3,
+            on_transfer=lambda transfer: self.found.append((transfer["block_hash"], transfer["log_index"])),
+        )
+
+    async def asyncTearDown(self):
+        await self.indexer.stop()
+        await self.w3.provider.disconnect()
+        await self.node.stop()
+
+    def fail_block(self, bad_number):
+        # The node refuses any eth_getLogs range that covers the block
+        get_logs = self.node.get_logs
+
+        def failing(query):
+            if int(query["fromBlock"], 16) <= bad_number <= int(query["toBlock"], 16):
+                raise ValueError("internal error")
+            return get_logs(query)
+        self.node.get_logs = failing
+
+    async def index_all(self):
+        self.indexer.start()
+        for block in self.fixture["blocks"]:
+            await self.indexer.handle({
+                "number": int(block["number"], 16), "hash": block["hash"], "logsBloom": block["logsBloom"],
+            })
+        await asyncio.sleep(0)
+        await asyncio.wait_for(self.indexer.wait_idle(), 10)
+
+    def transfer_blocks(self):
+        hashes = {block_hash for block_hash, _ in expected_transfers(self.fixture, self.fixture["watched"])}
+        return [block for block in self.fixture["blocks"] if block["hash"] in hashes]
+
+    async def test_failing_block_is_skipped_without_recording_others_twice(self):
+        # A late block, so earlier ranges are recorded before it fails
+        bad_block = self.transfer_blocks()[-1]
+        bad_number = int(bad_block["number"], 16)
+        self.fail_block(bad_number)
+        await self.index_all()
+
+        expected = {
+            transfer for transfer in expected_transfers(self.fixture, self.fixture["watched"])
+            if transfer[0] != bad_block["hash"]
+        }
+        self.assertEqual(len(self.found), len(set(self.found)))
+        self.assertEqual(set(self.found), expected)
+        self.assertEqual(self.indexer.transfers_found, len(expected))
+        self.assertEqual(self.indexer.blocks_failed, 1)
+        self.assertNotIn(bad_number, self.indexer.transfers)
+
+    async def test_every_transfer_is_found_once(self):
+        await self.index_all()
+        expected = expected_transfers(self.fixture, self.fixture["watched"])
+        self.assertEqual(sorted(self.found), sorted(expected))
+        self.assertEqual(self.indexer.blocks_failed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+from eth_account import Account
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from local_node import LocalNode
+from tx_sender import TransactionSender
+
+RECEIVER = "0x000000000000000000000000000000000000dEaD"
+
+
+class TransactionSenderTest(unittest.IsolatedAsyncioTestCase):
+    """
+    TransactionSender against a stand-in node that only mines when told to.
+    """
+
+    async def asyncSetUp(self):
+        self.node = LocalNode(block_time=0)
+        port = await self.node.start(port=0)
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(f"http://127.0.0.1:{port}"))
+        self.account = Account.create()
+        self.sender = TransactionSender(self.w3, self.account, self.node.chain_id, timeout_blocks=2)
+        self.sender.on_block({"number": 0})
+
+    async def asyncTearDown(self):
+        await self.sender.stop()
+        await self.w3.provider.disconnect()
+        await self.node.stop()
+
+    async def send(self, gas_price=None):
+        if gas_price is not None:
+            self.sender._gas_price = gas_price  # As if read from the node this block
+        return await self.sender.send({"to": RECEIVER, "value": 1, "gas": 21000})
+
+    async def mine(self):
+        block = self.node.mine_block()
+        self.sender.on_block({"number": int(block["number"], 16)})
+        await self.sender._check_pending()
+
+    async def test_rejected_nonce_is_reused_while_others_are_in_flight(self):
+        first = await self.send()
+        second = await self.send()
+
+        # The node refuses the next send for an unrelated reason
+        original = self.node.send_raw_transaction
+        def refuse(raw):
+            self.node.send_raw_transaction = original
+            raise ValueError("temporarily unavailable")
+        self.node.send_raw_transaction = refuse
+        with self.assertRaises(Exception):
+            await self.send()
+
+        third = await self.send()
+        self.assertEqual([first.nonce, second.nonce, third.nonce], [0, 1, 2])
+        self.assertEqual(sorted(self.sender.pending), [0, 1, 2])
+
+        await self.mine()
+        for pending in (first, second, third):
+            self.assertEqual((await asyncio.wait_for(pending.receipt, 1))["status"], "0x1")
+
+    async def test_abandoned_nonce_is_refilled_and_outbid(self):
+        # Priced below what the node mines, so it and every later nonce
+        # stay in the mempool
+        stuck = await self.send(self.node.gas_price // 2)
+        await self.mine()
+        later = await self.send()
+        await self.mine()
+        with self.assertRaises(TimeoutError):
+            stuck.receipt.result()
+        self.assertNotIn(stuck.nonce, self.sender.pending)
+        self.assertIn(later.nonce, self.sender.pending)
+
+        # The next send takes the abandoned nonce, priced over the stuck copy
+        refill = await self.send()
+        self.assertEqual(refill.nonce, stuck.nonce)
+        self.assertGreater(refill.gas_price, stuck.gas_price)
+        self.assertIs(self.sender.pending[later.nonce], later)
+
+        await self.mine()
+        self.assertEqual((await asyncio.wait_for(refill.receipt, 1))["status"], "0x1")
+        self.assertEqual((await asyncio.wait_for(later.receipt, 1))["status"], "0x1")
+
+    async def test_count_is_read_again_once_nothing_is_in_flight(self):
+        first = await self.send()
+        await self.mine()
+        await first.receipt
+
+        # A stale local count, as if the account had sent from elsewhere
+        self.sender.nonces._next_nonce = 0
+        second = await self.send()
+        self.assertEqual(second.nonce, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,310 @@
+import asyncio
+import heapq
+import logging
+
+class NonceManager:
+    """
+    Hands out nonces for one account without an RPC call per transaction.
+
+    The account's pending transaction count is read from the node once;
+    after that nonces are assigned locally, so concurrent sends never wait
+    on each other or reuse a nonce. A nonce whose transaction was rejected
+    or given up on is released and handed out again before any new one,
+    so no gap holds up the nonces above it. reset() makes the next
+    allocation re-read the count; it is only safe while nothing is in
+    flight, since the node does not count transactions it has not seen.
+    """
+
+    def __init__(self, w3, address):
+        """
+        Creates a nonce manager for an account.
+
+        Args:
+            w3 (AsyncWeb3): Connection used to read the transaction count
+            address (str): Account address
+        """
+        self.w3 = w3
+        self.address = address
+        self._next_nonce = None
+        self._released = []  # Heap of nonces to hand out again
+        self._lock = asyncio.Lock()
+
+    async def allocate(self):
+        """
+        Reserve the next nonce.
+
+        Returns:
+            int: Nonce to sign the transaction with
+        """
+        if self._released:
+            return heapq.heappop(self._released)
+        if self._next_nonce is None:
+            async with self._lock:
+                if self._next_nonce is None:
+                    self._next_nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
+        nonce = self._next_nonce
+        self._next_nonce += 1
+        return nonce
+
+    def release(self, nonce):
+        """
+        Return a nonce that will not be mined, so it is used again.
+
+        Args:
+            nonce (int): Nonce of a rejected or abandoned transaction
+        """
+        if nonce not in self._released:
+            heapq.heappush(self._released, nonce)
+
+    def reset(self):
+        """
+        Forget the local count and released nonces; the next allocation
+        asks the node again.
+        """
+        self._next_nonce = None
+        self._released = []
+
+
+class PendingTransaction:
+    """
+    A broadcast transaction waiting for its receipt.
+    """
+
+    def __init__(self, tx, nonce, block_number):
+        """
+        Creates a pending transaction.
+
+        Args:
+            tx (dict): Unsigned transaction, without nonce and gas price
+            nonce (int): Nonce it was signed with
+            block_number (int): Block when it was first sent
+        """
+        self.tx = tx
+        self.nonce = nonce
+        self.gas_price = None
+        self.hashes = []  # Every hash sent for this nonce; any of them may be mined
+        self.first_block = block_number
+        self.sent_block = block_number
+        self.receipt = asyncio.get_running_loop().create_future()
+
+
+class TransactionSender:
+    """
+    Sends transactions without blocking the block loop.
+
+    send() signs and broadcasts a transaction with a locally allocated
+    nonce and returns immediately. A background task checks the receipts
+    of all pending transactions once per block, in a single batch request.
+    A transaction still unmined after bump_after_blocks blocks is resent
+    with the same nonce and a higher gas price (replace-by-fee), and one
+    unmined after timeout_blocks blocks is given up on.
+    """
+
+    def __init__(self, w3, account, chain_id, bump_after_blocks=3, fee_bump=1.125,
+                 max_gas_price=None, timeout_blocks=50):
+        """
+        Creates a new transaction sender.
+
+        Args:
+            w3 (AsyncWeb3): HTTP connection used for sending
+            account (LocalAccount): Account signing the transactions
+            chain_id (int): Chain ID to sign for
+            bump_after_blocks (int, optional): Blocks to wait before a
+                replace-by-fee resend
+            fee_bump (float, optional): Gas price multiplier per resend;
+                nodes require at least 1.1
+            max_gas_price (int, optional): Gas price in wei never exceeded
+                by a resend
+            timeout_blocks (int, optional): Blocks after which an unmined
+                transaction fails
+        """
+        self.w3 = w3
+        self.account = account
+        self.chain_id = chain_id
+        self.bump_after_blocks = bump_after_blocks
+        self.fee_bump = fee_bump
+        self.max_gas_price = max_gas_price
+        self.timeout_blocks = timeout_blocks
+        self.nonces = NonceManager(w3, account.address)
+        self.pending = {}  # Maps nonce to PendingTransaction
+        self._abandoned_prices = {}  # Maps released nonce to the gas price it was last sent at
+        self.block_number = None
+        self.confirmed = 0
+        self.replacements = 0
+        self._gas_price = None  # Cached until the next block
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def on_block(self, header):
+        """
+        Note a new block; pending receipts are checked in the background.
+
+        Args:
+            header (AttributeDict): The new block's header
+        """
+        self.block_number = header["number"]
+        self._gas_price = None
+        self._wakeup.set()
+
+    async def get_gas_price(self):
+        """
+        Get the node's gas price, read at most once per block.
+
+        Returns:
+            int: Gas price in wei
+        """
+        if self._gas_price is None:
+            self._gas_price = await self.w3.eth.gas_price
+        return self._gas_price
+
+    async def send(self, tx):
+        """
+        Sign and broadcast a transaction.
+
+        Args:
+            tx (dict): Transaction fields other than nonce, gasPrice and
+                chainId
+
+        Returns:
+            PendingTransaction: The sent transaction; its receipt future
+                resolves with the raw receipt once it is mined
+
+        Raises:
+            Exception: If the node rejects the transaction
+        """
+        for attempt in range(2):
+            nonce = await self.nonces.allocate()
+            while nonce in self.pending:
+                # Only possible if the node's count lagged our own sends
+                nonce = await self.nonces.allocate()
+            pending = PendingTransaction(dict(tx, chainId=self.chain_id), nonce, self.block_number)
+            self.pending[nonce] = pending
+
+            gas_price = await self.get_gas_price()
+            abandoned_price = self._abandoned_prices.pop(nonce, None)
+            if abandoned_price is not None:
+                # An abandoned transaction may still sit in the mempool;
+                # outbid it so this one replaces it
+                gas_price = max(gas_price, int(abandoned_price * self.fee_bump) + 1)
+            try:
+                await self._broadcast(pending, gas_price)
+                return pending
+            except Exception as e:
+                del self.pending[nonce]
+                # "nonce too low" means the nonce is taken on chain: drop it.
+                # Anything else leaves it unused: hand it out again, unless
+                # nothing is in flight and the count can simply be re-read
+                too_low = "nonce too low" in str(e).lower()
+                if not self.pending:
+                    self.nonces.reset()
+                    self._abandoned_prices.clear()
+                elif not too_low:
+                    self.nonces.release(nonce)
+                    if abandoned_price is not None:
+                        self._abandoned_prices[nonce] = abandoned_price
+                if attempt or not too_low:
+                    raise
+
+    async def _broadcast(self, pending, gas_price):
+        signed = self.account.sign_transaction(dict(pending.tx, nonce=pending.nonce, gasPrice=gas_price))
+        tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        pending.hashes.append("0x" + bytes(tx_hash).hex())
+        pending.gas_price = gas_price
+        pending.sent_block = self.block_number
+
+    async def run(self):
+        """
+        Check pending receipts once per block until cancelled.
+        """
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self.pending:
+                continue
+            try:
+                await self._check_pending()
+            except Exception as e:
+                logging.error(f"Failed to check pending transactions: {e}")
+
+    async def _check_pending(self):
+        pending = list(self.pending.values())
+        requests = [("eth_getTransactionReceipt", [tx_hash]) for tx in pending for tx_hash in tx.hashes]
+        responses = await self.w3.provider.make_batch_request(requests)
+        if not isinstance(responses, list):
+            raise ConnectionError(responses.get("error"))
+
+        index = 0
+        stuck = []
+        for tx in pending:
+            if tx.first_block is None:
+                # Sent before the first block was seen
+                tx.first_block = tx.sent_block = self.block_number
+            receipt = None
+            for response in responses[index:index + len(tx.hashes)]:
+                receipt = response.get("result") or receipt
+            index += len(tx.hashes)
+
+            if receipt is not None:
+                del self.pending[tx.nonce]
+                self.confirmed += 1
+                tx.receipt.set_result(receipt)
+            elif self.block_number - tx.first_block >= self.timeout_blocks:
+                del self.pending[tx.nonce]
+                self._abandon(tx)
+                tx.receipt.set_exception(TimeoutError(
+                    f"Transaction with nonce {tx.nonce} not mined after {self.timeout_blocks} blocks"
+                ))
+            elif self.block_number - tx.sent_block >= self.bump_after_blocks:
+                stuck.append(tx)
+
+        if stuck:
+            await self.get_gas_price()
+            await asyncio.gather(*(self._replace(tx) for tx in stuck))
+
+    def _abandon(self, tx):
+        # The next send fills the nonce, so later ones are not held up
+        # behind a gap; with nothing else in flight the node's count is
+        # read again instead
+        if self.pending:
+            self.nonces.release(tx.nonce)
+            self._abandoned_prices[tx.nonce] = tx.gas_price
+        else:
+            self.nonces.reset()
+            self._abandoned_prices.clear()
+
+    async def _replace(self, tx):
+        gas_price = max(int(tx.gas_price * self.fee_bump) + 1, await self.get_gas_price())
+        if self.max_gas_price is not None and gas_price > self.max_gas_price:
+            if tx.gas_price >= self.max_gas_price:
+                return
+            gas_price = self.max_gas_price
+
+        try:
+            await self._broadcast(tx, gas_price)
+        except Exception as e:
+            # "nonce too low" means one of the sent versions was mined; its
+            # receipt shows up on the next check
+            logging.warning(f"Replacement for nonce {tx.nonce} rejected: {e}")
+            return
+        self.replacements += 1
+        logging.info(f"Resent nonce {tx.nonce} at {gas_price} wei gas price: {tx.hashes[-1]}")
+
+    def start(self):
+        """
+        Start the receipt tracker on the running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """
+        Stop the receipt tracker; pending transactions stay unresolved.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -5,6 +5,9 @@ from models.asset import Asset
 from models.order import Order, OrderType
 from orderbook.multi_chain_order_book import MultiChainOrderBook
 from execution.cross_chain_manager import CrossChainManager
+from execution.expiry_scheduler import ExpiryScheduler
+from execution.gas_oracle import GasOracle
+from metrics.orderbook_metrics import OrderBookMetrics
 
 
 class MockBridge:
@@ -19,12 +22,23 @@ class MockBridge:
     async def release_assets(self, dest_chain, asset, amount, recipient, proof):
         print(f"Releasing {amount} of {asset.symbol} on {dest_chain.name} to {recipient}")
         return {"success": True, "txHash": "txHash"}
+        
+    async def unlock_assets(self, source_chain, asset, amount, sender, tx_hash):
+        print(f"Unlocking {amount} of {asset.symbol} on {source_chain.name} for {sender}")
+        return {"success": True, "txHash": "txHash"}
 
 async def main():
     # Create blockchains
     ethereum = Blockchain("ethereum", "Ethereum", 15, lambda: 50)
     polygon = Blockchain("polygon", "Polygon", 2, lambda: 20)
     
+    # Serve gas prices from a cache kept warm in the background
+    gas_oracle = GasOracle(ttl=5.0)
+    gas_oracle.register(ethereum)
+    gas_oracle.register(polygon)
+    await gas_oracle.refresh_all()
+    gas_oracle.start()
+    
     # Create assets
     eth = Asset("eth", "ETH", "Ethereum", 18)
     eth.add_blockchain_address("ethereum", "0xED7Be1ef41acE718c127A9D922f13E6DB0f751bBe")
@@ -40,12 +54,21 @@ async def main():
     order_book.add_asset(eth)
     order_book.add_asset(usdc)
     
+    # Record stage latencies, outcomes and book sizes
+    metrics = OrderBookMetrics()
+    metrics.track_order_book(order_book)
+    
     # Create cross-chain manager
-    manager = CrossChainManager(order_book)
+    manager = CrossChainManager(order_book, metrics=metrics)
+    
+    # Evict expired maker orders in the background
+    expiry_scheduler = ExpiryScheduler(order_book)
+    expiry_scheduler.start()
     
     # Register bridge
     bridge = MockBridge()
     manager.register_bridge("ethereum", "polygon", bridge)
+    manager.register_bridge("polygon", "ethereum", bridge)
     
     # Create a maker order: Sell 1 ETH for 2000 USDC
     maker_order = Order(
@@ -83,6 +106,13 @@ async def main():
     print(f"Taker order status: {taker_order.status}")
     print(f"Maker order fill amount: {maker_order.filled_amount}")
     print(f"Maker order status: {maker_order.status}")
+    
+    snapshot = metrics.registry.snapshot()
+    print(f"Rejections: {snapshot['orderbook_rejections_total']}")
+    print(f"Taker latency: {snapshot['orderbook_stage_latency_seconds']['stage=taker_total']}")
+    
+    await expiry_scheduler.stop()
+    await gas_oracle.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
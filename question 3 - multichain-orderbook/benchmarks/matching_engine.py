@@ -0,0 +1,189 @@
+"""
+Benchmark the matching engine against seeded synthetic order flow.
+
+Run from the project root:
+    python -m benchmarks.matching_engine --events 200000 --output result.json
+
+Results are printed (and optionally written) as JSON so runs can be
+compared across commits.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from benchmarks.order_flow import OrderFlowGenerator, MAKER, TAKER, CANCEL
+from execution.cross_chain_manager import CrossChainManager
+from metrics.orderbook_metrics import OrderBookMetrics
+from orderbook.multi_chain_order_book import MultiChainOrderBook
+
+
+def percentile(sorted_values, fraction):
+    """
+    Read a percentile from pre-sorted values (nearest rank).
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): Percentile as a fraction (0.99 for p99)
+
+    Returns:
+        float: Percentile value or None if there are no values
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def git_revision():
+    """
+    Get the current git commit, if available.
+
+    Returns:
+        str: Commit hash or None
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(generator, num_events, trace_memory=False, with_metrics=False):
+    """
+    Replay generated order flow through a CrossChainManager.
+
+    Args:
+        generator (OrderFlowGenerator): Source of order flow
+        num_events (int): Number of events to replay
+        trace_memory (bool, optional): Track peak Python heap with tracemalloc
+            (accurate but slows the run down)
+        with_metrics (bool, optional): Record instrumentation while running,
+            to measure its overhead
+
+    Returns:
+        dict: Benchmark metrics
+    """
+    order_book = MultiChainOrderBook()
+    for blockchain in generator.blockchains:
+        order_book.add_blockchain(blockchain)
+    for asset in generator.assets:
+        order_book.add_asset(asset)
+    expired = []
+    order_book.add_expiry_listener(lambda orders: expired.append(len(orders)))
+    metrics = None
+    if with_metrics:
+        metrics = OrderBookMetrics()
+        metrics.track_order_book(order_book)
+    manager = CrossChainManager(order_book, metrics=metrics)
+    generator.register_bridges(manager)
+
+    # Materialise the flow first so generation cost stays out of the timings
+    events = list(generator.events(num_events))
+
+    if trace_memory:
+        tracemalloc.start()
+
+    insert_ns = 0
+    inserts = 0
+    cancels = 0
+    taker_latencies = []
+    filled = 0
+    clock = time.perf_counter_ns
+
+    started = clock()
+    for kind, payload in events:
+        if kind == MAKER:
+            generator.set_expiration(payload)
+            start = clock()
+            await manager.submit_maker_order(payload)
+            insert_ns += clock() - start
+            inserts += 1
+
+        elif kind == TAKER:
+            start = clock()
+            ok = await manager.process_taker_order(payload)
+            taker_latencies.append(clock() - start)
+            filled += ok
+
+        elif kind == CANCEL:
+            cancels += manager.cancel_order(payload)
+    elapsed_ns = clock() - started
+
+    peak_heap = None
+    if trace_memory:
+        _, peak_heap = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    taker_latencies.sort()
+    to_us = lambda ns: None if ns is None else ns / 1000
+    return {
+        "events": num_events,
+        "elapsed_s": elapsed_ns / 1e9,
+        "events_per_s": num_events / (elapsed_ns / 1e9),
+        "inserts": inserts,
+        "inserts_per_s": inserts / (insert_ns / 1e9) if insert_ns else None,
+        "cancels": cancels,
+        "expired": sum(expired),
+        "takers": len(taker_latencies),
+        "takers_filled": filled,
+        "taker_latency_us": {
+            "p50": to_us(percentile(taker_latencies, 0.50)),
+            "p99": to_us(percentile(taker_latencies, 0.99)),
+            "p999": to_us(percentile(taker_latencies, 0.999)),
+            "max": to_us(taker_latencies[-1] if taker_latencies else None),
+        },
+        "resting_orders": sum(book.get_order_count() for book in order_book.order_books.values()),
+        "peak_heap_bytes": peak_heap,
+        "instrumentation": metrics.registry.snapshot() if metrics is not None else None,
+        # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            * (1 if sys.platform == "darwin" else 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pairs", type=int, default=8)
+    parser.add_argument("--blockchains", type=int, default=3)
+    parser.add_argument("--cancel-ratio", type=float, default=0.3)
+    parser.add_argument("--taker-ratio", type=float, default=0.2)
+    parser.add_argument("--expiry-ratio", type=float, default=0.1)
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--metrics", action="store_true", help="Run with instrumentation enabled")
+    parser.add_argument("--output", help="Also write the JSON result to this file")
+    args = parser.parse_args()
+
+    generator = OrderFlowGenerator(
+        seed=args.seed,
+        num_blockchains=args.blockchains,
+        num_pairs=args.pairs,
+        cancel_ratio=args.cancel_ratio,
+        taker_ratio=args.taker_ratio,
+        expiry_ratio=args.expiry_ratio,
+    )
+    metrics = asyncio.run(run_benchmark(generator, args.events, args.trace_memory, args.metrics))
+
+    result = {
+        "benchmark": "matching_engine",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "metrics": metrics,
+    }
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
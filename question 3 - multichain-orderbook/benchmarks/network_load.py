@@ -0,0 +1,208 @@
+"""
+Drive the order server over TCP with seeded synthetic order flow.
+
+Run from the project root:
+    python -m benchmarks.network_load --events 200000 --connections 4
+
+Without --port, an order server is started in a child process on the
+same synthetic assets and blockchains. Results are printed (and
+optionally written) as JSON so runs can be compared across commits.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import time
+from benchmarks.matching_engine import git_revision, percentile
+from benchmarks.order_flow import OrderFlowGenerator, MAKER, TAKER, CANCEL
+from execution.cross_chain_manager import CrossChainManager
+from network.order_client import OrderClient
+from network.order_server import OrderServer
+from orderbook.multi_chain_order_book import MultiChainOrderBook
+
+
+def _serve(generator, conn):
+    async def run():
+        order_book = MultiChainOrderBook()
+        for blockchain in generator.blockchains:
+            order_book.add_blockchain(blockchain)
+        for asset in generator.assets:
+            order_book.add_asset(asset)
+        manager = CrossChainManager(order_book)
+        generator.register_bridges(manager)
+
+        server = OrderServer(manager, port=0)
+        conn.send(await server.start())
+        # Serve until the parent closes its end of the pipe
+        await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+
+    try:
+        asyncio.run(run())
+    except EOFError:
+        pass
+
+
+def start_server(generator):
+    """
+    Start an order server in a child process.
+
+    Args:
+        generator (OrderFlowGenerator): Flow whose assets and blockchains
+            the server should support
+
+    Returns:
+        tuple: (process, parent pipe end, port)
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    parent_conn, child_conn = context.Pipe()
+    process = context.Process(target=_serve, args=(generator, child_conn), daemon=True)
+    process.start()
+    child_conn.close()
+    return process, parent_conn, parent_conn.recv()
+
+
+async def drive_connection(client, events, window, generator):
+    """
+    Replay events over one connection, keeping up to window requests in flight.
+
+    Args:
+        client (OrderClient): Connected client
+        events (list): (kind, payload) events; cancels carry the Order
+        window (int): Maximum requests in flight
+        generator (OrderFlowGenerator): Generator of the events, which sets
+            expiration times on submission
+
+    Returns:
+        tuple: (per-request latencies in ns, takers filled)
+    """
+    clock = time.perf_counter_ns
+    latencies = []
+    filled = 0
+
+    async def timed(kind, payload):
+        start = clock()
+        if kind == MAKER:
+            generator.set_expiration(payload)
+            result = await client.submit_maker_order(payload)
+        elif kind == TAKER:
+            result = await client.process_taker_order(payload)
+        else:
+            result = await client.cancel_order(payload)
+        latencies.append(clock() - start)
+        return kind == TAKER and result
+
+    for start in range(0, len(events), window):
+        results = await asyncio.gather(*(timed(kind, payload) for kind, payload in events[start:start + window]))
+        filled += sum(results)
+    return latencies, filled
+
+
+async def run_benchmark(generator, num_events, host, port, num_connections, window):
+    """
+    Replay generated order flow against an order server.
+
+    Each trading pair is pinned to one connection, so a pair's events
+    reach the server in generation order.
+
+    Args:
+        generator (OrderFlowGenerator): Source of order flow
+        num_events (int): Number of events to replay
+        host (str): Server address
+        port (int): Server port
+        num_connections (int): Client connections to open
+        window (int): Requests in flight per connection
+
+    Returns:
+        dict: Benchmark metrics
+    """
+    pair_connection = {
+        tuple(pair[:4]): index % num_connections for index, pair in enumerate(generator.pairs)
+    }
+    streams = [[] for _ in range(num_connections)]
+    orders = {}
+    for kind, payload in generator.events(num_events):
+        if kind == CANCEL:
+            payload = orders.pop(payload, None)
+            if payload is None:
+                continue
+        elif kind == MAKER:
+            orders[payload.id] = payload
+        key = (payload.base_asset, payload.quote_asset, payload.base_blockchain, payload.quote_blockchain)
+        streams[pair_connection[key]].append((kind, payload))
+
+    clients = [OrderClient(host, port) for _ in range(num_connections)]
+    for client in clients:
+        await client.connect()
+
+    started = time.perf_counter_ns()
+    results = await asyncio.gather(*(
+        drive_connection(client, stream, window, generator) for client, stream in zip(clients, streams)
+    ))
+    elapsed_ns = time.perf_counter_ns() - started
+
+    for client in clients:
+        await client.close()
+
+    latencies = sorted(latency for stream_latencies, _ in results for latency in stream_latencies)
+    to_us = lambda ns: None if ns is None else ns / 1000
+    return {
+        "requests": len(latencies),
+        "elapsed_s": elapsed_ns / 1e9,
+        "requests_per_s": len(latencies) / (elapsed_ns / 1e9),
+        "takers_filled": sum(filled for _, filled in results),
+        "latency_us": {
+            "p50": to_us(percentile(latencies, 0.50)),
+            "p99": to_us(percentile(latencies, 0.99)),
+            "p999": to_us(percentile(latencies, 0.999)),
+            "max": to_us(latencies[-1] if latencies else None),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pairs", type=int, default=8)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--window", type=int, default=256, help="Requests in flight per connection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Use a running server instead of starting one")
+    parser.add_argument("--output", help="Also write the JSON result to this file")
+    args = parser.parse_args()
+
+    generator = OrderFlowGenerator(seed=args.seed, num_pairs=args.pairs)
+    process = conn = None
+    port = args.port
+    if port is None:
+        process, conn, port = start_server(generator)
+
+    try:
+        metrics = asyncio.run(run_benchmark(
+            generator, args.events, args.host, port, args.connections, args.window
+        ))
+    finally:
+        if process is not None:
+            conn.close()
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+
+    result = {
+        "benchmark": "network_load",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "metrics": metrics,
+    }
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Seeded synthetic order flow for benchmarking the matching engine.
+"""
+import random
+from datetime import datetime
+from models.asset import Asset
+from models.blockchain import Blockchain
+from models.fixed_point import to_units
+from models.order import Order, OrderType
+
+# Event kinds yielded by OrderFlowGenerator.events
+MAKER = "maker"
+TAKER = "taker"
+CANCEL = "cancel"
+
+
+class InstantBridge:
+    """
+    Bridge stand-in that settles every step immediately.
+    """
+
+    async def lock_assets(self, source_chain, asset, amount, sender, recipient):
+        return {"success": True, "txHash": "lock"}
+
+    async def generate_proof(self, source_chain, tx_hash, confirmations):
+        return {"success": True, "proof": {"data": tx_hash}}
+
+    async def release_assets(self, dest_chain, asset, amount, recipient, proof):
+        return {"success": True, "txHash": "release"}
+
+    async def unlock_assets(self, source_chain, asset, amount, sender, tx_hash):
+        return {"success": True, "txHash": "unlock"}
+
+
+class OrderFlowGenerator:
+    """
+    Generates reproducible order flow across many pairs and blockchains.
+
+    Each pair follows its own mid-price random walk. Makers rest around the
+    mid, takers cross it, cancels target a random resting maker and a share
+    of makers expire shortly after submission. Flow is usually generated
+    ahead of the run, so expiring makers get their expiration time from
+    set_expiration when they are actually submitted.
+    """
+
+    def __init__(self, seed=0, num_blockchains=3, num_assets=6, num_pairs=8,
+                 cancel_ratio=0.3, taker_ratio=0.2, expiry_ratio=0.1,
+                 expiry_ms=50, tick_size=0.01, volatility=0.0005, fixed_point=False):
+        """
+        Creates a new order flow generator.
+
+        Args:
+            seed (int, optional): Random seed; equal seeds give equal flow
+            num_blockchains (int, optional): Number of Blockchain instances
+            num_assets (int, optional): Number of assets
+            num_pairs (int, optional): Number of trading pairs
+            cancel_ratio (float, optional): Share of events that are cancels
+            taker_ratio (float, optional): Share of events that are takers
+            expiry_ratio (float, optional): Share of makers that expire
+            expiry_ms (float, optional): Lifetime of expiring makers
+            tick_size (float, optional): Price grid as a fraction of the mid
+            volatility (float, optional): Per-event random walk step size
+            fixed_point (bool, optional): Generate integer fixed-point
+                orders instead of float ones
+        """
+        self.random = random.Random(seed)
+        self.cancel_ratio = cancel_ratio
+        self.taker_ratio = taker_ratio
+        self.expiry_ratio = expiry_ratio
+        self.expiry_ms = expiry_ms
+        self.tick_size = tick_size
+        self.volatility = volatility
+        self.fixed_point = fixed_point
+
+        # Tiny gas prices keep the gas check from rejecting every match
+        self.blockchains = [
+            Blockchain(f"chain{i}", f"Chain {i}", 2 + i, lambda i=i: 1e-9 * (i + 1))
+            for i in range(num_blockchains)
+        ]
+        self.assets = []
+        for i in range(num_assets):
+            asset = Asset(f"asset{i}", f"AS{i}", f"Asset {i}", 18)
+            for blockchain in self.blockchains:
+                asset.add_blockchain_address(blockchain.id, f"0x{i:040x}")
+            self.assets.append(asset)
+
+        self.pairs = []
+        seen = set()
+        while len(self.pairs) < num_pairs:
+            base, quote = self.random.sample(self.assets, 2)
+            base_chain = self.random.choice(self.blockchains)
+            quote_chain = self.random.choice(self.blockchains)
+            key = (base.id, quote.id, base_chain.id, quote_chain.id)
+            if key not in seen:
+                seen.add(key)
+                mid = self.random.uniform(10, 5000)
+                self.pairs.append([base, quote, base_chain, quote_chain, mid])
+
+        self._next_id = 0
+        self._resting = []
+        self._expiring = set()  # IDs of generated makers that should expire
+
+    def _new_order(self, pair, order_type, price, amount):
+        base, quote, base_chain, quote_chain, _ = pair
+        self._next_id += 1
+        if self.fixed_point:
+            amount = to_units(amount, base.decimals)
+            price = to_units(price, quote.decimals)
+        return Order(
+            f"o{self._next_id}", f"0x{self._next_id % 997:040x}", order_type,
+            base, quote, base_chain, quote_chain, amount, price,
+            fixed_point=self.fixed_point
+        )
+
+    def set_expiration(self, order):
+        """
+        Start an expiring maker's lifetime; call right before submitting it.
+
+        Args:
+            order (Order): Maker order yielded by events
+        """
+        if order.id in self._expiring:
+            order.expiration_time = datetime.now().timestamp() * 1000 + self.expiry_ms
+
+    def _price(self, mid, offset_ticks):
+        tick = mid * self.tick_size
+        return round((round(mid / tick) + offset_ticks) * tick, 8)
+
+    def events(self, count):
+        """
+        Generate a stream of order flow events.
+
+        Args:
+            count (int): Number of events
+
+        Yields:
+            tuple: (kind, payload) where payload is an Order for makers and
+                takers, or an order ID for cancels
+        """
+        rand = self.random
+        for _ in range(count):
+            pair = rand.choice(self.pairs)
+            pair[4] *= 1 + rand.gauss(0, self.volatility)
+            mid = pair[4]
+            roll = rand.random()
+
+            if roll < self.cancel_ratio and self._resting:
+                index = rand.randrange(len(self._resting))
+                self._resting[index], self._resting[-1] = self._resting[-1], self._resting[index]
+                yield CANCEL, self._resting.pop()
+
+            elif roll < self.cancel_ratio + self.taker_ratio:
+                order_type = rand.choice((OrderType.BUY, OrderType.SELL))
+                # Takers cross a few ticks past the mid
+                ticks = rand.randint(1, 5)
+                price = self._price(mid, ticks if order_type == OrderType.BUY else -ticks)
+                yield TAKER, self._new_order(pair, order_type, price, rand.uniform(0.1, 5))
+
+            else:
+                order_type = rand.choice((OrderType.BUY, OrderType.SELL))
+                # Makers rest on their own side of the mid
+                ticks = rand.randint(1, 50)
+                price = self._price(mid, -ticks if order_type == OrderType.BUY else ticks)
+                order = self._new_order(pair, order_type, price, rand.uniform(0.1, 10))
+                if rand.random() < self.expiry_ratio:
+                    self._expiring.add(order.id)
+                self._resting.append(order.id)
+                yield MAKER, order
+
+    def register_bridges(self, manager):
+        """
+        Register an InstantBridge between every pair of blockchains.
+
+        Args:
+            manager (CrossChainManager): Manager to register the bridges on
+        """
+        bridge = InstantBridge()
+        for source in self.blockchains:
+            for dest in self.blockchains:
+                manager.register_bridge(source.id, dest.id, bridge)
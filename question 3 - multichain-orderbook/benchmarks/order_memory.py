@@ -0,0 +1,173 @@
+"""
+Memory benchmark comparing the dict-backed Order and OrderMatch layout with
+the slotted one.
+
+Run from the project root:
+    python -m benchmarks.order_memory --orders 1000000 --matches 200000
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+from models.asset import Asset
+from models.blockchain import Blockchain
+from models.order import Order, OrderType, OrderStatus
+from models.order_match import OrderMatch
+
+
+class LegacyOrder:
+    """
+    Order as it was before __slots__: same fields, kept in a per-instance
+    __dict__, without the later pair_key and fixed_point fields.
+    """
+
+    def __init__(self, id, maker, order_type, base_asset, quote_asset,
+                 base_blockchain, quote_blockchain, amount, price, expiration_time=0):
+        if (base_asset.id == quote_asset.id and
+            base_blockchain.id == quote_blockchain.id):
+            raise ValueError("Cannot trade the same asset on the same blockchain")
+
+        self.id = id
+        self.maker = maker
+        self.order_type = order_type
+        self.base_asset = base_asset
+        self.quote_asset = quote_asset
+        self.base_blockchain = base_blockchain
+        self.quote_blockchain = quote_blockchain
+        self.amount = amount
+        self.price = price
+        self.timestamp = datetime.now().timestamp() * 1000
+        self.status = OrderStatus.PENDING
+        self.filled_amount = 0
+        self.expiration_time = expiration_time
+
+
+class LegacyOrderMatch:
+    """
+    OrderMatch as it was before __slots__, holding one dict per maker fill.
+    """
+
+    def __init__(self, id, taker_order):
+        self.id = id
+        self.taker_order = taker_order
+        self.maker_orders = []
+        self.status = "PENDING"
+        self.timestamp = datetime.now().timestamp() * 1000
+
+    def add_maker_order(self, maker_order, fill_amount):
+        self.maker_orders.append({
+            "order": maker_order,
+            "fill_amount": fill_amount
+        })
+
+
+def traced(build):
+    """
+    Measure the memory retained by the objects a callable builds.
+
+    Args:
+        build (callable): Builds and returns the objects to measure
+
+    Returns:
+        int: Bytes retained by the returned objects
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return retained
+
+
+def make_orders(order_class, count, assets, blockchains):
+    """
+    Create a batch of orders.
+
+    Args:
+        order_class (type): Order implementation to instantiate
+        count (int): Number of orders to create
+        assets (tuple): Base and quote Asset
+        blockchains (tuple): Base and quote Blockchain
+
+    Returns:
+        list: The orders
+    """
+    base_asset, quote_asset = assets
+    base_blockchain, quote_blockchain = blockchains
+    return [
+        order_class(
+            i, "0x37BD277C66CdD61bD788825B19A40A5FA3400376",
+            OrderType.SELL if i % 2 else OrderType.BUY,
+            base_asset, quote_asset, base_blockchain, quote_blockchain,
+            1.0 + (i % 100) / 100, 2000.0 + (i % 500)
+        )
+        for i in range(count)
+    ]
+
+
+def make_matches(match_class, count, makers_per_match, orders):
+    """
+    Create a batch of matches over existing orders.
+
+    Only the matches and their maker fills are new, so the measurement
+    leaves out the orders they point to.
+
+    Args:
+        match_class (type): OrderMatch implementation to instantiate
+        count (int): Number of matches to create
+        makers_per_match (int): Maker fills added to each match
+        orders (list): Orders to use as takers and makers
+
+    Returns:
+        list: The matches
+    """
+    matches = []
+    for i in range(count):
+        match = match_class(f"match_{i}", orders[i % len(orders)])
+        for j in range(makers_per_match):
+            match.add_maker_order(orders[(i + j + 1) % len(orders)], 0.25)
+        matches.append(match)
+    return matches
+
+
+def report(name, legacy, compact, count):
+    print(f"{name}:")
+    print(f"  Dict-backed: {legacy / 2**20:8.1f} MiB ({legacy / count:.0f} B each)")
+    print(f"  Slotted:     {compact / 2**20:8.1f} MiB ({compact / count:.0f} B each)")
+    print(f"  Saved:       {(1 - compact / legacy) * 100:8.1f} %")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--matches", type=int, default=200_000)
+    parser.add_argument("--makers-per-match", type=int, default=3)
+    args = parser.parse_args()
+
+    assets = (Asset("eth", "ETH", "Ethereum", 18), Asset("usdc", "USDC", "USD Coin", 6))
+    blockchains = (
+        Blockchain("ethereum", "Ethereum", 15, lambda: 50),
+        Blockchain("polygon", "Polygon", 2, lambda: 20),
+    )
+
+    legacy = traced(lambda: make_orders(LegacyOrder, args.orders, assets, blockchains))
+    compact = traced(lambda: make_orders(Order, args.orders, assets, blockchains))
+    report(f"Orders ({args.orders})", legacy, compact, args.orders)
+
+    # Matches point at shared orders, built outside the measurement
+    orders = make_orders(Order, 1000, assets, blockchains)
+    legacy = traced(lambda: make_matches(
+        LegacyOrderMatch, args.matches, args.makers_per_match, orders
+    ))
+    compact = traced(lambda: make_matches(
+        OrderMatch, args.matches, args.makers_per_match, orders
+    ))
+    report(
+        f"Matches ({args.matches}, {args.makers_per_match} maker fills each)",
+        legacy, compact, args.matches
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,35 @@
+import asyncio
 import logging
-from models.order import OrderStatus
+from time import perf_counter
+from models.order import OrderType, OrderStatus
+from orderbook.smart_order_router import SmartOrderRouter, settlement_chains
 
 class CrossChainManager:
     """
     Handles cross-chain communication and transaction execution.
     """
     
-    def __init__(self, order_book):
+    # Confirmations a lock needs before its proof is generated
+    PROOF_CONFIRMATIONS = 12
+    
+    def __init__(self, order_book, journal=None, bridge_concurrency=8, metrics=None):
         """
         Creates a new cross-chain manager instance.
         
         Args:
             order_book (MultiChainOrderBook): The orderbook instance
+            journal (OrderJournal, optional): Durable log of order book changes
+            bridge_concurrency (int, optional): Maximum in-flight calls per bridge
+            metrics (OrderBookMetrics, optional): Instruments to record
+                stage latencies and outcomes into
         """
         self.order_book = order_book
+        self.journal = journal
+        self.metrics = metrics
         self.bridges = {}  # Maps blockchain pair keys to bridge implementations
+        self.bridge_concurrency = bridge_concurrency
+        self.router = SmartOrderRouter(order_book)
+        self._bridge_limits = {}  # Maps bridge object to its concurrency semaphore
         
     def register_bridge(self, source_chain_id, dest_chain_id, bridge):
         """
@@ -42,24 +57,56 @@ class CrossChainManager:
         key = f"{source_chain_id}_{dest_chain_id}"
         return self.bridges.get(key)
         
-    async def execute_match(self, match):
+    async def execute_match(self, match, gas_fees=None):
         """
         Execute a matched order.
         
+        If the match holds reserved liquidity, the reservation is committed
+        together with the fills on success and released on failure. The
+        match's status ends as COMPLETED or FAILED.
+        
         Args:
             match (OrderMatch): The match to execute
+            gas_fees (dict, optional): Per-chain gas fee memo shared by a batch
             
         Returns:
             bool: True if successful
         """
-        # Calculate total gas costs to ensure the trade is profitable
-        gas_cost = match.estimate_total_gas_cost()
-        total_value = match.taker_order.get_total_value()
+        success = False
+        try:
+            success = await self._settle_match(match, gas_fees)
+            return success
+        finally:
+            if success:
+                match.status = "COMPLETED"
+                self.commit_match(match)
+                if self.metrics is not None:
+                    self.metrics.matches.inc()
+            else:
+                match.status = "FAILED"
+                self.release_match(match)
+    
+    async def _settle_match(self, match, gas_fees):
+        metrics = self.metrics
+        if metrics is not None:
+            started = perf_counter()
+        
+        # Calculate total gas costs to ensure the trade is profitable; the
+        # value is this match's fill, which is only a share of a routed taker
+        gas_cost = match.estimate_total_gas_cost(gas_fees)
+        total_value = match.taker_order.get_quote_amount(match.get_total_fill_amount())
         
         # Check if the trade is worth executing (address constraint #3: Gas Fees)
         MAX_GAS_PERCENT = 0.05  # 5%
-        if gas_cost > total_value * MAX_GAS_PERCENT:
+        gas_too_high = match.taker_order.to_quote_amount(gas_cost) > total_value * MAX_GAS_PERCENT
+        if metrics is not None:
+            now = perf_counter()
+            metrics.stage_latency["gas_check"].observe(now - started)
+            started = now
+        if gas_too_high:
             logging.info(f"Trade rejected: Gas cost too high ({gas_cost} vs {total_value})")
+            if metrics is not None:
+                metrics.rejections["gas"].inc()
             return False
             
         # Structure to track the execution state
@@ -69,28 +116,186 @@ class CrossChainManager:
         
         try:
             # Implement cross-chain trade execution (address constraint #1: Immediate Order Fulfillment)
-            # 1. Lock assets on source chains
-            # 2. Generate proofs of the locks
-            # 3. Release assets on destination chains
+            legs = self.build_settlement_legs(match)
+            
+            # 1. Lock assets on source chains and 2. generate proofs of the
+            # locks, for every leg at once, so latency tracks the slowest leg
+            await self._run_stage(
+                [self._lock_and_prove(leg, execution_state) for leg in legs]
+            )
             
-            # For this implementation, we'll just simulate success
-            # In a real system, this would interact with actual bridges
+            # 3. Release assets on destination chains, only once every lock
+            # is proven so no counterparty is paid against a missing lock
+            await self._run_stage([self._release(leg) for leg in legs])
             
             # Update order statuses
             self.update_order_statuses(match)
             
+            if metrics is not None:
+                metrics.stage_latency["settle"].observe(perf_counter() - started)
             return True
             
         except Exception as e:
             logging.error(f"Failed to execute match: {e}")
+            if metrics is not None:
+                metrics.rejections["settlement"].inc()
+            
+            # Released legs are final and cannot be unlocked, so the match
+            # is now one-sided; record exactly what was paid out
+            released = [leg for leg in execution_state["locked_assets"] if leg.get("released")]
+            for leg in released:
+                logging.error(
+                    f"Manual recovery needed: released {leg['amount']} {leg['asset'].symbol} "
+                    f"on {leg['dest_chain'].id} to {leg['recipient']} (lock {leg['lock_tx_hash']} "
+                    f"on {leg['source_chain'].id}) for a failed match of order {match.taker_order.id}"
+                )
             
             # If we locked any assets but failed later, try to unlock them
             if execution_state["locked_assets"]:
                 logging.info("Attempting to unlock assets after failure")
-                # In a real system, would call unlock methods on bridges
+                await self.unlock_assets(execution_state["locked_assets"])
                 
             return False
     
+    def build_settlement_legs(self, match):
+        """
+        Split a match into the asset transfers needed to settle it.
+        
+        Every maker fill has a base leg (seller to buyer, from the base chain)
+        and a quote leg (buyer to seller, from the quote chain). Each leg is
+        locked on its source chain and released on the counterparty's chain.
+        The maker's side is on its book's chains and the taker's on the
+        taker's own, which differ when the router sent the fill to another
+        book.
+        
+        Args:
+            match (OrderMatch): The match to settle
+            
+        Returns:
+            list: Leg dicts with bridge, chains, asset, amount and parties
+        """
+        taker = match.taker_order
+        legs = []
+        for item in match.maker_orders:
+            maker = item.order
+            if taker.order_type == OrderType.BUY:
+                seller, buyer = maker, taker
+            else:
+                seller, buyer = taker, maker
+            base_leg, quote_leg = settlement_chains(
+                taker, maker.base_blockchain, maker.quote_blockchain
+            )
+                
+            legs.append(self._build_leg(
+                base_leg[0], base_leg[1], maker.base_asset,
+                item.fill_amount, seller.maker, buyer.maker
+            ))
+            legs.append(self._build_leg(
+                quote_leg[0], quote_leg[1], maker.quote_asset,
+                maker.get_quote_amount(item.fill_amount), buyer.maker, seller.maker
+            ))
+        return legs
+    
+    def _build_leg(self, source_chain, dest_chain, asset, amount, sender, recipient):
+        bridge = self.get_bridge(source_chain.id, dest_chain.id)
+        if bridge is None:
+            raise ValueError(f"No bridge registered from {source_chain.id} to {dest_chain.id}")
+            
+        return {
+            "bridge": bridge,
+            "source_chain": source_chain,
+            "dest_chain": dest_chain,
+            "asset": asset,
+            "amount": amount,
+            "sender": sender,
+            "recipient": recipient
+        }
+    
+    def _get_bridge_limit(self, bridge):
+        # Keyed by the bridge itself: holding it keeps its id() from being
+        # reused by a new bridge that would then share the semaphore
+        limit = self._bridge_limits.get(bridge)
+        if limit is None:
+            limit = asyncio.Semaphore(self.bridge_concurrency)
+            self._bridge_limits[bridge] = limit
+        return limit
+    
+    @staticmethod
+    async def _run_stage(steps):
+        # Let every step finish (so all locks get recorded) before failing
+        results = await asyncio.gather(*steps, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+    
+    async def _lock_and_prove(self, leg, execution_state):
+        bridge = leg["bridge"]
+        async with self._get_bridge_limit(bridge):
+            lock = await bridge.lock_assets(
+                leg["source_chain"], leg["asset"], leg["amount"],
+                leg["sender"], leg["recipient"]
+            )
+        if not lock.get("success"):
+            raise RuntimeError(f"Failed to lock {leg['asset'].symbol} on {leg['source_chain'].id}")
+            
+        leg["lock_tx_hash"] = lock.get("txHash")
+        execution_state["locked_assets"].append(leg)
+        
+        async with self._get_bridge_limit(bridge):
+            proof = await bridge.generate_proof(
+                leg["source_chain"], leg["lock_tx_hash"], self.PROOF_CONFIRMATIONS
+            )
+        if not proof.get("success"):
+            raise RuntimeError(f"Failed to prove lock {leg['lock_tx_hash']} on {leg['source_chain'].id}")
+            
+        leg["proof"] = proof.get("proof")
+    
+    async def _release(self, leg):
+        bridge = leg["bridge"]
+        async with self._get_bridge_limit(bridge):
+            release = await bridge.release_assets(
+                leg["dest_chain"], leg["asset"], leg["amount"],
+                leg["recipient"], leg["proof"]
+            )
+        if not release.get("success"):
+            raise RuntimeError(f"Failed to release {leg['asset'].symbol} on {leg['dest_chain'].id}")
+            
+        leg["released"] = True
+    
+    async def unlock_assets(self, locked_assets):
+        """
+        Return locked assets to their senders after a failed execution.
+        
+        Legs that were already released are final and are skipped.
+        
+        Args:
+            locked_assets (list): Locked legs from the execution state
+            
+        Returns:
+            bool: True if every pending lock was undone
+        """
+        pending = [leg for leg in locked_assets if not leg.get("released")]
+        
+        async def unlock(leg):
+            bridge = leg["bridge"]
+            if not hasattr(bridge, "unlock_assets"):
+                raise RuntimeError(f"Bridge for {leg['source_chain'].id} cannot unlock assets")
+            async with self._get_bridge_limit(bridge):
+                result = await bridge.unlock_assets(
+                    leg["source_chain"], leg["asset"], leg["amount"],
+                    leg["sender"], leg["lock_tx_hash"]
+                )
+            if not result.get("success"):
+                raise RuntimeError(f"Failed to unlock {leg['lock_tx_hash']} on {leg['source_chain'].id}")
+        
+        results = await asyncio.gather(*(unlock(leg) for leg in pending), return_exceptions=True)
+        ok = True
+        for leg, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logging.error(f"Manual recovery needed for {leg['amount']} {leg['asset'].symbol}: {result}")
+                ok = False
+        return ok
+    
     def update_order_statuses(self, match):
         """
         Update order statuses after a successful match.
@@ -107,21 +312,27 @@ class CrossChainManager:
         
         # Update maker orders
         for item in match.maker_orders:
-            maker_order = item["order"]
-            fill_amount = item["fill_amount"]
+            maker_order = item.order
+            fill_amount = item.fill_amount
             
-            maker_order.filled_amount += fill_amount
-            if maker_order.filled_amount >= maker_order.amount:
-                maker_order.status = OrderStatus.FILLED
+            if self.journal:
+                self.journal.record_fill(maker_order, fill_amount)
                 
-                # Remove filled orders from the order book
-                order_book_key = (f"{maker_order.base_asset.id}_{maker_order.quote_asset.id}_"
-                                 f"{maker_order.base_blockchain.id}_{maker_order.quote_blockchain.id}")
-                order_book = self.order_book.order_books.get(order_book_key)
-                if order_book:
-                    order_book.remove_order(maker_order.id)
+            # Apply the fill through the book so its depth stays current;
+            # filled orders are removed from the order book
+            order_book = self.order_book.get_order_book_for(maker_order)
+            if order_book:
+                if not order_book.apply_fill(maker_order, fill_amount):
+                    logging.error(
+                        f"Fill of {fill_amount} on maker order {maker_order.id} settled after it "
+                        f"left the book (status {maker_order.status.value})"
+                    )
             else:
-                maker_order.status = OrderStatus.PARTIALLY_FILLED
+                maker_order.filled_amount += fill_amount
+                if maker_order.filled_amount >= maker_order.amount:
+                    maker_order.status = OrderStatus.FILLED
+                else:
+                    maker_order.status = OrderStatus.PARTIALLY_FILLED
     
     async def submit_maker_order(self, order):
         """
@@ -147,36 +358,381 @@ class CrossChainManager:
             )
             
             order_book.add_order(order)
+            if self.journal:
+                self.journal.record_add(order)
+            if self.metrics is not None:
+                self.metrics.maker_orders.inc()
             return True
         except Exception as e:
             logging.error(f"Failed to submit maker order: {e}")
             order.status = OrderStatus.FAILED
             return False
     
-    async def process_taker_order(self, order):
+    def cancel_order(self, order_id):
         """
-        Process a taker order immediately.
+        Cancel a resting maker order.
+        
+        An order with liquidity held by a settling match cannot be
+        cancelled until that match commits or is released.
         
         Args:
-            order (Order): Taker order to process
+            order_id (str): ID of the order to cancel
             
         Returns:
-            bool: True if successful
+            bool: True if the order was found and cancelled
+        """
+        order_book = self.order_book.get_order_book_for_id(order_id)
+        if order_book is None:
+            return False
+        order = order_book.get_order(order_id)
+        if order is None or order_book.reservations.get_reserved_amount(order) > 0:
+            return False
+        
+        order_book.remove_order(order_id)
+        order.status = OrderStatus.CANCELLED
+        if self.journal:
+            self.journal.record_cancel(order)
+        if self.metrics is not None:
+            self.metrics.cancels["user"].inc()
+        return True
+    
+    def reduce_order(self, order_id, new_amount):
+        """
+        Reduce a resting maker order's size, keeping its place in the queue.
+        
+        Args:
+            order_id (str): ID of the order to amend
+            new_amount (float): New total amount, including filled amount
+            
+        Returns:
+            bool: True if the order was found and reduced
         """
+        try:
+            order = self.order_book.reduce_order(order_id, new_amount)
+        except (KeyError, ValueError) as e:
+            logging.info(f"Reduce of order {order_id} rejected: {e}")
+            return False
+        
+        if self.journal:
+            self.journal.record_reduce(order)
+        if self.metrics is not None:
+            self.metrics.amends["reduce"].inc()
+        return True
+    
+    def replace_order(self, order_id, price=None, amount=None):
+        """
+        Replace a resting maker order's price and/or size.
+        
+        The order moves to the back of the queue at its new price, as if
+        it had just been submitted. Orders held by a settling match cannot
+        be replaced.
+        
+        Args:
+            order_id (str): ID of the order to replace
+            price (float, optional): New price
+            amount (float, optional): New total amount, including filled amount
+            
+        Returns:
+            bool: True if the order was found and replaced
+        """
+        try:
+            order = self.order_book.replace_order(order_id, price, amount)
+        except (KeyError, ValueError) as e:
+            logging.info(f"Replace of order {order_id} rejected: {e}")
+            return False
+        
+        if self.journal:
+            self.journal.record_replace(order)
+        if self.metrics is not None:
+            self.metrics.amends["replace"].inc()
+        return True
+    
+    def match_taker_order(self, order, order_book=None, cursor=None):
+        """
+        Match a taker order against the book without settling it.
+        
+        Args:
+            order (Order): Taker order to match
+            order_book (OrderBookPair, optional): Book already looked up for
+                the order's pair
+            cursor (MatchCursor, optional): Walk shared by a batch of takers
+            
+        Returns:
+            OrderMatch: The match, or None if liquidity is insufficient or
+                the order's amount mode differs from the book's
+        """
+        match, reason = self._find_match(order, order_book, cursor)
+        if reason is not None:
+            self._record_rejection(order, match, reason)
+            return None
+        return match
+    
+    def _find_match(self, order, order_book, cursor):
+        # Returns (match, rejection reason); reasons are recorded by callers
+        # once the rejection is final
+        metrics = self.metrics
+        if metrics is not None:
+            started = perf_counter()
+        
+        # Reject a taker in the other amount mode here, so one bad order
+        # cannot abort a whole batch
+        if order_book is None:
+            order_book = self.order_book.get_order_book_for(order)
+        if order_book is not None and not order_book.accepts_amount_mode(order):
+            return None, "amount_mode"
+        
         # Find matching orders
-        match = self.order_book.process_taker_order(order)
+        match = self.order_book.process_taker_order(order, order_book, cursor)
+        
+        if metrics is not None:
+            metrics.stage_latency["match"].observe(perf_counter() - started)
         
         # Check if we found enough liquidity (address constraint #2: Liquidity Challenges)
         if match.get_total_fill_amount() < order.amount:
-            logging.info(f"Insufficient liquidity: Found {match.get_total_fill_amount()} of {order.amount}")
-            
             # Options for handling insufficient liquidity:
             # 1. Reject the order completely
             # 2. Fill what we can and convert the rest to a maker order
             # 3. Fill what we can and return the rest
             
             # For this implementation, we'll use option 1: reject the order
+            return match, "liquidity"
+            
+        return match, None
+    
+    def _record_rejection(self, order, match, reason):
+        if reason == "amount_mode":
+            logging.info(f"Taker order {order.id} rejected: Amount mode differs from its book")
+        else:
+            logging.info(f"Insufficient liquidity: Found {match.get_total_fill_amount()} of {order.amount}")
+        if self.metrics is not None:
+            self.metrics.rejections[reason].inc()
+    
+    def _group_fills_by_book(self, match):
+        fills_by_book = {}
+        for item in match.maker_orders:
+            order_book = self.order_book.get_order_book_for(item.order)
+            fills_by_book.setdefault(order_book, []).append((item.order, item.fill_amount))
+        return fills_by_book
+    
+    def reserve_match(self, match):
+        """
+        Atomically hold the maker liquidity used by a match until it settles.
+        
+        Args:
+            match (OrderMatch): Match to reserve
+            
+        Raises:
+            ValueError: If any maker no longer has the liquidity available,
+                in which case nothing is reserved
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            started = perf_counter()
+        
+        reserved = []
+        try:
+            for order_book, fills in self._group_fills_by_book(match).items():
+                order_book.reservations.reserve(match, fills)
+                reserved.append(order_book)
+        except ValueError:
+            for order_book in reserved:
+                order_book.release_reservation(match)
+            if metrics is not None:
+                metrics.rejections["reservation"].inc()
+            raise
+        
+        if metrics is not None:
+            metrics.stage_latency["reserve"].observe(perf_counter() - started)
+    
+    def commit_match(self, match):
+        """
+        Drop a settled match's reservations; its fills are already applied.
+        
+        Args:
+            match (OrderMatch): The settled match
+        """
+        for order_book in self._group_fills_by_book(match):
+            if order_book is not None:
+                order_book.commit_reservation(match)
+    
+    def release_match(self, match):
+        """
+        Hand a failed match's reserved liquidity back to the book.
+        
+        Args:
+            match (OrderMatch): The failed match
+        """
+        for order_book in self._group_fills_by_book(match):
+            if order_book is not None:
+                order_book.release_reservation(match)
+    
+    async def process_taker_order(self, order, order_book=None, gas_fees=None):
+        """
+        Process a taker order immediately.
+        
+        Args:
+            order (Order): Taker order to process
+            order_book (OrderBookPair, optional): Book already looked up for
+                the order's pair
+            gas_fees (dict, optional): Per-chain gas fee memo shared by a batch
+            
+        Returns:
+            bool: True if successful
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            started = perf_counter()
+        
+        match = self.match_taker_order(order, order_book)
+        if match is None:
+            result = False
+        else:
+            # Hold the liquidity so concurrent takers cannot match it while
+            # this one settles
+            self.reserve_match(match)
+            
+            # Execute the match (this addresses constraint #1: Immediate Order Fulfillment)
+            result = await self.execute_match(match, gas_fees)
+        
+        if metrics is not None:
+            metrics.stage_latency["taker_total"].observe(perf_counter() - started)
+        return result
+    
+    async def process_routed_taker_order(self, order, allowed_chains=None):
+        """
+        Process a taker order against every book trading the same assets.
+        
+        The router splits the taker across books on any allowed chain
+        combination, ranking liquidity by price net of gas and bridge costs.
+        Every book's share is reserved before any settles, then all shares
+        settle concurrently, each on its own legs and gas check.
+        
+        Settled shares are final, so if only some settle the taker is left
+        PARTIALLY_FILLED with filled_amount covering exactly those; shares
+        that failed have their reservations released.
+        
+        Args:
+            order (Order): Taker order to process
+            allowed_chains (set, optional): Allowed (base_blockchain_id,
+                quote_blockchain_id) pairs for the books used
+            
+        Returns:
+            bool: True if every share settled
+        """
+        matches = self.router.route(order, allowed_chains)
+        
+        total_fill = sum(match.get_total_fill_amount() for match in matches)
+        if total_fill < order.amount:
+            logging.info(f"Insufficient routed liquidity: Found {total_fill} of {order.amount}")
+            if self.metrics is not None:
+                self.metrics.rejections["liquidity"].inc()
             return False
         
-        # Execute the match (this addresses constraint #1: Immediate Order Fulfillment)
-        return await self.execute_match(match)
\ No newline at end of file
+        reserved = []
+        try:
+            for match in matches:
+                self.reserve_match(match)
+                reserved.append(match)
+        except ValueError:
+            for match in reserved:
+                self.release_match(match)
+            raise
+        
+        gas_fees = {}
+        results = await asyncio.gather(*(self.execute_match(match, gas_fees) for match in matches))
+        if not all(results) and any(results):
+            logging.warning(
+                f"Routed order {order.id} partially filled: {order.filled_amount} of {order.amount} "
+                f"settled, {results.count(False)} of {len(results)} shares failed"
+            )
+        return all(results)
+    
+    async def process_taker_orders(self, orders):
+        """
+        Process a burst of taker orders in one batch.
+        
+        Takers are grouped by trading pair and handled in arrival order
+        within each group. Each group is matched in one best-first pass per
+        side of its book: every taker picks up where the previous one
+        stopped and its match is reserved straight away. The matches then
+        settle in order, with gas estimated once per chain for the batch.
+        
+        If a match fails to settle, its liquidity goes back to the book, so
+        the takers after it are released and matched again, just as they
+        would have been one by one. Pairs never share liquidity, so the
+        results match processing the orders one by one. With a fill
+        optimiser, which does not fill best-first, takers are matched one
+        at a time.
+        
+        Args:
+            orders (list): Taker orders to process
+            
+        Returns:
+            list: Per-order results (True if successful), in input order
+        """
+        # Group by pair, remembering each order's position in the batch
+        groups = {}
+        for index, order in enumerate(orders):
+            order_book = self.order_book.get_order_book_for(order)
+            group = groups.get(order.pair_key)
+            if group is None:
+                group = groups[order.pair_key] = (order_book, [])
+            group[1].append((order.timestamp, index, order))
+        
+        results = [False] * len(orders)
+        gas_fees = {}
+        for order_book, group in groups.values():
+            # Sort by arrival; the batch index keeps ties in input order
+            group.sort(key=lambda item: (item[0], item[1]))
+            if order_book is None or self.order_book.fill_optimizer is not None:
+                for _, index, order in group:
+                    results[index] = await self.process_taker_order(order, order_book, gas_fees)
+                continue
+            
+            pending = [(index, order) for _, index, order in group]
+            while pending:
+                pending = await self._settle_group(order_book, pending, results, gas_fees)
+                
+        return results
+    
+    def _match_group(self, order_book, pending):
+        cursors = {}
+        matches = []
+        for index, order in pending:
+            started = perf_counter()
+            cursor = cursors.get(order.order_type)
+            if cursor is None:
+                cursor = cursors[order.order_type] = order_book.match_cursor(order.order_type)
+            match, reason = self._find_match(order, order_book, cursor)
+            if reason is None:
+                self.reserve_match(match)
+                cursor.advance()
+            matches.append((index, order, match, reason, perf_counter() - started))
+        return matches
+    
+    async def _settle_group(self, order_book, pending, results, gas_fees):
+        # Returns the takers that must be matched again
+        matches = self._match_group(order_book, pending)
+        metrics = self.metrics
+        for position, (index, order, match, reason, match_time) in enumerate(matches):
+            if reason is not None:
+                self._record_rejection(order, match, reason)
+                if metrics is not None:
+                    metrics.stage_latency["taker_total"].observe(match_time)
+                continue
+            
+            started = perf_counter()
+            results[index] = await self.execute_match(match, gas_fees)
+            if metrics is not None:
+                metrics.stage_latency["taker_total"].observe(match_time + perf_counter() - started)
+            if results[index]:
+                continue
+            
+            # The failed match's liquidity is back in the book, where the
+            # takers behind it would have found it one by one
+            rest = matches[position + 1:]
+            for _, _, later, later_reason, _ in rest:
+                if later_reason is None:
+                    self.release_match(later)
+            return [(later_index, later_order) for later_index, later_order, _, _, _ in rest]
+        return []
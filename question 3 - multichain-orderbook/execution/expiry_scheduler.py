@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from datetime import datetime
+
+class ExpiryScheduler:
+    """
+    Background task that evicts expired maker orders from every order book.
+    """
+
+    def __init__(self, order_book, interval=1.0):
+        """
+        Creates a new expiry scheduler.
+
+        Evictions are reported through the order book's expiry listeners,
+        which also hear about orders purged lazily during matching.
+
+        Args:
+            order_book (MultiChainOrderBook): The orderbook instance
+            interval (float, optional): Maximum seconds between purges
+        """
+        self.order_book = order_book
+        self.interval = interval
+        self._task = None
+
+    def purge_expired(self):
+        """
+        Evict expired orders from all order books in one batch.
+
+        Returns:
+            list: Orders that were evicted and marked as cancelled
+        """
+        now = datetime.now().timestamp() * 1000
+        evicted = []
+        for order_book in list(self.order_book.order_books.values()):
+            evicted.extend(order_book.purge_expired(now))
+
+        if evicted:
+            logging.info(f"Expired {len(evicted)} orders")
+        return evicted
+
+    def get_sleep_time(self):
+        """
+        Get how long to sleep before the next purge.
+
+        Wakes up early when an order is due before the regular interval.
+
+        Returns:
+            float: Seconds to sleep
+        """
+        deadlines = [
+            deadline for deadline in
+            (book.get_next_expiration() for book in self.order_book.order_books.values())
+            if deadline is not None
+        ]
+        if not deadlines:
+            return self.interval
+
+        now = datetime.now().timestamp() * 1000
+        return max(0, min(self.interval, (min(deadlines) - now) / 1000))
+
+    async def run(self):
+        """
+        Purge expired orders until cancelled.
+        """
+        while True:
+            self.purge_expired()
+            await asyncio.sleep(self.get_sleep_time())
+
+    def start(self):
+        """
+        Start the scheduler as a background task on the running event loop.
+
+        Returns:
+            asyncio.Task: The background task
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        """
+        Stop the background task and wait for it to finish.
+        """
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
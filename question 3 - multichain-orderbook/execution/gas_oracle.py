@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+class GasOracle:
+    """
+    Caches gas prices per blockchain so fee estimates are served from memory.
+    """
+
+    def __init__(self, ttl=5.0, refresh_interval=None, clock=time.monotonic):
+        """
+        Creates a new gas oracle.
+
+        Args:
+            ttl (float, optional): Seconds a cached gas price stays fresh
+            refresh_interval (float, optional): Seconds between background
+                refreshes (defaults to half the TTL)
+            clock (callable, optional): Monotonic clock returning seconds
+        """
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval or ttl / 2
+        self.clock = clock
+        self.blockchains = {}  # Maps blockchain ID to Blockchain objects
+        self._cache = {}  # Maps blockchain ID to (gas_price, fetched_at)
+        self._lock = threading.Lock()  # Guards _inflight across threads
+        self._inflight = {}  # Maps blockchain ID to the Future of its running fetch
+        self._task = None
+
+    def register(self, blockchain):
+        """
+        Route a blockchain's gas price lookups through this oracle.
+
+        Args:
+            blockchain (Blockchain): Blockchain to serve
+        """
+        self.blockchains[blockchain.id] = blockchain
+        blockchain.gas_oracle = self
+
+    def get_cached_gas_price(self, blockchain):
+        """
+        Get a blockchain's gas price if the cached value is still fresh.
+
+        Args:
+            blockchain (Blockchain): Blockchain to look up
+
+        Returns:
+            float: Cached gas price or None if missing or stale
+        """
+        entry = self._cache.get(blockchain.id)
+        if entry is not None and self.clock() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def get_gas_price(self, blockchain):
+        """
+        Get a blockchain's current gas price.
+
+        Fresh values come straight from the cache. On a miss the estimator is
+        called once; concurrent callers for the same chain, including
+        background refreshes, wait for that call instead of issuing their own.
+
+        Args:
+            blockchain (Blockchain): Blockchain to look up
+
+        Returns:
+            float: Current gas price
+        """
+        gas_price = self.get_cached_gas_price(blockchain)
+        if gas_price is not None:
+            return gas_price
+
+        if blockchain.id not in self.blockchains:
+            return blockchain.gas_estimator()
+
+        with self._lock:
+            # Another caller may have refreshed while we waited
+            gas_price = self.get_cached_gas_price(blockchain)
+            if gas_price is not None:
+                return gas_price
+            pending, owner = self._claim(blockchain)
+        if owner:
+            self._fetch(blockchain, pending)
+        return pending.result()
+
+    def _claim(self, blockchain):
+        # Call with _lock held. Returns the chain's running fetch and
+        # whether the caller just became responsible for running it
+        pending = self._inflight.get(blockchain.id)
+        if pending is not None:
+            return pending, False
+        pending = self._inflight[blockchain.id] = Future()
+        return pending, True
+
+    def _fetch(self, blockchain, pending):
+        # Runs the estimator and always resolves pending, whichever thread
+        # or task asked for it and whether or not that caller is still waiting
+        try:
+            gas_price = blockchain.gas_estimator()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[blockchain.id]
+            pending.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        with self._lock:
+            self._cache[blockchain.id] = (gas_price, self.clock())
+            del self._inflight[blockchain.id]
+        pending.set_result(gas_price)
+
+    async def refresh(self, blockchain):
+        """
+        Fetch a fresh gas price without blocking the event loop.
+
+        Refreshes and blocking lookups for the same chain share a single
+        estimator call. The call runs on a worker thread that resolves it
+        on its own, so cancelling the caller that started it leaves the
+        other callers waiting for a result that will arrive.
+
+        Args:
+            blockchain (Blockchain): Blockchain to refresh
+
+        Returns:
+            float: Fresh gas price
+        """
+        with self._lock:
+            pending, owner = self._claim(blockchain)
+        if owner:
+            asyncio.get_running_loop().run_in_executor(None, self._fetch, blockchain, pending)
+        return await asyncio.shield(asyncio.wrap_future(pending))
+
+    async def refresh_all(self):
+        """
+        Refresh every registered blockchain concurrently.
+
+        Failures are logged and leave the previous cached value in place.
+        """
+        blockchains = list(self.blockchains.values())
+        results = await asyncio.gather(
+            *(self.refresh(blockchain) for blockchain in blockchains),
+            return_exceptions=True
+        )
+        for blockchain, result in zip(blockchains, results):
+            if isinstance(result, Exception):
+                logging.warning(f"Gas price refresh failed for {blockchain.id}: {result}")
+
+    async def run(self):
+        """
+        Keep every registered blockchain's gas price warm until cancelled.
+        """
+        while True:
+            await self.refresh_all()
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """
+        Start background refreshing on the running event loop.
+
+        Returns:
+            asyncio.Task: The background task
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        """
+        Stop background refreshing and wait for it to finish.
+        """
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+
+class SettlementPipeline:
+    """
+    Decouples matching from settlement with a bounded queue of matches.
+
+    Takers are matched and their maker liquidity reserved immediately; the
+    resulting matches are then settled by a pool of workers, so matching
+    throughput does not depend on bridge latency.
+    """
+
+    def __init__(self, manager, num_workers=4, max_queue_size=1000):
+        """
+        Creates a new settlement pipeline.
+
+        Args:
+            manager (CrossChainManager): Manager used to match and settle
+            num_workers (int, optional): Concurrent settlement workers
+            max_queue_size (int, optional): Matches allowed to wait for a
+                worker before submitters are made to wait
+        """
+        self.manager = manager
+        self.num_workers = num_workers
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.settled_count = 0
+        self.failed_count = 0
+        self._in_flight = 0
+        self._workers = []
+
+    def get_queue_depth(self):
+        """
+        Get the number of matches waiting for a settlement worker.
+
+        Returns:
+            int: Queued matches
+        """
+        return self.queue.qsize()
+
+    def get_in_flight_count(self):
+        """
+        Get the number of matches queued or being settled.
+
+        Returns:
+            int: Unsettled matches
+        """
+        return self._in_flight
+
+    async def submit_taker_order(self, order):
+        """
+        Match a taker order and queue its settlement.
+
+        Waits only when the queue is full, which applies backpressure to
+        the submitter instead of letting unsettled matches pile up.
+
+        Args:
+            order (Order): Taker order to process
+
+        Returns:
+            asyncio.Future: Resolves to True once the match settles, or to
+                False if it was rejected or failed to settle
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        match = self.manager.match_taker_order(order)
+        if match is None:
+            future.set_result(False)
+            return future
+
+        # Reserve before yielding to the loop so no other taker can match
+        # the same liquidity
+        self.manager.reserve_match(match)
+        self._in_flight += 1
+        try:
+            await self.queue.put((match, future))
+        except BaseException:
+            self._in_flight -= 1
+            self.manager.release_match(match)
+            raise
+        return future
+
+    async def _run_worker(self):
+        while True:
+            match, future = await self.queue.get()
+            ok = False
+            try:
+                # Commits the reservation on success and releases it otherwise
+                ok = await self.manager.execute_match(match)
+            except Exception as e:
+                logging.error(f"Settlement worker failed on {match.id}: {e}")
+            finally:
+                if ok:
+                    self.settled_count += 1
+                else:
+                    self.failed_count += 1
+                if not future.done():
+                    future.set_result(ok)
+                self._in_flight -= 1
+                self.queue.task_done()
+
+    def start(self):
+        """
+        Start the settlement workers on the running event loop.
+        """
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._run_worker()) for _ in range(self.num_workers)
+            ]
+
+    async def stop(self, drain=True):
+        """
+        Stop the settlement workers.
+
+        Args:
+            drain (bool, optional): Settle every queued match before stopping
+        """
+        if drain:
+            await self.queue.join()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        # Anything still queued will never settle; hand its liquidity back
+        while not self.queue.empty():
+            match, future = self.queue.get_nowait()
+            self.manager.release_match(match)
+            if not future.done():
+                future.set_result(False)
+            self._in_flight -= 1
+            self.queue.task_done()
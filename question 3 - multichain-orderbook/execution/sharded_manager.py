@@ -0,0 +1,410 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from models.order import Order, OrderType, OrderStatus
+from orderbook.pair_key import PairKey
+from execution.cross_chain_manager import CrossChainManager
+
+
+def encode_order(order):
+    """
+    Flatten an order into primitives that can cross a process boundary.
+
+    Assets and blockchains are sent by ID and resolved against the shard's
+    own registry, so their estimators and providers never need pickling.
+
+    Args:
+        order (Order): Order to encode
+
+    Returns:
+        tuple: Encoded order
+    """
+    return (
+        order.id, order.maker, order.order_type.value,
+        order.base_asset.id, order.quote_asset.id,
+        order.base_blockchain.id, order.quote_blockchain.id,
+        order.amount, order.price, order.timestamp, order.status.value,
+        order.filled_amount, order.expiration_time, order.fixed_point
+    )
+
+
+def decode_order(encoded, order_book):
+    """
+    Rebuild an order encoded by encode_order.
+
+    Args:
+        encoded (tuple): Encoded order
+        order_book (MultiChainOrderBook): Registry of assets and blockchains
+
+    Returns:
+        Order: The rebuilt order
+    """
+    (id, maker, order_type, base_asset_id, quote_asset_id, base_blockchain_id,
+     quote_blockchain_id, amount, price, timestamp, status, filled_amount,
+     expiration_time, fixed_point) = encoded
+
+    order = Order(
+        id, maker, OrderType(order_type),
+        order_book.supported_assets[base_asset_id],
+        order_book.supported_assets[quote_asset_id],
+        order_book.supported_blockchains[base_blockchain_id],
+        order_book.supported_blockchains[quote_blockchain_id],
+        amount, price, expiration_time, fixed_point
+    )
+    order.timestamp = timestamp
+    order.status = OrderStatus(status)
+    order.filled_amount = filled_amount
+    return order
+
+
+class _FillRecorder:
+    """
+    Journal stand-in that remembers the maker orders a request filled.
+    """
+
+    def __init__(self):
+        self.filled = {}  # Maps order ID to the shard's maker order
+
+    def record_add(self, order):
+        pass
+
+    def record_cancel(self, order):
+        pass
+
+    def record_reduce(self, order):
+        pass
+
+    def record_replace(self, order):
+        pass
+
+    def record_fill(self, order, fill_amount):
+        self.filled[order.id] = order
+
+
+def _run_shard(conn, order_book, bridges):
+    """
+    Worker loop owning every trading pair hashed to one shard.
+
+    Requests are handled strictly in arrival order, and each reply is sent
+    in the same order, which is what lets the router pipeline requests.
+    Besides the submitted orders, a reply carries the state of every maker
+    order the request filled.
+
+    Args:
+        conn (Connection): Worker end of the shard pipe
+        order_book (MultiChainOrderBook): Registry of assets and blockchains
+        bridges (dict): Maps (source_chain_id, dest_chain_id) to a bridge
+    """
+    recorder = _FillRecorder()
+    manager = CrossChainManager(order_book, journal=recorder)
+    for (source_chain_id, dest_chain_id), bridge in bridges.items():
+        manager.register_bridge(source_chain_id, dest_chain_id, bridge)
+    loop = asyncio.new_event_loop()
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+
+        op, encoded_orders = request
+        recorder.filled.clear()
+        try:
+            orders = [decode_order(encoded, order_book) for encoded in encoded_orders]
+            if op == "submit":
+                results = [
+                    loop.run_until_complete(manager.submit_maker_order(order))
+                    for order in orders
+                ]
+            elif op == "take":
+                results = loop.run_until_complete(manager.process_taker_orders(orders))
+            else:
+                raise ValueError(f"Unknown shard operation: {op}")
+
+            conn.send((True, [
+                (result, order.status.value, order.filled_amount)
+                for result, order in zip(results, orders)
+            ], [
+                (order.id, order.status.value, order.filled_amount)
+                for order in recorder.filled.values()
+            ]))
+        except Exception as e:
+            logging.error(f"Shard request failed: {e}")
+            conn.send((False, str(e), []))
+
+    loop.close()
+    conn.close()
+
+
+class ShardedCrossChainManager:
+    """
+    Routes orders to a pool of worker processes, each owning a subset of pairs.
+
+    Pairs are assigned to shards by a stable hash of their PairKey, so all
+    orders for a pair meet in the same process while different pairs match
+    in parallel on separate cores. Fills a shard applies to maker orders
+    are mirrored onto the maker Order objects submitted through this
+    manager.
+    """
+
+    def __init__(self, order_book, num_shards=None):
+        """
+        Creates a new sharded manager.
+
+        Args:
+            order_book (MultiChainOrderBook): Registry of supported assets and
+                blockchains, copied into every shard
+            num_shards (int, optional): Worker processes (defaults to CPU count)
+        """
+        self.order_book = order_book
+        self.num_shards = num_shards or os.cpu_count() or 1
+        self.bridges = {}  # Maps (source_chain_id, dest_chain_id) to a bridge
+        self._shard_indexes = {}  # Maps PairKey to shard index
+        self._processes = []
+        self._connections = []
+        self._pending = []  # Per-shard FIFO of futures awaiting a reply
+        self._senders = []  # Per-shard single-thread executor writing requests
+        self._makers = {}  # Maps order ID to a resting maker Order submitted here
+        self._loop = None
+
+    def register_bridge(self, source_chain_id, dest_chain_id, bridge):
+        """
+        Register a bridge for a blockchain pair on every shard.
+
+        Bridges are handed to the shards when they start, so register them
+        before calling start().
+
+        Args:
+            source_chain_id (str): ID of source blockchain
+            dest_chain_id (str): ID of destination blockchain
+            bridge (object): Bridge implementation
+        """
+        self.bridges[(source_chain_id, dest_chain_id)] = bridge
+
+    def get_shard_index(self, order):
+        """
+        Get the shard owning an order's trading pair.
+
+        Args:
+            order (Order): Order to route
+
+        Returns:
+            int: Shard index
+        """
+        key = order.pair_key
+        if key is None:
+            key = order.pair_key = PairKey.for_order(order)
+
+        index = self._shard_indexes.get(key)
+        if index is None:
+            # crc32 is stable across processes, unlike the builtin str hash
+            digest = zlib.crc32("\x1f".join(key).encode())
+            index = self._shard_indexes[key] = digest % self.num_shards
+        return index
+
+    def start(self):
+        """
+        Start the shard processes.
+
+        Shards are forked where the platform supports it, so they inherit the
+        configured assets and blockchains. Elsewhere the registry is pickled,
+        which requires picklable gas estimators. Forking a process that
+        already runs an event loop or other threads is unsafe, so call this
+        before the loop starts; the shards attach to the loop on first use.
+
+        Raises:
+            RuntimeError: If called from a running event loop on a platform
+                that forks
+        """
+        methods = multiprocessing.get_all_start_methods()
+        if "fork" in methods:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                raise RuntimeError("Start the shards before the event loop runs")
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+        for index in range(self.num_shards):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_run_shard,
+                args=(child_conn, self.order_book, self.bridges),
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+
+            self._processes.append(process)
+            self._connections.append(parent_conn)
+            self._pending.append(deque())
+            self._senders.append(ThreadPoolExecutor(1, thread_name_prefix=f"shard-{index}-send"))
+
+    def _attach(self):
+        self._loop = asyncio.get_running_loop()
+        for index, conn in enumerate(self._connections):
+            self._loop.add_reader(conn.fileno(), self._on_reply, index)
+
+    def _on_reply(self, index):
+        conn = self._connections[index]
+        pending = self._pending[index]
+        try:
+            while conn.poll():
+                reply = conn.recv()
+                future = pending.popleft()
+                if not future.done():
+                    future.set_result(reply)
+        except EOFError:
+            self._loop.remove_reader(conn.fileno())
+            while pending:
+                future = pending.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Shard {index} exited"))
+
+    async def _request(self, index, op, orders):
+        if self._loop is None:
+            self._attach()
+        future = self._loop.create_future()
+        self._pending[index].append(future)
+        # A large request blocks in send until the shard reads it, and the
+        # shard may be blocked sending a large reply, so write from the
+        # shard's sender thread and keep the loop free to drain replies.
+        # One thread per shard keeps requests in the order of the futures
+        await self._loop.run_in_executor(
+            self._senders[index], self._connections[index].send,
+            (op, [encode_order(order) for order in orders])
+        )
+
+        ok, payload, filled_makers = await future
+        if not ok:
+            raise RuntimeError(f"Shard {index} failed: {payload}")
+
+        # Mirror the shard's view of each order back onto the caller's objects
+        results = []
+        for order, (result, status, filled_amount) in zip(orders, payload):
+            order.status = OrderStatus(status)
+            order.filled_amount = filled_amount
+            results.append(result)
+            if op == "submit" and result:
+                self._makers[order.id] = order
+        for order_id, status, filled_amount in filled_makers:
+            maker = self._makers.get(order_id)
+            if maker is None:
+                continue
+            maker.status = OrderStatus(status)
+            maker.filled_amount = filled_amount
+            if maker.status == OrderStatus.FILLED:
+                del self._makers[order_id]
+        return results
+
+    async def _scatter(self, op, orders):
+        by_shard = {}
+        for position, order in enumerate(orders):
+            by_shard.setdefault(self.get_shard_index(order), []).append(position)
+
+        shard_results = await asyncio.gather(*(
+            self._request(index, op, [orders[position] for position in positions])
+            for index, positions in by_shard.items()
+        ))
+
+        results = [False] * len(orders)
+        for positions, shard_result in zip(by_shard.values(), shard_results):
+            for position, result in zip(positions, shard_result):
+                results[position] = result
+        return results
+
+    async def submit_maker_order(self, order):
+        """
+        Submit a maker order to the shard owning its pair.
+
+        Args:
+            order (Order): Order to submit
+
+        Returns:
+            bool: True if successful
+        """
+        results = await self._request(self.get_shard_index(order), "submit", [order])
+        return results[0]
+
+    async def submit_maker_orders(self, orders):
+        """
+        Submit maker orders, sending one message per shard.
+
+        Args:
+            orders (list): Orders to submit
+
+        Returns:
+            list: Per-order results, in input order
+        """
+        return await self._scatter("submit", orders)
+
+    async def process_taker_order(self, order):
+        """
+        Process a taker order on the shard owning its pair.
+
+        Args:
+            order (Order): Taker order to process
+
+        Returns:
+            bool: True if successful
+        """
+        results = await self._request(self.get_shard_index(order), "take", [order])
+        return results[0]
+
+    async def process_taker_orders(self, orders):
+        """
+        Process a batch of taker orders, matching every shard in parallel.
+
+        Args:
+            orders (list): Taker orders to process
+
+        Returns:
+            list: Per-order results, in input order
+        """
+        return await self._scatter("take", orders)
+
+    async def stop(self):
+        """
+        Shut down every shard process.
+        """
+        # The stop sentinel goes through each shard's sender thread, after
+        # any request it is still writing, so frames never interleave.
+        # Replies keep being drained until the shards exit, so a shard
+        # blocked writing one can still finish its requests
+        stops = [
+            asyncio.wrap_future(sender.submit(conn.send, None))
+            for conn, sender in zip(self._connections, self._senders)
+        ]
+        for index, result in enumerate(await asyncio.gather(*stops, return_exceptions=True)):
+            # A shard that already exited has closed its end of the pipe
+            if isinstance(result, Exception) and not isinstance(result, OSError):
+                logging.error(f"Failed to stop shard {index}: {result}")
+        for sender in self._senders:
+            await asyncio.to_thread(sender.shutdown)
+
+        for process in self._processes:
+            await asyncio.to_thread(process.join, 5)
+            if process.is_alive():
+                process.terminate()
+
+        for index, conn in enumerate(self._connections):
+            if self._loop is not None:
+                self._loop.remove_reader(conn.fileno())
+            for future in self._pending[index]:
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Shard {index} stopped"))
+            conn.close()
+
+        self._processes = []
+        self._connections = []
+        self._pending = []
+        self._senders = []
+        self._makers = {}
+        self._loop = None
@@ -0,0 +1,71 @@
+import json
+import math
+
+# Exporters turn a registry into (content type, body). Anything with the
+# same signature can be mounted on MetricsServer.
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+JSON_CONTENT_TYPE = "application/json"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+def render_prometheus(registry):
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Args:
+        registry (MetricsRegistry): Registry to export
+
+    Returns:
+        tuple: (content type, body bytes)
+    """
+    lines = []
+    for name, kind, help, series in registry.collect():
+        if help:
+            lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, metric in series:
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(metric.value)}")
+                continue
+
+            cumulative = 0
+            for bound, bucket_count in zip(metric.bounds, metric.counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels, (('le', _format_value(bound)),))} {cumulative}"
+                )
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {metric.count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(metric.sum)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+    return PROMETHEUS_CONTENT_TYPE, ("\n".join(lines) + "\n").encode()
+
+
+def render_json(registry):
+    """
+    Render the registry's in-process snapshot as JSON.
+
+    Args:
+        registry (MetricsRegistry): Registry to export
+
+    Returns:
+        tuple: (content type, body bytes)
+    """
+    return JSON_CONTENT_TYPE, json.dumps(registry.snapshot()).encode()
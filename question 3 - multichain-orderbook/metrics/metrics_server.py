@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from metrics.exporters import render_prometheus, render_json
+
+class MetricsServer:
+    """
+    Minimal HTTP endpoint serving exported metrics from the event loop.
+
+    Each path maps to an exporter, a callable taking the registry and
+    returning (content type, body bytes). By default /metrics serves the
+    Prometheus text format and /snapshot the JSON snapshot; when a
+    sampling profiler is attached, /profile serves its folded stacks.
+    """
+
+    def __init__(self, registry, host="127.0.0.1", port=9100, exporters=None, profiler=None):
+        """
+        Creates a new metrics server.
+
+        Args:
+            registry (MetricsRegistry): Registry to serve
+            host (str, optional): Address to listen on
+            port (int, optional): Port to listen on (0 picks a free port)
+            exporters (dict, optional): Maps request path to exporter
+            profiler (SamplingProfiler, optional): Profiler served at /profile
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.exporters = exporters if exporters is not None else {
+            "/metrics": render_prometheus,
+            "/snapshot": render_json,
+        }
+        self.profiler = profiler
+        self._server = None
+
+    def render(self, path):
+        """
+        Render the response body for a path.
+
+        Args:
+            path (str): Request path, without the query string
+
+        Returns:
+            tuple: (content type, body bytes) or None if the path is unknown
+        """
+        if path == "/profile" and self.profiler is not None:
+            return "text/plain; charset=utf-8", self.profiler.get_folded_stacks().encode()
+
+        exporter = self.exporters.get(path)
+        if exporter is None:
+            return None
+        return exporter(self.registry)
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            # Drain the headers; the body of a GET is ignored
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) >= 2 else "/"
+            rendered = self.render(path)
+            if rendered is None:
+                status, content_type, body = "404 Not Found", "text/plain", b"Not found\n"
+            else:
+                status = "200 OK"
+                content_type, body = rendered
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logging.error(f"Failed to serve metrics: {e}")
+        finally:
+            writer.close()
+
+    async def start(self):
+        """
+        Start listening on the running event loop.
+
+        Returns:
+            int: Port the server is listening on
+        """
+        if self._server is None:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        """
+        Stop listening and close the server.
+        """
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
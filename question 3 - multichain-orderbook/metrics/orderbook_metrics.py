@@ -0,0 +1,97 @@
+from metrics.registry import MetricsRegistry
+
+# Stages of a taker order, timed separately
+STAGES = ("match", "reserve", "gas_check", "settle", "taker_total")
+REJECTION_REASONS = ("amount_mode", "liquidity", "reservation", "gas", "settlement")
+CANCEL_REASONS = ("user", "expired")
+AMEND_KINDS = ("reduce", "replace")
+
+
+class OrderBookMetrics:
+    """
+    Instruments recorded by the order book service.
+
+    Every series is created up front and kept as an attribute, so the hot
+    path records a value with one attribute or dict lookup and never goes
+    through the registry. Book sizes are read from the books only when the
+    metrics are collected.
+    """
+
+    def __init__(self, registry=None):
+        """
+        Creates the order book instruments.
+
+        Args:
+            registry (MetricsRegistry, optional): Registry to record into;
+                a new one is created if omitted
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.stage_latency = {
+            stage: self.registry.histogram(
+                "orderbook_stage_latency_seconds",
+                "Time spent in each stage of taker order processing",
+                stage=stage
+            )
+            for stage in STAGES
+        }
+        self.matches = self.registry.counter(
+            "orderbook_matches_total", "Matches settled successfully"
+        )
+        self.maker_orders = self.registry.counter(
+            "orderbook_maker_orders_total", "Maker orders added to a book"
+        )
+        self.rejections = {
+            reason: self.registry.counter(
+                "orderbook_rejections_total", "Taker orders rejected, by reason", reason=reason
+            )
+            for reason in REJECTION_REASONS
+        }
+        self.cancels = {
+            reason: self.registry.counter(
+                "orderbook_cancels_total", "Maker orders removed before filling, by reason",
+                reason=reason
+            )
+            for reason in CANCEL_REASONS
+        }
+        self.amends = {
+            kind: self.registry.counter(
+                "orderbook_amends_total", "Resting orders amended, by kind", kind=kind
+            )
+            for kind in AMEND_KINDS
+        }
+
+    def track_order_book(self, order_book):
+        """
+        Report per-pair book sizes as gauges and count expired orders.
+
+        Args:
+            order_book (MultiChainOrderBook): Books to report on
+        """
+        expired = self.cancels["expired"]
+        order_book.add_expiry_listener(lambda orders: expired.inc(len(orders)))
+
+        def pair_labels(book):
+            key = book.pair_key
+            return (("pair", f"{key.base_asset_id}/{key.quote_asset_id}"),
+                    ("chains", f"{key.base_blockchain_id}/{key.quote_blockchain_id}"))
+
+        def collect_orders():
+            return {
+                pair_labels(book): book.get_order_count()
+                for book in order_book.order_books.values()
+            }
+
+        def collect_levels():
+            levels = {}
+            for book in order_book.order_books.values():
+                labels = pair_labels(book)
+                levels[labels + (("side", "bids"),)] = len(book.bids)
+                levels[labels + (("side", "asks"),)] = len(book.asks)
+            return levels
+
+        self.registry.register_collector(
+            "orderbook_resting_orders", "Resting maker orders per pair", collect_orders
+        )
+        self.registry.register_collector(
+            "orderbook_price_levels", "Price levels per pair and side", collect_levels
+        )
@@ -0,0 +1,297 @@
+from bisect import bisect_right
+
+# Latency buckets in seconds: 1-2.5-5 steps from 1 microsecond to 10 seconds
+LATENCY_BUCKETS = tuple(
+    float(f"{scale}e{exponent}")
+    for exponent in range(-6, 1)
+    for scale in (1, 2.5, 5)
+) + (10.0,)
+
+
+class Counter:
+    """
+    Monotonically increasing count.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        """
+        Creates a new counter at zero.
+        """
+        self.value = 0
+
+    def inc(self, amount=1):
+        """
+        Increase the count.
+
+        Args:
+            amount (float, optional): Amount to add
+        """
+        self.value += amount
+
+
+class Gauge:
+    """
+    Value that can go up and down.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        """
+        Creates a new gauge at zero.
+        """
+        self.value = 0
+
+    def set(self, value):
+        """
+        Set the current value.
+
+        Args:
+            value (float): New value
+        """
+        self.value = value
+
+
+class Histogram:
+    """
+    Distribution of observations over fixed buckets.
+
+    Observations are appended to a small buffer and bucketed in bulk once
+    it fills up (or when the histogram is read). Sorting the buffer lets
+    every bucket be counted with a single bisect, so the per-observation
+    cost on the hot path is little more than a list append.
+    """
+
+    __slots__ = ("bounds", "_counts", "_sum", "_count", "_pending")
+
+    # Observations buffered before they are bucketed
+    FLUSH_SIZE = 1024
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        """
+        Creates a new, empty histogram.
+
+        Args:
+            bounds (tuple, optional): Ascending bucket upper bounds; one
+                more overflow bucket is added above the last bound
+        """
+        self.bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0
+        self._count = 0
+        self._pending = []
+
+    def observe(self, value):
+        """
+        Record an observation.
+
+        Args:
+            value (float): Observed value
+        """
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= self.FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        pending = self._pending
+        if not pending:
+            return
+        pending.sort()
+        previous = 0
+        for index, bound in enumerate(self.bounds):
+            position = bisect_right(pending, bound, previous)
+            self._counts[index] += position - previous
+            previous = position
+        self._counts[-1] += len(pending) - previous
+        self._sum += sum(pending)
+        self._count += len(pending)
+        pending.clear()
+
+    @property
+    def counts(self):
+        """
+        Observations per bucket, the last being the overflow bucket.
+
+        Returns:
+            list: Count per bucket
+        """
+        self._flush()
+        return self._counts
+
+    @property
+    def sum(self):
+        """
+        Sum of all observations.
+
+        Returns:
+            float: Sum
+        """
+        self._flush()
+        return self._sum
+
+    @property
+    def count(self):
+        """
+        Number of observations.
+
+        Returns:
+            int: Count
+        """
+        self._flush()
+        return self._count
+
+    def quantile(self, fraction):
+        """
+        Estimate a quantile as the upper bound of the bucket holding it.
+
+        Args:
+            fraction (float): Quantile as a fraction (0.99 for p99)
+
+        Returns:
+            float: Estimated value or None if nothing was observed
+        """
+        counts = self.counts
+        if not self._count:
+            return None
+        rank = fraction * self._count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else float("inf")
+        return float("inf")
+
+
+class MetricsRegistry:
+    """
+    Named, labelled metrics plus collectors sampled only when read.
+
+    Metrics are looked up once and the returned object is kept by the
+    caller, so recording never touches the registry. Values that are
+    cheap to compute on demand (such as book sizes) are registered as
+    collectors and cost nothing between scrapes.
+    """
+
+    def __init__(self):
+        """
+        Creates a new, empty registry.
+        """
+        self._families = {}  # Maps name to (kind, help, {labels: metric})
+        self._collectors = []  # (name, help, callable returning {labels: value})
+
+    def _get(self, kind, factory, name, help, labels):
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = (kind, help, {})
+        elif family[0] != kind:
+            raise ValueError(f"Metric {name} is already registered as a {family[0]}")
+
+        key = tuple(sorted(labels.items()))
+        metric = family[2].get(key)
+        if metric is None:
+            metric = family[2][key] = factory()
+        return metric
+
+    def counter(self, name, help="", **labels):
+        """
+        Get or create a counter.
+
+        Args:
+            name (str): Metric name
+            help (str, optional): Description shown by exporters
+            **labels: Label values identifying this series
+
+        Returns:
+            Counter: The counter
+        """
+        return self._get("counter", Counter, name, help, labels)
+
+    def gauge(self, name, help="", **labels):
+        """
+        Get or create a gauge.
+
+        Args:
+            name (str): Metric name
+            help (str, optional): Description shown by exporters
+            **labels: Label values identifying this series
+
+        Returns:
+            Gauge: The gauge
+        """
+        return self._get("gauge", Gauge, name, help, labels)
+
+    def histogram(self, name, help="", bounds=LATENCY_BUCKETS, **labels):
+        """
+        Get or create a histogram.
+
+        Args:
+            name (str): Metric name
+            help (str, optional): Description shown by exporters
+            bounds (tuple, optional): Bucket upper bounds
+            **labels: Label values identifying this series
+
+        Returns:
+            Histogram: The histogram
+        """
+        return self._get("histogram", lambda: Histogram(bounds), name, help, labels)
+
+    def register_collector(self, name, help, collect):
+        """
+        Register a gauge family computed when metrics are read.
+
+        Args:
+            name (str): Metric name
+            help (str): Description shown by exporters
+            collect (callable): Returns a dict mapping label tuples of
+                (label, value) pairs to the current value
+        """
+        self._collectors.append((name, help, collect))
+
+    def collect(self):
+        """
+        Read every metric family.
+
+        Returns:
+            list: (name, kind, help, [(labels, metric)]) for each family,
+                where collector families report plain values as gauges
+        """
+        families = [
+            (name, kind, help, list(series.items()))
+            for name, (kind, help, series) in self._families.items()
+        ]
+        for name, help, collect in self._collectors:
+            series = []
+            for labels, value in collect().items():
+                gauge = Gauge()
+                gauge.set(value)
+                series.append((labels, gauge))
+            families.append((name, "gauge", help, series))
+        return families
+
+    def snapshot(self):
+        """
+        Get an in-process view of every metric as plain values.
+
+        Returns:
+            dict: Maps metric name to {label string: value}; histograms
+                report count, sum and p50/p99/p999 estimates
+        """
+        snapshot = {}
+        for name, kind, _, series in self.collect():
+            values = snapshot[name] = {}
+            for labels, metric in series:
+                label = ",".join(f"{key}={value}" for key, value in labels)
+                if kind == "histogram":
+                    values[label] = {
+                        "count": metric.count,
+                        "sum": metric.sum,
+                        "p50": metric.quantile(0.50),
+                        "p99": metric.quantile(0.99),
+                        "p999": metric.quantile(0.999),
+                    }
+                else:
+                    values[label] = metric.value
+        return snapshot
@@ -0,0 +1,116 @@
+import sys
+import threading
+from collections import Counter
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples one thread's stack at a fixed interval.
+
+    Sampling runs on its own thread and only reads the target thread's
+    current frame, so the profiled code is never traced and its overhead
+    is bounded by the sampling rate rather than by how much code runs.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None, max_depth=64):
+        """
+        Creates a new sampling profiler.
+
+        Args:
+            interval (float, optional): Seconds between samples
+            thread_id (int, optional): Thread to sample; defaults to the
+                thread that calls start
+            max_depth (int, optional): Deepest frames kept per sample
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.max_depth = max_depth
+        self.samples = 0
+        self._stacks = Counter()  # Maps stack tuple (outermost first) to samples
+        self._lock = threading.Lock()  # Guards _stacks and samples against the sampler thread
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.reverse()
+        with self._lock:
+            self._stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        """
+        Start sampling in a background thread.
+        """
+        if self._thread is not None:
+            return
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop sampling; collected samples are kept.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def reset(self):
+        """
+        Drop every collected sample.
+        """
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+
+    def _snapshot(self):
+        # Copy under the lock so readers never iterate while the sampler writes
+        with self._lock:
+            return self._stacks.copy(), self.samples
+
+    def get_folded_stacks(self):
+        """
+        Get the samples in folded-stack format, as read by flame graph tools.
+
+        Returns:
+            str: One "frame;frame;frame count" line per distinct stack
+        """
+        stacks, _ = self._snapshot()
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in stacks.most_common()
+        )
+
+    def get_top_functions(self, limit=20):
+        """
+        Get the functions seen most often anywhere on the sampled stacks.
+
+        Args:
+            limit (int, optional): Maximum functions returned
+
+        Returns:
+            list: (function, fraction of samples) pairs, most frequent first
+        """
+        stacks, samples = self._snapshot()
+        if not samples:
+            return []
+        inclusive = Counter()
+        for stack, count in stacks.items():
+            for frame in set(stack):
+                inclusive[frame] += count
+        return [(frame, count / samples) for frame, count in inclusive.most_common(limit)]
@@ -17,8 +17,20 @@ class Blockchain:
         self.name = name
         self.average_block_time = average_block_time
         self.gas_estimator = gas_estimator
+        self.gas_oracle = None  # Optional GasOracle caching gas prices
         self.provider = None
         
+    def get_gas_price(self):
+        """
+        Get the current gas price, through the gas oracle when one is set.
+        
+        Returns:
+            float: Current gas price
+        """
+        if self.gas_oracle is not None:
+            return self.gas_oracle.get_gas_price(self)
+        return self.gas_estimator()
+        
     def estimate_gas_fee(self, operation_type):
         """
         Estimates gas fee for different operation types.
@@ -30,7 +42,7 @@ class Blockchain:
             float: Estimated gas fee in native currency units
         """
         # Get current gas price
-        current_gas_price = self.gas_estimator()
+        current_gas_price = self.get_gas_price()
         
         # Get gas limit for this operation type
         gas_limit = self.get_operation_gas_limit(operation_type)
@@ -0,0 +1,51 @@
+from decimal import Decimal, ROUND_DOWN
+
+def to_units(value, decimals):
+    """
+    Convert a decimal amount into integer base units of an asset.
+
+    The conversion goes through the value's decimal string, so 0.1 becomes
+    exactly 10**(decimals - 1) units. Anything finer than one unit is
+    truncated, never rounded up.
+
+    Args:
+        value (float): Amount in whole asset units (e.g. 1.5 ETH)
+        decimals (int): Asset decimals (Asset.decimals)
+
+    Returns:
+        int: Amount in base units
+    """
+    return int(Decimal(str(value)).scaleb(decimals).to_integral_value(ROUND_DOWN))
+
+
+def from_units(units, decimals):
+    """
+    Convert integer base units of an asset back into a decimal amount.
+
+    Args:
+        units (int): Amount in base units
+        decimals (int): Asset decimals (Asset.decimals)
+
+    Returns:
+        float: Amount in whole asset units
+    """
+    return float(Decimal(units).scaleb(-decimals))
+
+
+def quote_units(base_units, price_units, base_decimals):
+    """
+    Get the quote amount for a base amount at a fixed-point price.
+
+    Prices are quote base units per whole base unit, so the product is
+    scaled back down by the base asset's decimals. The result is truncated,
+    which never pays out more quote than the exact value.
+
+    Args:
+        base_units (int): Base amount in base units
+        price_units (int): Price in quote base units per whole base unit
+        base_decimals (int): Decimals of the base asset
+
+    Returns:
+        int: Quote amount in base units
+    """
+    return base_units * price_units // 10 ** base_decimals
@@ -1,5 +1,6 @@
 from enum import Enum
 from datetime import datetime
+from models.fixed_point import quote_units, to_units
 
 class OrderType(Enum):
     """Represents order type (BUY or SELL)"""
@@ -18,10 +19,21 @@ class OrderStatus(Enum):
 class Order:
     """
     Represents a single order in the system.
+    
+    Uses __slots__ so resting orders carry no per-instance __dict__; the
+    asset, blockchain and status fields hold references to shared objects.
     """
     
+    __slots__ = (
+        "id", "maker", "order_type", "base_asset", "quote_asset",
+        "base_blockchain", "quote_blockchain", "amount", "price",
+        "timestamp", "status", "filled_amount", "expiration_time", "pair_key",
+        "fixed_point"
+    )
+    
     def __init__(self, id, maker, order_type, base_asset, quote_asset, 
-                 base_blockchain, quote_blockchain, amount, price, expiration_time=0):
+                 base_blockchain, quote_blockchain, amount, price, expiration_time=0,
+                 fixed_point=False):
         """
         Creates a new order for cross-chain trading.
         
@@ -36,11 +48,17 @@ class Order:
             amount (float): Amount of baseAsset to trade
             price (float): Price in quoteAsset per unit of baseAsset
             expiration_time (int, optional): When order expires (0 for no expiration)
+            fixed_point (bool, optional): If True, amount is an int in base
+                units of baseAsset and price an int in base units of
+                quoteAsset per whole baseAsset (see models.fixed_point)
         """
         # Validate that we're not trying to trade the same asset on the same blockchain
         if (base_asset.id == quote_asset.id and 
             base_blockchain.id == quote_blockchain.id):
             raise ValueError("Cannot trade the same asset on the same blockchain")
+        
+        if fixed_point and not (isinstance(amount, int) and isinstance(price, int)):
+            raise ValueError("Fixed-point orders need integer amount and price")
             
         self.id = id
         self.maker = maker
@@ -55,6 +73,8 @@ class Order:
         self.status = OrderStatus.PENDING
         self.filled_amount = 0
         self.expiration_time = expiration_time
+        self.pair_key = None  # Interned PairKey, cached once the order reaches a book
+        self.fixed_point = fixed_point
         
     def get_remaining_amount(self):
         """
@@ -72,7 +92,7 @@ class Order:
         Returns:
             float: Total value
         """
-        return self.amount * self.price
+        return self.get_quote_amount(self.amount)
         
     def get_remaining_value(self):
         """
@@ -81,7 +101,53 @@ class Order:
         Returns:
             float: Remaining value
         """
-        return self.get_remaining_amount() * self.price
+        return self.get_quote_amount(self.get_remaining_amount())
+    
+    def get_quote_amount(self, base_amount):
+        """
+        Get the quote amount exchanged for a base amount at this order's price.
+        
+        Args:
+            base_amount (float): Amount of baseAsset
+            
+        Returns:
+            float: Amount of quoteAsset (exact int base units in fixed-point mode)
+        """
+        if self.fixed_point:
+            return quote_units(base_amount, self.price, self.base_asset.decimals)
+        return base_amount * self.price
+    
+    def to_quote_amount(self, value):
+        """
+        Express a decimal quote-denominated value (e.g. a gas cost) in the
+        same units as this order's quote amounts.
+        
+        Args:
+            value (float): Value in whole quoteAsset units
+            
+        Returns:
+            float: Value in this order's quote units
+        """
+        if self.fixed_point:
+            return to_units(value, self.quote_asset.decimals)
+        return value
+    
+    def get_unit_price(self, quote_amount, base_amount):
+        """
+        Get the price, in this order's price units, of paying a quote amount
+        for a base amount. Inverse of get_quote_amount.
+        
+        Args:
+            quote_amount (float): Amount of quoteAsset, in this order's units
+            base_amount (float): Amount of baseAsset, in this order's units
+            
+        Returns:
+            float: Price per whole baseAsset (an exact int in fixed-point
+                mode, rounded up so a cost is never understated)
+        """
+        if self.fixed_point:
+            return -(-quote_amount * 10 ** self.base_asset.decimals // base_amount)
+        return quote_amount / base_amount
         
     def is_expired(self):
         """
@@ -1,10 +1,37 @@
 from datetime import datetime
 
+class MakerFill:
+    """
+    A single maker order fill within a match.
+    """
+    
+    __slots__ = ("order", "fill_amount")
+    
+    def __init__(self, order, fill_amount):
+        """
+        Creates a new maker fill.
+        
+        Args:
+            order (Order): The maker order being filled
+            fill_amount (float): Amount of the maker order to fill
+        """
+        self.order = order
+        self.fill_amount = fill_amount
+        
+    def __getitem__(self, key):
+        # Support item["order"] / item["fill_amount"] access for existing callers
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
 class OrderMatch:
     """
     Represents a match between a taker order and one or more maker orders.
     """
     
+    __slots__ = ("id", "taker_order", "maker_orders", "status", "timestamp")
+    
     def __init__(self, id, taker_order):
         """
         Creates a new order match instance.
@@ -27,10 +54,7 @@ class OrderMatch:
             maker_order (Order): The maker order to include
             fill_amount (float): Amount of the maker order to fill
         """
-        self.maker_orders.append({
-            "order": maker_order,
-            "fill_amount": fill_amount
-        })
+        self.maker_orders.append(MakerFill(maker_order, fill_amount))
         
     def get_total_fill_amount(self):
         """
@@ -39,12 +63,16 @@ class OrderMatch:
         Returns:
             float: Total fill amount
         """
-        return sum(item["fill_amount"] for item in self.maker_orders)
+        return sum(item.fill_amount for item in self.maker_orders)
         
-    def estimate_total_gas_cost(self):
+    def estimate_total_gas_cost(self, gas_fees=None):
         """
         Calculate total gas costs across all blockchains involved.
         
+        Args:
+            gas_fees (dict, optional): Blockchain ID to FILL_ORDER fee memo,
+                shared across matches to estimate each chain only once
+        
         Returns:
             float: Total gas cost
         """
@@ -54,12 +82,20 @@ class OrderMatch:
         blockchains.add(self.taker_order.quote_blockchain)
         
         for item in self.maker_orders:
-            blockchains.add(item["order"].base_blockchain)
-            blockchains.add(item["order"].quote_blockchain)
+            blockchains.add(item.order.base_blockchain)
+            blockchains.add(item.order.quote_blockchain)
         
         # Calculate total gas
         total_gas = 0
         for blockchain in blockchains:
-            total_gas += blockchain.estimate_gas_fee("FILL_ORDER")
+            if gas_fees is None:
+                total_gas += blockchain.estimate_gas_fee("FILL_ORDER")
+                continue
+                
+            gas_fee = gas_fees.get(blockchain.id)
+            if gas_fee is None:
+                gas_fee = blockchain.estimate_gas_fee("FILL_ORDER")
+                gas_fees[blockchain.id] = gas_fee
+            total_gas += gas_fee
             
         return total_gas
\ No newline at end of file
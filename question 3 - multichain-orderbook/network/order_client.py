@@ -0,0 +1,201 @@
+import asyncio
+from models.order import OrderStatus
+from orderbook.pair_key import PairKey
+from network.protocol import (
+    OP_SUBMIT, OP_CANCEL, OP_TAKE, OP_DEPTH, OP_REDUCE, OP_REPLACE, REPLY_FLAG,
+    STATUS_TRUE, STATUS_ERROR,
+    encode_frame, decode_frames, decode_reply, encode_order, encode_cancel,
+    encode_reduce, encode_replace, encode_depth_request, decode_depth, decode_take_result
+)
+from persistence.order_codec import unpack_str
+
+class OrderClientProtocol(asyncio.Protocol):
+    """
+    Client side of an order server connection.
+    """
+
+    def __init__(self, client):
+        """
+        Creates the protocol for a client connection.
+
+        Args:
+            client (OrderClient): Client awaiting the replies
+        """
+        self.client = client
+        self._buffer = bytearray()
+
+    def data_received(self, data):
+        self._buffer += data
+        for opcode, request_id, payload in decode_frames(self._buffer):
+            self.client._on_reply(opcode, request_id, payload)
+
+    def connection_lost(self, exc):
+        self.client._on_connection_lost(exc)
+
+
+class OrderClient:
+    """
+    Pipelining client for the order server.
+
+    Requests are written as soon as they are made and matched to replies
+    by request ID, so many calls can be awaited concurrently over one
+    connection (for example with asyncio.gather).
+    """
+
+    def __init__(self, host="127.0.0.1", port=9000):
+        """
+        Creates a new, unconnected client.
+
+        Args:
+            host (str, optional): Server address
+            port (int, optional): Server port
+        """
+        self.host = host
+        self.port = port
+        self._transport = None
+        self._pending = {}  # Maps request ID to the future awaiting its reply
+        self._next_request_id = 0
+
+    async def connect(self):
+        """
+        Open the connection to the server.
+        """
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_connection(
+            lambda: OrderClientProtocol(self), self.host, self.port
+        )
+
+    def _on_reply(self, opcode, request_id, payload):
+        future = self._pending.pop(request_id, None)
+        if future is not None and not future.done():
+            future.set_result((opcode & ~REPLY_FLAG, payload))
+
+    def _on_connection_lost(self, exc):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Order server connection lost"))
+
+    async def _request(self, opcode, payload):
+        if self._transport is None or self._transport.is_closing():
+            raise ConnectionError("Order client is not connected")
+
+        self._next_request_id = (self._next_request_id + 1) & 0xFFFFFFFF
+        request_id = self._next_request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._transport.write(encode_frame(opcode, request_id, payload))
+
+        _, reply = await future
+        status, offset = decode_reply(reply)
+        if status == STATUS_ERROR:
+            message, _ = unpack_str(reply, offset)
+            raise RuntimeError(f"Order server error: {message}")
+        return status == STATUS_TRUE, reply, offset
+
+    async def submit_maker_order(self, order):
+        """
+        Submit a maker order.
+
+        The order's status is updated the way the server's manager set it.
+
+        Args:
+            order (Order): Order to submit
+
+        Returns:
+            bool: True if the order is resting in the book
+        """
+        ok, _, _ = await self._request(OP_SUBMIT, encode_order(order))
+        order.status = OrderStatus.ACTIVE if ok else OrderStatus.FAILED
+        return ok
+
+    async def process_taker_order(self, order):
+        """
+        Match and settle a taker order.
+
+        The server's view of the order's status and filled amount is
+        copied back onto the order.
+
+        Args:
+            order (Order): Taker order to process
+
+        Returns:
+            bool: True if successful
+        """
+        ok, reply, offset = await self._request(OP_TAKE, encode_order(order))
+        order.status, order.filled_amount = decode_take_result(reply, offset)
+        return ok
+
+    async def cancel_order(self, order):
+        """
+        Cancel a resting maker order, marking it cancelled on success.
+
+        Args:
+            order (Order): Order to cancel
+
+        Returns:
+            bool: True if the order was found and cancelled
+        """
+        ok, _, _ = await self._request(OP_CANCEL, encode_cancel(PairKey.for_order(order), order.id))
+        if ok:
+            order.status = OrderStatus.CANCELLED
+        return ok
+
+    async def reduce_order(self, order, new_amount):
+        """
+        Reduce a resting maker order in place, keeping its queue priority.
+
+        Args:
+            order (Order): Order to reduce; its amount is updated on success
+            new_amount (float): New total amount, including filled amount
+
+        Returns:
+            bool: True if the order was found and reduced
+        """
+        ok, _, _ = await self._request(OP_REDUCE, encode_reduce(order.id, new_amount))
+        if ok:
+            order.amount = new_amount
+        return ok
+
+    async def replace_order(self, order, price=None, amount=None):
+        """
+        Replace a resting maker order's price and/or size; it loses its
+        queue priority.
+
+        Args:
+            order (Order): Order to replace; updated on success
+            price (float, optional): New price (unchanged if omitted)
+            amount (float, optional): New total amount (unchanged if omitted)
+
+        Returns:
+            bool: True if the order was found and replaced
+        """
+        price = order.price if price is None else price
+        amount = order.amount if amount is None else amount
+        ok, _, _ = await self._request(OP_REPLACE, encode_replace(order.id, price, amount))
+        if ok:
+            order.price, order.amount = price, amount
+        return ok
+
+    async def get_depth(self, pair_key, levels=None):
+        """
+        Read aggregated depth for a trading pair.
+
+        Args:
+            pair_key (PairKey): Pair to read
+            levels (int, optional): Maximum levels per side
+
+        Returns:
+            dict: {"bids": [(price, volume)], "asks": [...]}, or None if
+                the pair has no book
+        """
+        ok, reply, offset = await self._request(OP_DEPTH, encode_depth_request(pair_key, levels or 0))
+        return decode_depth(reply, offset) if ok else None
+
+    async def close(self):
+        """
+        Close the connection.
+        """
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
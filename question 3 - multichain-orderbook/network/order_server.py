@@ -0,0 +1,273 @@
+import asyncio
+import logging
+from collections import deque
+from execution.settlement_pipeline import SettlementPipeline
+from network.protocol import (
+    OP_SUBMIT, OP_CANCEL, OP_TAKE, OP_DEPTH, OP_REDUCE, OP_REPLACE, REPLY_FLAG,
+    STATUS_TRUE, STATUS_FALSE,
+    encode_frame, decode_frames, decode_order, decode_cancel, decode_reduce, decode_replace,
+    decode_depth_request, encode_depth, encode_reply, encode_error, encode_take_result
+)
+
+class OrderServerProtocol(asyncio.Protocol):
+    """
+    One client connection to the order server.
+
+    Frames are parsed as bytes arrive and handed to the server's matcher
+    queue. The client may pipeline any number of requests; replies are
+    written back in request order, so a take's reply holds back the
+    replies after it until its match has settled.
+    """
+
+    def __init__(self, server):
+        """
+        Creates the protocol for a new connection.
+
+        Args:
+            server (OrderServer): Server owning the matcher queue
+        """
+        self.server = server
+        self.transport = None
+        self.paused = False
+        self._buffer = bytearray()
+        self._replies = deque()  # Framed replies, or futures of them, in request order
+        self._waiting = None  # Reply future at the head of the queue
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server._connections.add(self)
+
+    def data_received(self, data):
+        self._buffer += data
+        try:
+            frames = decode_frames(self._buffer)
+        except ValueError as e:
+            logging.error(f"Closing connection after a bad frame: {e}")
+            self.transport.close()
+            return
+        if frames:
+            self.server.enqueue(self, frames)
+
+    def connection_lost(self, exc):
+        self.server._connections.discard(self)
+
+    def send(self, data):
+        """
+        Write reply bytes unless the connection has gone away.
+
+        Args:
+            data (bytes): Framed replies
+        """
+        if not self.transport.is_closing():
+            self.transport.write(data)
+
+    def queue_replies(self, replies):
+        """
+        Queue replies behind any still waiting for settlement, and write
+        every reply that is ready.
+
+        Args:
+            replies (list): Framed replies (bytes) or futures resolving to them
+        """
+        self._replies.extend(replies)
+        if self._waiting is None:
+            self._flush()
+
+    def _flush(self, _=None):
+        self._waiting = None
+        replies = self._replies
+        chunks = []
+        while replies:
+            reply = replies[0]
+            if not isinstance(reply, bytes):
+                if not reply.done():
+                    self._waiting = reply
+                    reply.add_done_callback(self._flush)
+                    break
+                reply = reply.result()
+            chunks.append(reply)
+            replies.popleft()
+        if chunks:
+            self.send(b"".join(chunks))
+
+
+class OrderServer:
+    """
+    TCP front end feeding network requests into a CrossChainManager.
+
+    Every connection's requests go into one queue drained by a single
+    matcher task, so the books are only ever touched from one place and
+    requests are applied in arrival order. The matcher takes up to
+    max_batch requests at a time and each connection's ready replies for
+    the batch leave in a single write. Takers are matched and their
+    liquidity reserved in order, then handed to a SettlementPipeline, so
+    the matcher never waits on a bridge. When the queue grows past
+    max_pending, reading pauses on the connections feeding it until the
+    matcher has caught up.
+    """
+
+    def __init__(self, manager, host="127.0.0.1", port=9000, max_batch=512, max_pending=20000,
+                 settlement_workers=4, max_settling=1000):
+        """
+        Creates a new order server.
+
+        Args:
+            manager (CrossChainManager): Manager that executes requests
+            host (str, optional): Address to listen on
+            port (int, optional): Port to listen on (0 picks a free port)
+            max_batch (int, optional): Maximum requests handled per batch
+            max_pending (int, optional): Queued requests at which reading
+                is paused
+            settlement_workers (int, optional): Matches settled concurrently
+            max_settling (int, optional): Matches allowed to wait for a
+                settlement worker before the matcher waits
+        """
+        self.manager = manager
+        self.pipeline = SettlementPipeline(manager, settlement_workers, max_settling)
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._pending = deque()  # (protocol, opcode, request_id, payload)
+        self._paused = []
+        self._connections = set()
+        self._wakeup = None
+        self._server = None
+        self._matcher = None
+
+    def enqueue(self, protocol, frames):
+        """
+        Queue requests parsed from a connection.
+
+        Args:
+            protocol (OrderServerProtocol): Connection the requests came from
+            frames (list): (opcode, request_id, payload) tuples
+        """
+        self._pending.extend((protocol, opcode, request_id, payload)
+                             for opcode, request_id, payload in frames)
+        self._wakeup.set()
+
+        if len(self._pending) >= self.max_pending and not protocol.paused:
+            protocol.transport.pause_reading()
+            protocol.paused = True
+            self._paused.append(protocol)
+
+    async def _run_matcher(self):
+        pending = self._pending
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while pending:
+                batch = [pending.popleft() for _ in range(min(self.max_batch, len(pending)))]
+                await self._process_batch(batch)
+
+                if self._paused and len(pending) < self.max_pending // 2:
+                    for protocol in self._paused:
+                        protocol.paused = False
+                        if not protocol.transport.is_closing():
+                            protocol.transport.resume_reading()
+                    self._paused = []
+
+    async def _process_batch(self, batch):
+        replies = {}
+        for protocol, opcode, request_id, payload in batch:
+            try:
+                if opcode == OP_TAKE:
+                    reply = await self._take(request_id, payload)
+                else:
+                    reply = encode_frame(opcode | REPLY_FLAG, request_id, await self._handle(opcode, payload))
+            except Exception as e:
+                reply = encode_frame(opcode | REPLY_FLAG, request_id, encode_error(str(e)))
+            replies.setdefault(protocol, []).append(reply)
+
+        for protocol, chunks in replies.items():
+            protocol.queue_replies(chunks)
+
+    async def _take(self, request_id, payload):
+        # Matching and reserving happen now; the reply waits for settlement
+        order = decode_order(payload, self.manager.order_book)
+        settled = await self.pipeline.submit_taker_order(order)
+
+        def frame(settled):
+            status = STATUS_TRUE if settled.result() else STATUS_FALSE
+            return encode_frame(OP_TAKE | REPLY_FLAG, request_id,
+                                encode_reply(status, encode_take_result(order)))
+
+        if settled.done():
+            return frame(settled)
+        reply = settled.get_loop().create_future()
+        settled.add_done_callback(lambda settled: reply.set_result(frame(settled)))
+        return reply
+
+    async def _handle(self, opcode, payload):
+        order_book = self.manager.order_book
+
+        if opcode == OP_SUBMIT:
+            order = decode_order(payload, order_book)
+            return encode_reply(STATUS_TRUE if await self.manager.submit_maker_order(order) else STATUS_FALSE)
+
+        if opcode == OP_CANCEL:
+            pair_key, order_id = decode_cancel(payload)
+            pair_book = order_book.get_order_book_for_id(order_id)
+            cancelled = (pair_book is not None and pair_book.pair_key == pair_key
+                         and self.manager.cancel_order(order_id))
+            return encode_reply(STATUS_TRUE if cancelled else STATUS_FALSE)
+
+        if opcode == OP_REDUCE:
+            order_id, new_amount = decode_reduce(payload)
+            return encode_reply(STATUS_TRUE if self.manager.reduce_order(order_id, new_amount) else STATUS_FALSE)
+
+        if opcode == OP_REPLACE:
+            order_id, price, amount = decode_replace(payload)
+            replaced = self.manager.replace_order(order_id, price, amount)
+            return encode_reply(STATUS_TRUE if replaced else STATUS_FALSE)
+
+        if opcode == OP_DEPTH:
+            pair_key, levels = decode_depth_request(payload)
+            pair_book = order_book.order_books.get(pair_key)
+            if pair_book is None:
+                return encode_reply(STATUS_FALSE)
+            return encode_reply(STATUS_TRUE, encode_depth(pair_book.get_depth(levels)))
+
+        return encode_error(f"Unknown opcode {opcode}")
+
+    async def start(self):
+        """
+        Start listening and matching on the running event loop.
+
+        Returns:
+            int: Port the server is listening on
+        """
+        if self._server is not None:
+            return self.port
+        self._wakeup = asyncio.Event()
+        self.pipeline.start()
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: OrderServerProtocol(self), self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._matcher = asyncio.create_task(self._run_matcher())
+        logging.info(f"Order server listening on {self.host}:{self.port}")
+        return self.port
+
+    async def stop(self):
+        """
+        Stop accepting connections, close open ones, stop the matcher and
+        settle the matches already handed to the pipeline.
+        """
+        if self._server is None:
+            return
+        self._server.close()
+        for protocol in list(self._connections):
+            protocol.transport.close()
+        await self._server.wait_closed()
+
+        self._matcher.cancel()
+        try:
+            await self._matcher
+        except asyncio.CancelledError:
+            pass
+        await self.pipeline.stop()
+        self._server = None
+        self._matcher = None
@@ -0,0 +1,411 @@
+"""
+Length-prefixed binary protocol between order clients and the order server.
+
+Every message is a frame: a 4-byte little-endian body length, then a body
+starting with an opcode byte and a 4-byte request ID. Replies carry the
+request's opcode with REPLY_FLAG set and the same request ID, so a client
+can keep many requests in flight on one connection.
+"""
+import struct
+from models.order import Order, OrderType, OrderStatus
+from orderbook.pair_key import PairKey
+from persistence.order_codec import (
+    pack_str, unpack_str, pack_int, unpack_int, pack_float, unpack_float,
+    encode_pair_key, decode_pair_key
+)
+
+# Request opcodes
+OP_SUBMIT = 1
+OP_CANCEL = 2
+OP_TAKE = 3
+OP_DEPTH = 4
+OP_REDUCE = 5
+OP_REPLACE = 6
+REPLY_FLAG = 0x80
+
+# Reply status codes
+STATUS_FALSE = 0
+STATUS_TRUE = 1
+STATUS_ERROR = 2
+
+_FRAME_LENGTH = struct.Struct("<I")
+_HEADER = struct.Struct("<BI")  # opcode, request ID
+_ORDER_FIELDS = struct.Struct("<BBd")  # order type, fixed-point flag, expiration time
+_REPLY_STATUS = struct.Struct("<B")
+_TAKE_RESULT = struct.Struct("<B")  # order status
+_DEPTH_REQUEST = struct.Struct("<H")
+_DEPTH_COUNT = struct.Struct("<H")
+
+ORDER_TYPES = list(OrderType)
+ORDER_STATUSES = list(OrderStatus)
+_ORDER_TYPE_CODES = {member: code for code, member in enumerate(ORDER_TYPES)}
+_ORDER_STATUS_CODES = {member: code for code, member in enumerate(ORDER_STATUSES)}
+
+# Refuse frames larger than this rather than buffering them
+MAX_FRAME_SIZE = 1 << 20
+
+
+def pack_number(value):
+    """
+    Encode a float or an exact integer, tagged with its type.
+
+    Args:
+        value (float): Value to encode
+
+    Returns:
+        bytes: Encoded value
+    """
+    if isinstance(value, int):
+        return b"\x01" + pack_int(value)
+    return b"\x00" + pack_float(value)
+
+
+def unpack_number(buffer, offset):
+    """
+    Decode a value written by pack_number.
+
+    Args:
+        buffer (bytes): Source buffer
+        offset (int): Position of the value
+
+    Returns:
+        tuple: (value, offset after the value)
+    """
+    if buffer[offset]:
+        return unpack_int(buffer, offset + 1)
+    return unpack_float(buffer, offset + 1)
+
+
+def encode_frame(opcode, request_id, payload=b""):
+    """
+    Build one frame.
+
+    Args:
+        opcode (int): Request opcode, with REPLY_FLAG set for replies
+        request_id (int): ID matching a reply to its request
+        payload (bytes, optional): Message body
+
+    Returns:
+        bytes: The framed message
+    """
+    return _FRAME_LENGTH.pack(_HEADER.size + len(payload)) + _HEADER.pack(opcode, request_id) + payload
+
+
+def decode_frames(buffer):
+    """
+    Split complete frames off the front of a receive buffer.
+
+    Args:
+        buffer (bytearray): Bytes received so far; consumed frames are
+            removed from it
+
+    Returns:
+        list: (opcode, request_id, payload) for every complete frame
+
+    Raises:
+        ValueError: If a frame is malformed or exceeds MAX_FRAME_SIZE
+    """
+    frames = []
+    offset = 0
+    size = len(buffer)
+    while offset + _FRAME_LENGTH.size <= size:
+        (length,) = _FRAME_LENGTH.unpack_from(buffer, offset)
+        if length < _HEADER.size or length > MAX_FRAME_SIZE:
+            raise ValueError(f"Invalid frame length {length}")
+        start = offset + _FRAME_LENGTH.size
+        end = start + length
+        if end > size:
+            break
+        opcode, request_id = _HEADER.unpack_from(buffer, start)
+        frames.append((opcode, request_id, bytes(buffer[start + _HEADER.size:end])))
+        offset = end
+    if offset:
+        del buffer[:offset]
+    return frames
+
+
+def encode_order(order):
+    """
+    Encode a new order for a submit or take request.
+
+    Assets and blockchains travel as IDs through the order's pair key.
+
+    Args:
+        order (Order): Order to encode
+
+    Returns:
+        bytes: Encoded order
+    """
+    return b"".join((
+        encode_pair_key(PairKey.for_order(order)),
+        pack_str(order.id),
+        pack_str(order.maker),
+        _ORDER_FIELDS.pack(
+            _ORDER_TYPE_CODES[order.order_type], order.fixed_point, order.expiration_time
+        ),
+        pack_number(order.amount),
+        pack_number(order.price),
+    ))
+
+
+def decode_order(payload, order_book):
+    """
+    Rebuild an order encoded by encode_order.
+
+    Args:
+        payload (bytes): Encoded order
+        order_book (MultiChainOrderBook): Registry of assets and blockchains
+
+    Returns:
+        Order: The new order, timestamped on arrival
+
+    Raises:
+        KeyError: If an asset or blockchain is not supported
+    """
+    pair_key, offset = decode_pair_key(payload, 0)
+    order_id, offset = unpack_str(payload, offset)
+    maker, offset = unpack_str(payload, offset)
+    order_type, fixed_point, expiration_time = _ORDER_FIELDS.unpack_from(payload, offset)
+    offset += _ORDER_FIELDS.size
+    amount, offset = unpack_number(payload, offset)
+    price, offset = unpack_number(payload, offset)
+
+    return Order(
+        order_id, maker, ORDER_TYPES[order_type],
+        order_book.supported_assets[pair_key.base_asset_id],
+        order_book.supported_assets[pair_key.quote_asset_id],
+        order_book.supported_blockchains[pair_key.base_blockchain_id],
+        order_book.supported_blockchains[pair_key.quote_blockchain_id],
+        amount, price, expiration_time, bool(fixed_point)
+    )
+
+
+def encode_cancel(pair_key, order_id):
+    """
+    Encode a cancel request.
+
+    Args:
+        pair_key (PairKey): Pair of the order to cancel
+        order_id (str): ID of the order to cancel
+
+    Returns:
+        bytes: Encoded request
+    """
+    return encode_pair_key(pair_key) + pack_str(order_id)
+
+
+def decode_cancel(payload):
+    """
+    Decode a cancel request.
+
+    Args:
+        payload (bytes): Encoded request
+
+    Returns:
+        tuple: (PairKey, order ID)
+    """
+    pair_key, offset = decode_pair_key(payload, 0)
+    order_id, _ = unpack_str(payload, offset)
+    return pair_key, order_id
+
+
+def encode_reduce(order_id, new_amount):
+    """
+    Encode a reduce request.
+
+    Args:
+        order_id (str): ID of the order to reduce
+        new_amount (float): New total amount
+
+    Returns:
+        bytes: Encoded request
+    """
+    return pack_str(order_id) + pack_number(new_amount)
+
+
+def decode_reduce(payload):
+    """
+    Decode a reduce request.
+
+    Args:
+        payload (bytes): Encoded request
+
+    Returns:
+        tuple: (order ID, new amount)
+    """
+    order_id, offset = unpack_str(payload, 0)
+    new_amount, _ = unpack_number(payload, offset)
+    return order_id, new_amount
+
+
+def encode_replace(order_id, price, amount):
+    """
+    Encode a replace request.
+
+    Args:
+        order_id (str): ID of the order to replace
+        price (float): New price
+        amount (float): New total amount
+
+    Returns:
+        bytes: Encoded request
+    """
+    return pack_str(order_id) + pack_number(price) + pack_number(amount)
+
+
+def decode_replace(payload):
+    """
+    Decode a replace request.
+
+    Args:
+        payload (bytes): Encoded request
+
+    Returns:
+        tuple: (order ID, price, amount)
+    """
+    order_id, offset = unpack_str(payload, 0)
+    price, offset = unpack_number(payload, offset)
+    amount, _ = unpack_number(payload, offset)
+    return order_id, price, amount
+
+
+def encode_depth_request(pair_key, levels):
+    """
+    Encode a depth request.
+
+    Args:
+        pair_key (PairKey): Pair to read
+        levels (int): Maximum levels per side (0 for all)
+
+    Returns:
+        bytes: Encoded request
+    """
+    return encode_pair_key(pair_key) + _DEPTH_REQUEST.pack(levels)
+
+
+def decode_depth_request(payload):
+    """
+    Decode a depth request.
+
+    Args:
+        payload (bytes): Encoded request
+
+    Returns:
+        tuple: (PairKey, levels or None for all)
+    """
+    pair_key, offset = decode_pair_key(payload, 0)
+    (levels,) = _DEPTH_REQUEST.unpack_from(payload, offset)
+    return pair_key, levels or None
+
+
+def encode_depth(depth):
+    """
+    Encode an order book depth view.
+
+    Args:
+        depth (dict): {"bids": [(price, volume)], "asks": [...]}
+
+    Returns:
+        bytes: Encoded depth
+    """
+    parts = []
+    for side in ("bids", "asks"):
+        rows = depth[side]
+        parts.append(_DEPTH_COUNT.pack(len(rows)))
+        for price, volume in rows:
+            parts.append(pack_number(price))
+            parts.append(pack_number(volume))
+    return b"".join(parts)
+
+
+def decode_depth(payload, offset=0):
+    """
+    Decode a depth view written by encode_depth.
+
+    Args:
+        payload (bytes): Encoded depth
+        offset (int, optional): Position of the depth
+
+    Returns:
+        dict: {"bids": [(price, volume)], "asks": [...]}
+    """
+    depth = {}
+    for side in ("bids", "asks"):
+        (count,) = _DEPTH_COUNT.unpack_from(payload, offset)
+        offset += _DEPTH_COUNT.size
+        rows = []
+        for _ in range(count):
+            price, offset = unpack_number(payload, offset)
+            volume, offset = unpack_number(payload, offset)
+            rows.append((price, volume))
+        depth[side] = rows
+    return depth
+
+
+def encode_reply(status, body=b""):
+    """
+    Encode a reply payload.
+
+    Args:
+        status (int): STATUS_TRUE, STATUS_FALSE or STATUS_ERROR
+        body (bytes, optional): Operation-specific result
+
+    Returns:
+        bytes: Encoded reply payload
+    """
+    return _REPLY_STATUS.pack(status) + body
+
+
+def encode_error(message):
+    """
+    Encode an error reply payload.
+
+    Args:
+        message (str): Error description
+
+    Returns:
+        bytes: Encoded reply payload
+    """
+    return encode_reply(STATUS_ERROR, pack_str(message[:1000]))
+
+
+def encode_take_result(order):
+    """
+    Encode a taker order's state after processing.
+
+    Args:
+        order (Order): The processed taker order
+
+    Returns:
+        bytes: Encoded status and filled amount
+    """
+    return _TAKE_RESULT.pack(_ORDER_STATUS_CODES[order.status]) + pack_number(order.filled_amount)
+
+
+def decode_take_result(payload, offset):
+    """
+    Decode a taker result written by encode_take_result.
+
+    Args:
+        payload (bytes): Reply payload
+        offset (int): Position of the result
+
+    Returns:
+        tuple: (OrderStatus, filled amount)
+    """
+    (status,) = _TAKE_RESULT.unpack_from(payload, offset)
+    filled_amount, _ = unpack_number(payload, offset + _TAKE_RESULT.size)
+    return ORDER_STATUSES[status], filled_amount
+
+
+def decode_reply(payload):
+    """
+    Split a reply payload into its status and body.
+
+    Args:
+        payload (bytes): Reply payload
+
+    Returns:
+        tuple: (status, offset of the body)
+    """
+    return payload[0], _REPLY_STATUS.size
@@ -0,0 +1,118 @@
+from bisect import bisect_left, insort
+from orderbook.price_level import PriceLevel
+
+class BookSide:
+    """
+    One side (bids or asks) of an order book, organised by price level.
+    """
+
+    def __init__(self, is_bid):
+        """
+        Creates a new, empty book side.
+
+        Args:
+            is_bid (bool): True for the buy side, False for the sell side
+        """
+        self.is_bid = is_bid
+        # Sorted level keys with the best level at the end, so the best
+        # price can be read and dropped in O(1). Bids are keyed by price,
+        # asks by negated price. Fixed-point books key by int prices, so
+        # every comparison is an exact integer compare. Adding or dropping
+        # any other level shifts the keys behind it, which is O(L) for L
+        # levels, though only a single memmove of pointers.
+        self._keys = []
+        self._levels = {}  # Maps price to PriceLevel
+
+    def _key(self, price):
+        return price if self.is_bid else -price
+
+    def get_level(self, price):
+        """
+        Get the level for a price.
+
+        Args:
+            price (float): Level price
+
+        Returns:
+            PriceLevel: The level or None if no orders rest at this price
+        """
+        return self._levels.get(price)
+
+    def get_or_create_level(self, price):
+        """
+        Get the level for a price, creating it if needed.
+
+        Costs O(1) when the level exists. A new level is placed by binary
+        search but inserted into the key list, which is O(L) for L levels.
+
+        Args:
+            price (float): Level price
+
+        Returns:
+            PriceLevel: Level for this price
+        """
+        level = self._levels.get(price)
+        if level is None:
+            level = PriceLevel(price)
+            self._levels[price] = level
+            insort(self._keys, self._key(price))
+        return level
+
+    def remove_level(self, level):
+        """
+        Drop an empty level from this side.
+
+        Costs O(1) for the best level and O(L) for any other.
+
+        Args:
+            level (PriceLevel): Level to drop
+        """
+        del self._levels[level.price]
+        key = self._key(level.price)
+        if self._keys[-1] == key:
+            self._keys.pop()
+        else:
+            del self._keys[bisect_left(self._keys, key)]
+
+    def best_level(self):
+        """
+        Get the level with the best price.
+
+        Returns:
+            PriceLevel: Best level or None if this side is empty
+        """
+        if not self._keys:
+            return None
+        return self._levels[self._key(self._keys[-1])]
+
+    def best_price(self):
+        """
+        Get the best price on this side.
+
+        Returns:
+            float: Best price or None if this side is empty
+        """
+        if not self._keys:
+            return None
+        return self._key(self._keys[-1])
+
+    def levels(self):
+        """
+        Iterate over levels from the best price outward.
+
+        The walk is lazy: each step costs O(log L), and the caller may remove
+        levels (including the one just yielded) between steps.
+
+        Yields:
+            PriceLevel: Levels in price priority
+        """
+        keys = self._keys
+        index = len(keys) - 1
+        while index >= 0:
+            key = keys[index]
+            yield self._levels[self._key(key)]
+            # Re-locate the next key so levels may be dropped while walking
+            index = bisect_left(keys, key) - 1
+
+    def __len__(self):
+        return len(self._keys)
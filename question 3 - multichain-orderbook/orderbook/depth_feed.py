@@ -0,0 +1,97 @@
+import asyncio
+import logging
+
+class DepthFeed:
+    """
+    Publishes L2 depth changes of one order book to asyncio subscribers.
+
+    Every subscriber first receives a full depth snapshot, then one delta
+    per price-level change carrying the level's new total amount (0 when
+    the level is gone). Deltas are numbered so gaps are detectable. A
+    subscriber whose queue overflows is resynchronised with a fresh
+    snapshot instead of blocking the matching loop.
+    """
+
+    def __init__(self, order_book):
+        """
+        Creates a new depth feed.
+
+        Args:
+            order_book (OrderBookPair): Book whose depth is published
+        """
+        self.order_book = order_book
+        self.sequence = 0
+        self._subscribers = []
+
+    def has_subscribers(self):
+        """
+        Check if anyone is listening.
+
+        Returns:
+            bool: True if there is at least one subscriber
+        """
+        return bool(self._subscribers)
+
+    def _snapshot_message(self):
+        depth = self.order_book.get_depth()
+        return {
+            "type": "snapshot",
+            "sequence": self.sequence,
+            "bids": depth["bids"],
+            "asks": depth["asks"]
+        }
+
+    def subscribe(self, max_queue_size=10000):
+        """
+        Start receiving depth updates.
+
+        Args:
+            max_queue_size (int, optional): Messages buffered before the
+                subscriber is resynchronised with a snapshot
+
+        Returns:
+            asyncio.Queue: Queue the snapshot and deltas are delivered to
+        """
+        queue = asyncio.Queue(maxsize=max_queue_size)
+        queue.put_nowait(self._snapshot_message())
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        """
+        Stop delivering updates to a queue.
+
+        Args:
+            queue (asyncio.Queue): Queue returned by subscribe
+        """
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def publish(self, side, price, amount):
+        """
+        Publish the new total amount of a price level.
+
+        Args:
+            side (str): "BUY" or "SELL"
+            price (float): Level price
+            amount (float): New total remaining amount (0 if removed)
+        """
+        self.sequence += 1
+        if not self._subscribers:
+            return
+
+        delta = {
+            "type": "delta",
+            "sequence": self.sequence,
+            "side": side,
+            "price": price,
+            "amount": amount
+        }
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(delta)
+            except asyncio.QueueFull:
+                logging.warning("Depth subscriber fell behind; resending snapshot")
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._snapshot_message())
@@ -0,0 +1,138 @@
+from models.order import OrderType
+
+class GasAwareFillOptimizer:
+    """
+    Picks the maker orders for a taker that give the best value after gas.
+
+    Every maker in a match adds its own settlement legs (a base and a quote
+    transfer), so filling from many small makers can cost more in gas than
+    their better prices save. Starting from the plain best-first fill, the
+    optimiser repeatedly drops the maker whose removal most improves the
+    net value, refilling its amount from the makers behind it. A maker may
+    only be skipped in favour of makers priced within price_tolerance of
+    it, so price-time priority still holds outside that band.
+
+    Work is bounded by max_candidates: at most that many makers are
+    considered, and each taker costs O(max_candidates^3) in the worst case.
+    """
+
+    def __init__(self, price_tolerance=0.001, max_candidates=32):
+        """
+        Creates a new gas-aware fill optimiser.
+
+        Args:
+            price_tolerance (float, optional): Largest relative price
+                difference at which a maker may be skipped for a later one
+            max_candidates (int, optional): Maximum makers considered per taker
+        """
+        self.price_tolerance = price_tolerance
+        self.max_candidates = max_candidates
+
+    def estimate_leg_cost(self, order_book):
+        """
+        Estimate the gas each maker adds to a match on a book.
+
+        Args:
+            order_book (OrderBookPair): Book the makers rest on
+
+        Returns:
+            float: Gas for one maker's base and quote transfer legs
+        """
+        return (order_book.base_blockchain.estimate_gas_fee("TRANSFER_ASSET") +
+                order_book.quote_blockchain.estimate_gas_fee("TRANSFER_ASSET"))
+
+    def _collect(self, taker_order, order_book):
+        # Gather makers up to the one that covers the taker, then keep going
+        # while later makers are within tolerance of that marginal price,
+        # since only they can replace a skipped maker
+        candidates = []
+        total = 0
+        limit = None
+        for maker_order in order_book.iter_matching_orders(taker_order):
+            if limit is not None and self._signed(taker_order, maker_order.price) > limit:
+                break
+            available = order_book.reservations.get_available_amount(maker_order)
+            candidates.append((maker_order, available))
+            total += available
+            if limit is None and total >= taker_order.amount:
+                limit = self._signed(taker_order, maker_order.price) + self.price_tolerance * maker_order.price
+            if len(candidates) >= self.max_candidates:
+                break
+        return candidates, total
+
+    @staticmethod
+    def _signed(taker_order, price):
+        # Lower is better for the taker on both sides
+        return price if taker_order.order_type == OrderType.BUY else -price
+
+    def _allocate(self, taker_order, candidates, skipped, leg_cost):
+        fills = []
+        remaining = taker_order.amount
+        cost = 0
+        for index, (maker_order, available) in enumerate(candidates):
+            if remaining <= 0:
+                break
+            if index in skipped:
+                continue
+            fill_amount = min(remaining, available)
+            fills.append(index)
+            cost += self._signed(taker_order, maker_order.get_quote_amount(fill_amount)) + leg_cost
+            remaining -= fill_amount
+
+        if remaining > 0:
+            return None, None
+        return fills, cost
+
+    def select_fills(self, taker_order, order_book):
+        """
+        Choose the maker orders and amounts that fill a taker.
+
+        Args:
+            taker_order (Order): Taker order to fill
+            order_book (OrderBookPair): Book holding the makers
+
+        Returns:
+            list: (maker_order, fill_amount) pairs in priority order, or
+                None if the candidate window cannot cover the taker
+        """
+        candidates, total = self._collect(taker_order, order_book)
+        if total < taker_order.amount:
+            return None
+
+        leg_cost = taker_order.to_quote_amount(self.estimate_leg_cost(order_book))
+        skipped = set()
+        fills, cost = self._allocate(taker_order, candidates, skipped, leg_cost)
+
+        # Each accepted drop grows the skipped set, so this loop runs at
+        # most max_candidates times
+        while len(fills) > 1:
+            best = None
+            for index in fills:
+                trial_skipped = skipped | {index}
+                trial_fills, trial_cost = self._allocate(
+                    taker_order, candidates, trial_skipped, leg_cost
+                )
+                if trial_fills is None or trial_cost >= cost:
+                    continue
+                if best is not None and trial_cost >= best[2]:
+                    continue
+
+                # Only skip a maker for ones priced within tolerance of it
+                price = candidates[index][0].price
+                limit = self._signed(taker_order, price) + self.price_tolerance * price
+                if all(self._signed(taker_order, candidates[used][0].price) <= limit
+                       for used in trial_fills if used > index):
+                    best = (trial_skipped, trial_fills, trial_cost)
+
+            if best is None:
+                break
+            skipped, fills, cost = best
+
+        result = []
+        remaining = taker_order.amount
+        for index in fills:
+            maker_order, available = candidates[index]
+            fill_amount = min(remaining, available)
+            result.append((maker_order, fill_amount))
+            remaining -= fill_amount
+        return result
@@ -1,18 +1,27 @@
 from datetime import datetime
 from models.order_match import OrderMatch
+from orderbook.pair_key import PairKey
 
 class MultiChainOrderBook:
     """
     Central orderbook system that manages trading pairs across multiple blockchains.
     """
     
-    def __init__(self):
+    def __init__(self, fill_optimizer=None):
         """
         Creates a new multichain order book system.
+        
+        Args:
+            fill_optimizer (GasAwareFillOptimizer, optional): Chooses makers
+                by value net of gas instead of plain best-first order
         """
-        self.order_books = {}  # Maps trading pair keys to OrderBookPair objects
+        self.fill_optimizer = fill_optimizer
+        self.order_books = {}  # Maps PairKey to OrderBookPair objects
         self.supported_blockchains = {}  # Maps blockchain IDs to Blockchain objects
         self.supported_assets = {}  # Maps asset IDs to Asset objects
+        self.books_by_assets = {}  # Maps (base, quote) asset IDs to OrderBookPairs on any chains
+        self.order_index = {}  # Maps resting order IDs to their OrderBookPair, kept by the books
+        self.expiry_listeners = []  # Called by every book with the orders each expiry evicts
         
     def add_blockchain(self, blockchain):
         """
@@ -56,30 +65,152 @@ class MultiChainOrderBook:
             raise ValueError("Invalid asset or blockchain")
             
         # Create a unique key for this trading pair
-        key = f"{base_asset_id}_{quote_asset_id}_{base_blockchain_id}_{quote_blockchain_id}"
+        key = PairKey(base_asset_id, quote_asset_id, base_blockchain_id, quote_blockchain_id)
         
         # Check if we already have this order book
-        if key not in self.order_books:
+        order_book = self.order_books.get(key)
+        if order_book is None:
             # Import here to avoid circular import
             from orderbook.order_book_pair import OrderBookPair
             
-            # Create a new order book pair
+            # Create a new order book pair, whose key becomes the interned key
             order_book = OrderBookPair(
                 base_asset,
                 quote_asset,
                 base_blockchain,
-                quote_blockchain
+                quote_blockchain,
+                self.order_index,
+                self.expiry_listeners
             )
-            self.order_books[key] = order_book
+            self.order_books[order_book.pair_key] = order_book
+            self.books_by_assets.setdefault((base_asset_id, quote_asset_id), []).append(order_book)
+            
+        return order_book
+        
+    def add_expiry_listener(self, listener):
+        """
+        Get told about every expired order any book evicts.
+        
+        Covers purges by the expiry scheduler, lazy purges during matching
+        and expired orders evicted once their pending matches settle.
+        
+        Args:
+            listener (callable): Called with the list of evicted orders
+        """
+        self.expiry_listeners.append(listener)
+        
+    def get_order_book_for(self, order):
+        """
+        Get the order book an order trades in, without creating one.
+        
+        The order's PairKey is built and interned on first use and cached
+        on the order, so repeat lookups are a single dict probe.
+        
+        Args:
+            order (Order): Order whose trading pair to look up
+            
+        Returns:
+            OrderBookPair: Order book for the order's pair or None
+        """
+        key = order.pair_key
+        if key is not None:
+            return self.order_books.get(key)
+            
+        key = PairKey.for_order(order)
+        order_book = self.order_books.get(key)
+        order.pair_key = order_book.pair_key if order_book is not None else key
+        return order_book
+        
+    def get_order_book_for_id(self, order_id):
+        """
+        Get the book a resting order is in, from its ID alone.
+        
+        Args:
+            order_id (str): ID of the resting order
+            
+        Returns:
+            OrderBookPair: Book holding the order or None
+        """
+        return self.order_index.get(order_id)
+        
+    def get_order(self, order_id):
+        """
+        Look up a resting order in any book by ID.
+        
+        Args:
+            order_id (str): ID of the order
+            
+        Returns:
+            Order: The order or None if it is not resting in any book
+        """
+        order_book = self.order_index.get(order_id)
+        return order_book.get_order(order_id) if order_book is not None else None
+        
+    def reduce_order(self, order_id, new_amount):
+        """
+        Shrink a resting order in place, keeping its queue priority.
+        
+        Args:
+            order_id (str): ID of the order to amend
+            new_amount (float): New total amount, including filled amount
+            
+        Returns:
+            Order: The amended order
+            
+        Raises:
+            KeyError: If the order is not resting in any book
+            ValueError: If the new amount is not a valid reduction
+        """
+        order_book = self.order_index.get(order_id)
+        if order_book is None:
+            raise KeyError(order_id)
+        return order_book.reduce_order(order_id, new_amount)
+        
+    def replace_order(self, order_id, price=None, amount=None, timestamp=None):
+        """
+        Change a resting order's price and/or size; it loses queue priority.
+        
+        Args:
+            order_id (str): ID of the order to replace
+            price (float, optional): New price
+            amount (float, optional): New total amount, including filled amount
+            timestamp (float, optional): New time priority in milliseconds
+            
+        Returns:
+            Order: The replaced order
+            
+        Raises:
+            KeyError: If the order is not resting in any book
+            ValueError: If the new values are invalid
+        """
+        order_book = self.order_index.get(order_id)
+        if order_book is None:
+            raise KeyError(order_id)
+        return order_book.replace_order(order_id, price, amount, timestamp)
+        
+    def get_equivalent_order_books(self, base_asset_id, quote_asset_id):
+        """
+        Get every order book trading the same assets, on any chains.
+        
+        Args:
+            base_asset_id (str): ID of base asset
+            quote_asset_id (str): ID of quote asset
             
-        return self.order_books[key]
+        Returns:
+            list: OrderBookPairs for this asset pair
+        """
+        return self.books_by_assets.get((base_asset_id, quote_asset_id), [])
         
-    def process_taker_order(self, taker_order):
+    def process_taker_order(self, taker_order, order_book=None, cursor=None):
         """
         Process a taker order and try to find matching maker orders.
         
         Args:
             taker_order (Order): Taker order to process
+            order_book (OrderBookPair, optional): Book already looked up for
+                the taker's pair, skipping the lookup
+            cursor (MatchCursor, optional): Walk shared with earlier takers
+                of a batch, read without moving it
             
         Returns:
             OrderMatch: Match object with matching maker orders
@@ -89,26 +220,37 @@ class MultiChainOrderBook:
         match = OrderMatch(match_id, taker_order)
         
         # Get the appropriate order book
-        order_book_key = (f"{taker_order.base_asset.id}_{taker_order.quote_asset.id}_"
-                         f"{taker_order.base_blockchain.id}_{taker_order.quote_blockchain.id}")
-        order_book = self.order_books.get(order_book_key)
+        if order_book is None:
+            order_book = self.get_order_book_for(taker_order)
         
         if not order_book:
             # No order book exists for this pair, so there are no matches
             return match
             
-        # Find matching orders
-        matching_orders = order_book.find_matching_orders(taker_order)
+        # Walk matching orders best-first until the taker order is completely
+        # filled or we run out of matches
         remaining_amount = taker_order.amount
+        if remaining_amount <= 0:
+            return match
         
-        # Fill orders until the taker order is completely filled or we run out of matches
-        for maker_order in matching_orders:
-            if remaining_amount <= 0:
-                break
-                
-            fill_amount = min(remaining_amount, maker_order.get_remaining_amount())
+        if cursor is not None:
+            for maker_order, fill_amount in cursor.fills(taker_order):
+                match.add_maker_order(maker_order, fill_amount)
+            return match
+        
+        if self.fill_optimizer is not None:
+            fills = self.fill_optimizer.select_fills(taker_order, order_book)
+            if fills is not None:
+                for maker_order, fill_amount in fills:
+                    match.add_maker_order(maker_order, fill_amount)
+                return match
+        
+        for maker_order in order_book.iter_matching_orders(taker_order):
+            fill_amount = min(remaining_amount, order_book.reservations.get_available_amount(maker_order))
             match.add_maker_order(maker_order, fill_amount)
             
             remaining_amount -= fill_amount
+            if remaining_amount <= 0:
+                break
             
         return match
\ No newline at end of file
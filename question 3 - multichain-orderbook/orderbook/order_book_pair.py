@@ -1,11 +1,22 @@
+import heapq
+from datetime import datetime
+from itertools import count
 from models.order import OrderType, OrderStatus
+from orderbook.book_side import BookSide
+from orderbook.depth_feed import DepthFeed
+from orderbook.pair_key import PairKey
+from orderbook.reservation_ledger import ReservationLedger
+
+# Partially filled orders keep resting with their remaining amount
+MATCHABLE_STATUSES = (OrderStatus.ACTIVE, OrderStatus.PARTIALLY_FILLED)
 
 class OrderBookPair:
     """
     Represents the order book for a specific trading pair.
     """
     
-    def __init__(self, base_asset, quote_asset, base_blockchain, quote_blockchain):
+    def __init__(self, base_asset, quote_asset, base_blockchain, quote_blockchain,
+                 order_index=None, expiry_listeners=None):
         """
         Creates a new order book for a specific trading pair.
         
@@ -14,6 +25,10 @@ class OrderBookPair:
             quote_asset (Asset): Quote asset in the trading pair
             base_blockchain (Blockchain): Blockchain for the base asset
             quote_blockchain (Blockchain): Blockchain for the quote asset
+            order_index (dict, optional): Index shared across books, kept
+                mapping the ID of every resting order to its book
+            expiry_listeners (list, optional): Callables handed the list of
+                orders each expiry eviction removes
         """
         # Validate that we're not trying to trade the same asset on the same blockchain
         if (base_asset.id == quote_asset.id and 
@@ -24,8 +39,40 @@ class OrderBookPair:
         self.quote_asset = quote_asset
         self.base_blockchain = base_blockchain
         self.quote_blockchain = quote_blockchain
-        self.buy_orders = []
-        self.sell_orders = []
+        self.pair_key = PairKey(
+            base_asset.id, quote_asset.id, base_blockchain.id, quote_blockchain.id
+        )
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self._orders = {}  # Maps order ID to (side, level, node)
+        self._expiry_heap = []  # (expiration_time, sequence, order) min-heap
+        self._expiry_sequence = count()
+        self._expired_held = {}  # Maps order ID to an expired order held by pending matches
+        self.reservations = ReservationLedger()
+        self.depth_feed = DepthFeed(self)
+        self.fixed_point = None  # Amount mode, fixed by the first order added
+        self.order_index = order_index
+        self.expiry_listeners = expiry_listeners if expiry_listeners is not None else []
+
+    @property
+    def buy_orders(self):
+        """
+        Buy orders in priority order (highest price first, then oldest).
+
+        Returns:
+            list: Resting buy orders
+        """
+        return [order for level in self.bids.levels() for order in level]
+
+    @property
+    def sell_orders(self):
+        """
+        Sell orders in priority order (lowest price first, then oldest).
+
+        Returns:
+            list: Resting sell orders
+        """
+        return [order for level in self.asks.levels() for order in level]
         
     def add_order(self, order):
         """
@@ -33,24 +80,61 @@ class OrderBookPair:
         
         Args:
             order (Order): Order to add
+            
+        Raises:
+            ValueError: If the order is for another pair or amount mode, or
+                its ID is already resting in this or another indexed book
         """
         # Validate that the order matches this pair
-        if (order.base_asset.id != self.base_asset.id or
-            order.quote_asset.id != self.quote_asset.id or
-            order.base_blockchain.id != self.base_blockchain.id or
-            order.quote_blockchain.id != self.quote_blockchain.id):
+        if order.pair_key is None:
+            order.pair_key = PairKey.for_order(order)
+        if order.pair_key != self.pair_key:
             raise ValueError("Order does not match this order book pair")
+        order.pair_key = self.pair_key
+        self._check_fixed_point(order)
             
-        # Add to appropriate list and sort
-        if order.order_type == OrderType.BUY:
-            self.buy_orders.append(order)
-            # Sort buy orders by price (highest first) and then by timestamp
-            self.buy_orders.sort(key=lambda x: (-x.price, x.timestamp))
-        else:
-            self.sell_orders.append(order)
-            # Sort sell orders by price (lowest first) and then by timestamp
-            self.sell_orders.sort(key=lambda x: (x.price, x.timestamp))
+        if order.id in self._orders:
+            raise ValueError(f"Order {order.id} is already in this order book")
+        if self.order_index is not None and order.id in self.order_index:
+            raise ValueError(f"Order {order.id} is already resting in another order book")
+
+        self._link(order)
+        if order.expiration_time:
+            heapq.heappush(
+                self._expiry_heap,
+                (order.expiration_time, next(self._expiry_sequence), order)
+            )
             
+    def _link(self, order):
+        # Queue at the order's price level, which keeps price-time priority
+        side = self.bids if order.order_type == OrderType.BUY else self.asks
+        level = side.get_or_create_level(order.price)
+        node = level.append(order)
+        self._orders[order.id] = (side, level, node)
+        if self.order_index is not None:
+            self.order_index[order.id] = self
+        self._adjust_level(side, level, order.get_remaining_amount())
+
+    def accepts_amount_mode(self, order):
+        """
+        Check whether an order's amount mode can trade in this book.
+        
+        Float and fixed-point prices cannot share levels or be compared, so
+        a book takes its mode from its first order.
+        
+        Args:
+            order (Order): Maker or taker order
+            
+        Returns:
+            bool: True if the book has no mode yet or uses the order's
+        """
+        return self.fixed_point is None or order.fixed_point == self.fixed_point
+
+    def _check_fixed_point(self, order):
+        if not self.accepts_amount_mode(order):
+            raise ValueError(f"Order {order.id} does not use this order book's amount mode")
+        self.fixed_point = order.fixed_point
+
     def remove_order(self, order_id):
         """
         Remove an order from the order book.
@@ -61,19 +145,375 @@ class OrderBookPair:
         Returns:
             bool: True if order was found and removed
         """
-        # Try to remove from buy orders
-        for i, order in enumerate(self.buy_orders):
-            if order.id == order_id:
-                self.buy_orders.pop(i)
-                return True
-                
-        # Try to remove from sell orders
-        for i, order in enumerate(self.sell_orders):
-            if order.id == order_id:
-                self.sell_orders.pop(i)
-                return True
-                
-        return False
+        entry = self._orders.get(order_id)
+        if entry is None:
+            return False
+
+        self._unlink(entry, entry[2].order.get_remaining_amount())
+        return True
+
+    def _unlink(self, entry, resting_amount, compact=True):
+        side, level, node = entry
+        order_id = node.order.id
+        del self._orders[order_id]
+        if self.order_index is not None and self.order_index.get(order_id) is self:
+            del self.order_index[order_id]
+        level.remove(node)
+        if level.is_empty():
+            side.remove_level(level)
+            level.volume = 0
+            self.depth_feed.publish(self._side_name(side), level.price, 0)
+        else:
+            self._adjust_level(side, level, -max(resting_amount, 0))
+
+        # Removed orders leave stale expiry entries behind; compact the heap
+        # once they outnumber the live orders so it cannot grow unbounded
+        if compact and len(self._expiry_heap) > 2 * len(self._orders) + 64:
+            self._compact_expiry_heap()
+
+    def reduce_order(self, order_id, new_amount):
+        """
+        Shrink a resting order in place, keeping its queue position.
+        
+        Costs O(1): the order is found through the ID index and only its
+        level's volume changes.
+        
+        Args:
+            order_id (str): ID of the order to amend
+            new_amount (float): New total amount, including what has
+                already been filled
+            
+        Returns:
+            Order: The amended order
+            
+        Raises:
+            KeyError: If the order is not in the book
+            ValueError: If new_amount is not a reduction, would leave
+                nothing to fill, or would cut into liquidity held by a
+                settling match
+        """
+        entry = self._orders.get(order_id)
+        if entry is None:
+            raise KeyError(order_id)
+        side, level, node = entry
+        order = node.order
+        
+        if order.fixed_point and not isinstance(new_amount, int):
+            raise ValueError("Fixed-point orders need an integer amount")
+        if new_amount >= order.amount:
+            raise ValueError(f"Order {order_id} can only be reduced in place; replace it to grow it")
+        new_remaining = new_amount - order.filled_amount
+        if new_remaining <= 0:
+            raise ValueError(f"Order {order_id} would have nothing left to fill; cancel it instead")
+        if new_remaining < self.reservations.get_reserved_amount(order):
+            raise ValueError(f"Order {order_id} has more than {new_remaining} held by pending matches")
+        
+        self._adjust_level(side, level, new_amount - order.amount)
+        order.amount = new_amount
+        return order
+    
+    def replace_order(self, order_id, price=None, amount=None, timestamp=None):
+        """
+        Change a resting order's price and/or size, sending it to the back
+        of the queue at its (new) price.
+        
+        Costs O(1) when the destination level exists. Creating it, or
+        dropping the level the order leaves, is O(L) for L price levels.
+        
+        Args:
+            order_id (str): ID of the order to replace
+            price (float, optional): New price (unchanged if omitted)
+            amount (float, optional): New total amount, including what has
+                already been filled (unchanged if omitted)
+            timestamp (float, optional): New time priority in milliseconds
+                (now if omitted)
+            
+        Returns:
+            Order: The replaced order
+            
+        Raises:
+            KeyError: If the order is not in the book
+            ValueError: If the new values are invalid or the order is held
+                by a settling match
+        """
+        entry = self._orders.get(order_id)
+        if entry is None:
+            raise KeyError(order_id)
+        order = entry[2].order
+        
+        if self.reservations.get_reserved_amount(order) > 0:
+            raise ValueError(f"Order {order_id} is held by a pending match")
+        if price is None:
+            price = order.price
+        if amount is None:
+            amount = order.amount
+        if amount - order.filled_amount <= 0:
+            raise ValueError(f"Order {order_id} would have nothing left to fill; cancel it instead")
+        if order.fixed_point and not (isinstance(price, int) and isinstance(amount, int)):
+            raise ValueError("Fixed-point orders need integer amount and price")
+        
+        # The order's expiry heap entry stays valid (same order, same
+        # deadline), so it must survive while the order is briefly unlinked
+        self._unlink(entry, order.get_remaining_amount(), compact=False)
+        order.price = price
+        order.amount = amount
+        order.timestamp = datetime.now().timestamp() * 1000 if timestamp is None else timestamp
+        self._link(order)
+        return order
+
+    def apply_fill(self, order, fill_amount):
+        """
+        Record a fill against a maker order.
+
+        Updates the order's filled amount and status, keeps its level's
+        depth in step, and removes the order once it is completely filled.
+        An order that is no longer resting here is left untouched.
+
+        Args:
+            order (Order): The maker order
+            fill_amount (float): Amount filled
+
+        Returns:
+            bool: True if the fill was applied
+        """
+        entry = self._orders.get(order.id)
+        if (entry is None or entry[2].order is not order or
+            order.status == OrderStatus.CANCELLED):
+            return False
+
+        order.filled_amount += fill_amount
+        filled = order.filled_amount >= order.amount
+        order.status = OrderStatus.FILLED if filled else OrderStatus.PARTIALLY_FILLED
+
+        if filled:
+            # The order's depth contribution was its pre-fill remaining amount
+            self._unlink(entry, order.get_remaining_amount() + fill_amount)
+        else:
+            side, level, _ = entry
+            self._adjust_level(side, level, -fill_amount)
+        return True
+
+    def commit_reservation(self, match):
+        """
+        Drop a settled match's reservations; its fills are already applied.
+
+        Orders that expired while the match held them are evicted now.
+
+        Args:
+            match (OrderMatch): The settled match
+
+        Returns:
+            list: Orders evicted because they had expired
+        """
+        return self._evict_released(self.reservations.commit(match))
+
+    def release_reservation(self, match):
+        """
+        Hand a failed match's reserved liquidity back to the book.
+
+        Orders that expired while the match held them are evicted instead.
+
+        Args:
+            match (OrderMatch): The failed match
+
+        Returns:
+            list: Orders evicted because they had expired
+        """
+        return self._evict_released(self.reservations.release(match))
+
+    def _evict_released(self, orders):
+        if not self._expired_held:
+            return []
+        evicted = []
+        for order in orders:
+            if self._expired_held.get(order.id) is not order:
+                continue
+            del self._expired_held[order.id]
+            if self.get_order(order.id) is order:
+                self._expire(order)
+                evicted.append(order)
+        self._notify_expired(evicted)
+        return evicted
+
+    def _expire(self, order):
+        self.remove_order(order.id)
+        order.status = OrderStatus.CANCELLED
+
+    def _notify_expired(self, evicted):
+        if evicted:
+            for listener in self.expiry_listeners:
+                listener(evicted)
+
+    def _side_name(self, side):
+        return "BUY" if side is self.bids else "SELL"
+
+    def _adjust_level(self, side, level, delta):
+        level.volume += delta
+        self.depth_feed.publish(self._side_name(side), level.price, level.volume)
+
+    def get_depth(self, levels=None):
+        """
+        Get aggregated depth (L2) from the best price outward.
+
+        Level totals are maintained incrementally, so this costs O(N log L)
+        for N levels rather than a walk over every order.
+
+        Args:
+            levels (int, optional): Levels per side (all levels if omitted)
+
+        Returns:
+            dict: "bids" and "asks" lists of (price, total remaining amount)
+        """
+        depth = {}
+        for name, side in (("bids", self.bids), ("asks", self.asks)):
+            rows = []
+            for level in side.levels():
+                if levels is not None and len(rows) >= levels:
+                    break
+                rows.append((level.price, level.volume))
+            depth[name] = rows
+        return depth
+
+    def _compact_expiry_heap(self):
+        live = []
+        for item in self._expiry_heap:
+            expiration_time, _, order = item
+            entry = self._orders.get(order.id)
+            if (entry is not None and entry[2].order is order and
+                order.expiration_time == expiration_time):
+                live.append(item)
+        heapq.heapify(live)
+        self._expiry_heap = live
+
+    def get_order(self, order_id):
+        """
+        Look up a resting order by ID.
+
+        Args:
+            order_id (str): ID of the order
+
+        Returns:
+            Order: The order or None if it is not in the book
+        """
+        entry = self._orders.get(order_id)
+        return entry[2].order if entry else None
+
+    def get_next_expiration(self):
+        """
+        Get the earliest pending expiration time in this book.
+
+        Returns:
+            float: Expiration time in milliseconds or None if nothing expires
+        """
+        return self._expiry_heap[0][0] if self._expiry_heap else None
+
+    def purge_expired(self, now=None):
+        """
+        Evict every order whose expiration time has passed.
+
+        Orders are popped from the expiry heap in deadline order, so a purge
+        costs O(k log n) for k expired orders and O(1) when nothing is due.
+        Heap entries for orders that already left the book are discarded.
+        An expired order still held by a pending match stays until the
+        match commits or is released, like a cancel would, and is evicted
+        then. Every eviction is reported to the expiry listeners.
+
+        Args:
+            now (float, optional): Current time in milliseconds
+
+        Returns:
+            list: Orders that were evicted and marked as cancelled
+        """
+        heap = self._expiry_heap
+        if not heap:
+            return []
+
+        if now is None:
+            now = datetime.now().timestamp() * 1000
+
+        evicted = []
+        while heap and heap[0][0] < now:
+            expiration_time, _, order = heapq.heappop(heap)
+
+            entry = self._orders.get(order.id)
+            if (entry is None or entry[2].order is not order or
+                order.expiration_time != expiration_time):
+                # Stale entry: the order was removed or re-scheduled
+                continue
+
+            if self.reservations.get_reserved_amount(order) > 0:
+                self._expired_held[order.id] = order
+                continue
+
+            self._expire(order)
+            evicted.append(order)
+
+        self._notify_expired(evicted)
+        return evicted
+
+    def get_best_bid(self):
+        """
+        Get the highest resting buy price.
+
+        Returns:
+            float: Best bid price or None if there are no buy orders
+        """
+        return self.bids.best_price()
+
+    def get_best_ask(self):
+        """
+        Get the lowest resting sell price.
+
+        Returns:
+            float: Best ask price or None if there are no sell orders
+        """
+        return self.asks.best_price()
+
+    def get_order_count(self):
+        """
+        Get the number of resting orders on both sides.
+
+        Returns:
+            int: Number of resting orders
+        """
+        return len(self._orders)
+        
+    def iter_matching_orders(self, taker_order):
+        """
+        Lazily walk the orders that cross a taker order, best price first.
+
+        Only the levels the caller actually consumes are visited, so a taker
+        that stops once it is filled never pays for the rest of the book.
+        Expired orders are purged up front, so none are left to skip.
+        
+        Args:
+            taker_order (Order): Taker order to match
+            
+        Yields:
+            Order: Matching maker orders in price-time priority
+        """
+        self.purge_expired()
+        if not self.accepts_amount_mode(taker_order):
+            raise ValueError(f"Order {taker_order.id} does not use this order book's amount mode")
+
+        limit = taker_order.price
+        if taker_order.order_type == OrderType.BUY:
+            # For a buy order, walk sell orders with price <= taker price
+            side = self.asks
+            crosses = lambda price: price <= limit
+        else:
+            # For a sell order, walk buy orders with price >= taker price
+            side = self.bids
+            crosses = lambda price: price >= limit
+
+        for level in side.levels():
+            # Levels are walked best-first, so the first miss ends the walk
+            if not crosses(level.price):
+                return
+            for order in level:
+                if (order.status in MATCHABLE_STATUSES and
+                    self.reservations.get_available_amount(order) > 0):
+                    yield order
         
     def find_matching_orders(self, taker_order):
         """
@@ -85,34 +525,121 @@ class OrderBookPair:
         Returns:
             list: List of matching orders
         """
-        if taker_order.order_type == OrderType.BUY:
-            # For a buy order, find sell orders with price <= taker price
-            return [
-                order for order in self.sell_orders
-                if (order.status == OrderStatus.ACTIVE and
-                    order.price <= taker_order.price and
-                    not order.is_expired())
-            ]
-        else:
-            # For a sell order, find buy orders with price >= taker price
-            return [
-                order for order in self.buy_orders
-                if (order.status == OrderStatus.ACTIVE and
-                    order.price >= taker_order.price and
-                    not order.is_expired())
-            ]
+        return list(self.iter_matching_orders(taker_order))
             
     def has_enough_liquidity(self, taker_order):
         """
         Check if there is enough liquidity to fill a taker order.
         
+        Stops walking the book as soon as the taker amount is covered.
+        
         Args:
             taker_order (Order): Taker order to check
             
         Returns:
             bool: True if enough liquidity is available
         """
-        matching_orders = self.find_matching_orders(taker_order)
-        total_available = sum(order.get_remaining_amount() for order in matching_orders)
+        total_available = 0
+        for order in self.iter_matching_orders(taker_order):
+            total_available += self.reservations.get_available_amount(order)
+            if total_available >= taker_order.amount:
+                return True
+        
+        return total_available >= taker_order.amount
+
+    def match_cursor(self, order_type):
+        """
+        Start one best-first walk shared by a batch of takers on one side.
+        
+        Expired orders are purged once, up front, for the whole batch.
+        
+        Args:
+            order_type (OrderType): Side of the takers (BUY walks the asks)
+            
+        Returns:
+            MatchCursor: Cursor over the opposite side of the book
+        """
+        self.purge_expired()
+        side = self.asks if order_type == OrderType.BUY else self.bids
+        return MatchCursor(self, side)
+
+    def _iter_available(self, side):
+        for level in side.levels():
+            for order in level:
+                if (order.status in MATCHABLE_STATUSES and
+                    self.reservations.get_available_amount(order) > 0):
+                    yield level.price, order
+
+
+class MatchCursor:
+    """
+    Best-first walk over one side of a book, carried from taker to taker.
+    
+    Each taker starts where the previous one stopped, so a batch visits
+    every maker once instead of once per taker. Makers' remaining amounts
+    are carried in the reservation ledger: the caller reserves a taker's
+    fills before the next taker reads the cursor, and the book must not
+    change otherwise while the cursor is in use.
+    """
+
+    def __init__(self, order_book, side):
+        """
+        Creates a new cursor at the best price of a book side.
+        
+        Args:
+            order_book (OrderBookPair): Book to walk
+            side (BookSide): Side the takers match against
+        """
+        self.order_book = order_book
+        self._is_bid = side.is_bid
+        self._makers = order_book._iter_available(side)
+        self._walked = []  # (price, order) for makers reached so far
+        self._position = 0  # First walked maker with an amount left
+
+    def fills(self, taker_order):
+        """
+        Get the fills a taker would take from the cursor, without taking them.
         
-        return total_available >= taker_order.amount
\ No newline at end of file
+        Args:
+            taker_order (Order): Taker order on the cursor's side
+            
+        Returns:
+            list: (maker order, fill amount) pairs in price-time priority
+        """
+        reservations = self.order_book.reservations
+        limit = taker_order.price
+        remaining = taker_order.amount
+        fills = []
+        index = self._position
+        while remaining > 0:
+            if index == len(self._walked):
+                maker = next(self._makers, None)
+                if maker is None:
+                    break
+                self._walked.append(maker)
+            price, order = self._walked[index]
+            # Prices only get worse from here, so the first miss ends the walk
+            if (price < limit) if self._is_bid else (price > limit):
+                break
+            index += 1
+            available = reservations.get_available_amount(order)
+            if available <= 0:
+                continue
+            fill_amount = min(remaining, available)
+            fills.append((order, fill_amount))
+            remaining -= fill_amount
+        return fills
+
+    def advance(self):
+        """
+        Move past the makers whose liquidity is now fully reserved.
+        """
+        reservations = self.order_book.reservations
+        walked = self._walked
+        while (self._position < len(walked) and
+               reservations.get_available_amount(walked[self._position][1]) <= 0):
+            self._position += 1
+        # Forget makers that are used up so a long batch stays small
+        if self._position > 64:
+            del walked[:self._position]
+            self._position = 0
\ No newline at end of file
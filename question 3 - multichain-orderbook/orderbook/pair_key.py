@@ -0,0 +1,31 @@
+from collections import namedtuple
+
+class PairKey(namedtuple("PairKey", [
+    "base_asset_id", "quote_asset_id", "base_blockchain_id", "quote_blockchain_id"
+])):
+    """
+    Identifies a trading pair by its asset and blockchain IDs.
+
+    Unlike a joined string, the key is unambiguous for IDs that contain
+    separators, and building or hashing it never formats a string.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def for_order(cls, order):
+        """
+        Build the key for the trading pair an order belongs to.
+
+        Args:
+            order (Order): The order
+
+        Returns:
+            PairKey: Key for the order's trading pair
+        """
+        return cls(
+            order.base_asset.id,
+            order.quote_asset.id,
+            order.base_blockchain.id,
+            order.quote_blockchain.id
+        )
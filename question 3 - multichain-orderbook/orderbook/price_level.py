@@ -0,0 +1,125 @@
+class OrderNode:
+    """
+    Doubly linked list node holding a single resting order.
+    """
+
+    __slots__ = ("order", "prev", "next")
+
+    def __init__(self, order):
+        """
+        Creates a new node for an order.
+
+        Args:
+            order (Order): The resting order
+        """
+        self.order = order
+        self.prev = None
+        self.next = None
+
+
+class PriceLevel:
+    """
+    FIFO queue of all orders resting at a single price.
+    """
+
+    __slots__ = ("price", "head", "tail", "count", "volume")
+
+    def __init__(self, price):
+        """
+        Creates a new, empty price level.
+
+        Args:
+            price (float): Price shared by every order in this level
+        """
+        self.price = price
+        self.head = None
+        self.tail = None
+        self.count = 0
+        self.volume = 0  # Total remaining amount, maintained by the book
+
+    def append(self, order):
+        """
+        Queue an order at this level, keeping time priority.
+
+        Orders normally arrive in timestamp order, so this is O(1). An order
+        carrying an older timestamp is walked back to its time-priority slot,
+        placed after any order with an equal timestamp.
+
+        Args:
+            order (Order): Order to queue
+
+        Returns:
+            OrderNode: Node holding the order, used for O(1) removal
+        """
+        node = OrderNode(order)
+
+        # Find the last node that should stay ahead of the new order
+        cursor = self.tail
+        while cursor is not None and cursor.order.timestamp > order.timestamp:
+            cursor = cursor.prev
+
+        if cursor is None:
+            # New head of the queue
+            node.next = self.head
+            if self.head is not None:
+                self.head.prev = node
+            self.head = node
+        else:
+            node.prev = cursor
+            node.next = cursor.next
+            if cursor.next is not None:
+                cursor.next.prev = node
+            cursor.next = node
+
+        if node.next is None:
+            self.tail = node
+
+        self.count += 1
+        return node
+
+    def remove(self, node):
+        """
+        Unlink a node from this level.
+
+        Args:
+            node (OrderNode): Node previously returned by append
+        """
+        if node.prev is not None:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+
+        node.prev = None
+        node.next = None
+        self.count -= 1
+
+    def is_empty(self):
+        """
+        Check if this level has no resting orders.
+
+        Returns:
+            bool: True if empty
+        """
+        return self.head is None
+
+    def __iter__(self):
+        """
+        Iterate over orders in time priority.
+
+        Yields:
+            Order: Resting orders, oldest first
+        """
+        node = self.head
+        while node is not None:
+            # Read the successor first so the current node can be removed
+            next_node = node.next
+            yield node.order
+            node = next_node
+
+    def __len__(self):
+        return self.count
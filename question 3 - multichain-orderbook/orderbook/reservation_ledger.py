@@ -0,0 +1,123 @@
+class ReservationLedger:
+    """
+    Tracks maker liquidity held by matches that have not settled yet.
+
+    Each resting order's available amount is its remaining amount minus
+    what pending matches hold. Reservations are taken per match,
+    all-or-nothing, and dropped when that match commits or is released.
+    """
+
+    def __init__(self):
+        """
+        Creates a new, empty reservation ledger.
+        """
+        self._reserved = {}  # Maps order ID to total reserved amount
+        self._hold_counts = {}  # Maps order ID to the number of fills holding it
+        self._holds = {}  # Maps OrderMatch to its [(order, amount), ...]
+
+    def get_reserved_amount(self, order):
+        """
+        Get how much of an order pending matches hold.
+
+        Args:
+            order (Order): Resting order
+
+        Returns:
+            float: Reserved amount
+        """
+        return self._reserved.get(order.id, 0)
+
+    def get_available_amount(self, order):
+        """
+        Get how much of an order new matches may still take.
+
+        Args:
+            order (Order): Resting order
+
+        Returns:
+            float: Remaining amount not held by pending matches
+        """
+        return order.get_remaining_amount() - self._reserved.get(order.id, 0)
+
+    def holds(self, match):
+        """
+        Check if a match currently holds reservations in this ledger.
+
+        Args:
+            match (OrderMatch): The match
+
+        Returns:
+            bool: True if the match has reserved liquidity here
+        """
+        return match in self._holds
+
+    def reserve(self, match, fills):
+        """
+        Atomically reserve liquidity for a match.
+
+        Either every fill is reserved or, if any fill exceeds the order's
+        available amount, nothing is.
+
+        Args:
+            match (OrderMatch): Match taking the liquidity
+            fills (list): (order, amount) pairs to hold
+
+        Raises:
+            ValueError: If the match already holds reservations or a fill
+                exceeds the available amount
+        """
+        if match in self._holds:
+            raise ValueError(f"Match {match.id} already holds reservations")
+
+        # Validate the whole match first, counting repeated orders together
+        requested = {}
+        for order, amount in fills:
+            requested[order.id] = requested.get(order.id, 0) + amount
+            if requested[order.id] > self.get_available_amount(order):
+                raise ValueError(
+                    f"Insufficient available liquidity on order {order.id} for match {match.id}"
+                )
+
+        for order, amount in fills:
+            self._reserved[order.id] = self._reserved.get(order.id, 0) + amount
+            self._hold_counts[order.id] = self._hold_counts.get(order.id, 0) + 1
+        self._holds[match] = list(fills)
+
+    def _drop(self, match):
+        freed = []
+        for order, amount in self._holds.pop(match, ()):
+            # Count the holds rather than test the float total for zero, so
+            # rounding cannot leave a residue on an order nothing holds
+            holds = self._hold_counts[order.id] - 1
+            if holds:
+                self._hold_counts[order.id] = holds
+                self._reserved[order.id] -= amount
+            else:
+                del self._hold_counts[order.id]
+                del self._reserved[order.id]
+                freed.append(order)
+        return freed
+
+    def commit(self, match):
+        """
+        Drop a match's reservations once its fills are in filled_amount.
+
+        Args:
+            match (OrderMatch): The settled match
+
+        Returns:
+            list: Orders no pending match holds any more
+        """
+        return self._drop(match)
+
+    def release(self, match):
+        """
+        Return a failed match's reservations to the available liquidity.
+
+        Args:
+            match (OrderMatch): The failed match
+
+        Returns:
+            list: Orders no pending match holds any more
+        """
+        return self._drop(match)
@@ -0,0 +1,236 @@
+import heapq
+from datetime import datetime
+from models.order import OrderType
+from models.order_match import OrderMatch
+
+
+def settlement_chains(taker_order, base_blockchain, quote_blockchain):
+    """
+    Get the chains a taker's fill against a book settles between.
+
+    A fill has a base leg from the seller's base chain to the buyer's quote
+    chain and a quote leg back. The maker side sits on the book's chains
+    and the taker side on the taker's own, so a fill routed to another
+    book's chains moves assets straight between the two.
+
+    Args:
+        taker_order (Order): Taker order being filled
+        base_blockchain (Blockchain): Book's base chain
+        quote_blockchain (Blockchain): Book's quote chain
+
+    Returns:
+        tuple: (source, dest) chains of the base leg and of the quote leg
+    """
+    if taker_order.order_type == OrderType.BUY:
+        seller_chain, buyer_chain = base_blockchain, taker_order.quote_blockchain
+    else:
+        seller_chain, buyer_chain = taker_order.base_blockchain, quote_blockchain
+    return (seller_chain, buyer_chain), (buyer_chain, seller_chain)
+
+
+class SmartOrderRouter:
+    """
+    Splits a taker order across every book trading the same asset pair.
+
+    A taker is no longer limited to the book on its own chains: any book
+    for the same base/quote assets on an allowed chain combination can fill
+    it. Makers are ranked by price net of each book's fixed costs (gas on
+    the chains involved plus bridging each settlement leg between the
+    book's chains and the taker's), and the taker is filled best-first
+    across books.
+    """
+
+    def __init__(self, order_book, bridge_cost_estimator=None, refine_passes=1):
+        """
+        Creates a new smart order router.
+
+        Args:
+            order_book (MultiChainOrderBook): The orderbook instance
+            bridge_cost_estimator (callable, optional): Called as
+                (source_chain, dest_chain, asset) and returning the cost of
+                moving an asset between chains; bridging is free if omitted
+            refine_passes (int, optional): Extra passes that re-spread each
+                book's fixed cost over the amount actually routed to it
+        """
+        self.order_book = order_book
+        self.bridge_cost_estimator = bridge_cost_estimator
+        self.refine_passes = refine_passes
+
+    def get_candidate_books(self, taker_order, allowed_chains=None):
+        """
+        Get the books a taker order may be routed to.
+
+        Args:
+            taker_order (Order): Taker order to route
+            allowed_chains (set, optional): Allowed (base_blockchain_id,
+                quote_blockchain_id) pairs; defaults to every chain the
+                taker's assets have an address on
+
+        Returns:
+            list: Candidate OrderBookPairs in the taker's amount mode
+        """
+        books = [
+            book for book in self.order_book.get_equivalent_order_books(
+                taker_order.base_asset.id, taker_order.quote_asset.id
+            )
+            if book.accepts_amount_mode(taker_order)
+        ]
+        if allowed_chains is not None:
+            return [
+                book for book in books
+                if (book.base_blockchain.id, book.quote_blockchain.id) in allowed_chains
+            ]
+
+        base_chains = taker_order.base_asset.addresses
+        quote_chains = taker_order.quote_asset.addresses
+        return [
+            book for book in books
+            if ((book.base_blockchain.id in base_chains or
+                 book.base_blockchain is taker_order.base_blockchain) and
+                (book.quote_blockchain.id in quote_chains or
+                 book.quote_blockchain is taker_order.quote_blockchain))
+        ]
+
+    def estimate_book_cost(self, taker_order, book, gas_fees):
+        """
+        Estimate the fixed cost of routing any part of a taker to a book.
+
+        Args:
+            taker_order (Order): Taker order being routed
+            book (OrderBookPair): Candidate book
+            gas_fees (dict): Per-chain FILL_ORDER fee memo for this route
+
+        Returns:
+            float: Gas plus bridging cost
+        """
+        chains = {
+            taker_order.base_blockchain, taker_order.quote_blockchain,
+            book.base_blockchain, book.quote_blockchain
+        }
+        cost = 0
+        for blockchain in chains:
+            gas_fee = gas_fees.get(blockchain.id)
+            if gas_fee is None:
+                gas_fee = gas_fees[blockchain.id] = blockchain.estimate_gas_fee("FILL_ORDER")
+            cost += gas_fee
+
+        if self.bridge_cost_estimator is not None:
+            # Price the legs the fill will actually settle on
+            base_leg, quote_leg = settlement_chains(
+                taker_order, book.base_blockchain, book.quote_blockchain
+            )
+            for (source, dest), asset in ((base_leg, taker_order.base_asset),
+                                          (quote_leg, taker_order.quote_asset)):
+                if source is not dest:
+                    cost += self.bridge_cost_estimator(source, dest, asset)
+        return cost
+
+    def _collect(self, taker_order, book):
+        # Only liquidity that could fill this taker matters, so stop the
+        # lazy walk once the taker amount is covered
+        makers = []
+        total = 0
+        for maker_order in book.iter_matching_orders(taker_order):
+            available = book.reservations.get_available_amount(maker_order)
+            makers.append((maker_order, available))
+            total += available
+            if total >= taker_order.amount:
+                break
+        return makers, total
+
+    def _allocate(self, taker_order, candidates, spread_over):
+        # Merge every book's makers by net price; the heap holds one cursor
+        # per book, so the merge costs O(k log B) for k makers consumed
+        sign = 1 if taker_order.order_type == OrderType.BUY else -1
+        heap = []
+        per_unit_costs = [
+            taker_order.get_unit_price(taker_order.to_quote_amount(cost), spread)
+            for (_, _, cost), spread in zip(candidates, spread_over)
+        ]
+        for index, (book, makers, cost) in enumerate(candidates):
+            if makers:
+                per_unit_cost = per_unit_costs[index]
+                maker_order = makers[0][0]
+                heap.append((sign * maker_order.price + per_unit_cost, maker_order.timestamp, index, 0))
+        heapq.heapify(heap)
+
+        allocations = [[] for _ in candidates]
+        remaining = taker_order.amount
+        while heap and remaining > 0:
+            _, _, index, position = heapq.heappop(heap)
+            book, makers, cost = candidates[index]
+            maker_order, available = makers[position]
+            fill_amount = min(remaining, available)
+            allocations[index].append((maker_order, fill_amount))
+            remaining -= fill_amount
+
+            if position + 1 < len(makers):
+                next_order = makers[position + 1][0]
+                heapq.heappush(heap, (
+                    sign * next_order.price + per_unit_costs[index], next_order.timestamp, index, position + 1
+                ))
+        return allocations
+
+    @staticmethod
+    def _total_cost(taker_order, candidates, allocations):
+        # Quote paid (or, for sells, minus quote received) plus fixed costs
+        sign = 1 if taker_order.order_type == OrderType.BUY else -1
+        total = 0
+        for (_, _, cost), allocation in zip(candidates, allocations):
+            if allocation:
+                total += taker_order.to_quote_amount(cost) + sign * sum(
+                    order.get_quote_amount(amount) for order, amount in allocation
+                )
+        return total
+
+    def route(self, taker_order, allowed_chains=None):
+        """
+        Split a taker order into one match per book.
+
+        Args:
+            taker_order (Order): Taker order to route
+            allowed_chains (set, optional): Allowed (base_blockchain_id,
+                quote_blockchain_id) pairs
+
+        Returns:
+            list: OrderMatch objects, one per book that receives a fill
+        """
+        gas_fees = {}
+        candidates = []
+        for book in self.get_candidate_books(taker_order, allowed_chains):
+            makers, total = self._collect(taker_order, book)
+            if makers:
+                cost = self.estimate_book_cost(taker_order, book, gas_fees)
+                candidates.append((book, makers, cost, total))
+        if not candidates:
+            return []
+
+        # First assume each book could take as much of the taker as it holds,
+        # then re-spread fixed costs over what each book was actually given
+        # and keep whichever allocation is cheapest overall
+        spread_over = [min(total, taker_order.amount) for _, _, _, total in candidates]
+        candidates = [(book, makers, cost) for book, makers, cost, _ in candidates]
+        allocations = best_allocations = self._allocate(taker_order, candidates, spread_over)
+        best_cost = self._total_cost(taker_order, candidates, allocations)
+        for _ in range(self.refine_passes):
+            spread_over = [
+                sum(amount for _, amount in allocation) or previous
+                for allocation, previous in zip(allocations, spread_over)
+            ]
+            allocations = self._allocate(taker_order, candidates, spread_over)
+            total_cost = self._total_cost(taker_order, candidates, allocations)
+            if total_cost < best_cost:
+                best_allocations, best_cost = allocations, total_cost
+
+        timestamp = int(datetime.now().timestamp() * 1000)
+        matches = []
+        for (book, _, _), allocation in zip(candidates, best_allocations):
+            if not allocation:
+                continue
+            match = OrderMatch(
+                f"match_{timestamp}_{taker_order.id}_{len(matches)}", taker_order
+            )
+            for maker_order, fill_amount in allocation:
+                match.add_maker_order(maker_order, fill_amount)
+            matches.append(match)
+        return matches
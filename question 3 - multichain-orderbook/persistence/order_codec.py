@@ -0,0 +1,342 @@
+import struct
+from operator import attrgetter
+from models.order import Order, OrderType, OrderStatus
+from orderbook.pair_key import PairKey
+
+# Enum members are stored as their index in declaration order
+ORDER_TYPES = list(OrderType)
+ORDER_STATUSES = list(OrderStatus)
+_ORDER_TYPE_CODES = {member: code for code, member in enumerate(ORDER_TYPES)}
+_ORDER_STATUS_CODES = {member: code for code, member in enumerate(ORDER_STATUSES)}
+
+# id length, maker length, order_type, status, amount, price, timestamp,
+# filled_amount, expiration_time; followed by the id and maker bytes.
+# Fixed-point orders set a flag in the order_type byte and append their
+# amount, price and filled_amount as exact integers. Integer order IDs set
+# another flag and are stored in decimal.
+_ORDER_FIELDS = struct.Struct("<HHBBddddd")
+_FIXED_POINT_FLAG = 0x80
+_INT_ID_FLAG = 0x40
+_STR_LENGTH = struct.Struct("<H")
+_ID_TYPE = struct.Struct("<B")
+_INT_LENGTH = struct.Struct("<B")
+_FLOAT = struct.Struct("<d")
+
+
+def pack_str(value):
+    """
+    Encode a string with a 2-byte length prefix.
+
+    Args:
+        value (str): String to encode
+
+    Returns:
+        bytes: Encoded string
+    """
+    data = str(value).encode()
+    return _STR_LENGTH.pack(len(data)) + data
+
+
+def unpack_str(buffer, offset):
+    """
+    Decode a string written by pack_str.
+
+    Args:
+        buffer (bytes): Source buffer
+        offset (int): Position of the length prefix
+
+    Returns:
+        tuple: (string, offset after the string)
+    """
+    (length,) = _STR_LENGTH.unpack_from(buffer, offset)
+    offset += _STR_LENGTH.size
+    return buffer[offset:offset + length].decode(), offset + length
+
+
+def _order_id_bytes(order_id):
+    # bool is an int subclass but would not survive the round trip
+    if isinstance(order_id, int) and not isinstance(order_id, bool):
+        return str(order_id).encode(), True
+    if isinstance(order_id, str):
+        return order_id.encode(), False
+    raise TypeError(f"Order IDs must be str or int, not {type(order_id).__name__}")
+
+
+def pack_order_id(order_id):
+    """
+    Encode an order ID, keeping whether it was a str or an int.
+
+    Args:
+        order_id (str | int): ID to encode
+
+    Returns:
+        bytes: Encoded ID
+
+    Raises:
+        TypeError: If the ID is neither a str nor an int
+    """
+    data, is_int = _order_id_bytes(order_id)
+    return _ID_TYPE.pack(is_int) + _STR_LENGTH.pack(len(data)) + data
+
+
+def unpack_order_id(buffer, offset):
+    """
+    Decode an order ID written by pack_order_id.
+
+    Args:
+        buffer (bytes): Source buffer
+        offset (int): Position of the encoded ID
+
+    Returns:
+        tuple: (order ID, offset after the ID)
+    """
+    (is_int,) = _ID_TYPE.unpack_from(buffer, offset)
+    order_id, offset = unpack_str(buffer, offset + _ID_TYPE.size)
+    return (int(order_id) if is_int else order_id), offset
+
+
+def pack_float(value):
+    """
+    Encode a float as 8 bytes.
+
+    Args:
+        value (float): Value to encode
+
+    Returns:
+        bytes: Encoded value
+    """
+    return _FLOAT.pack(value)
+
+
+def unpack_float(buffer, offset):
+    """
+    Decode a float written by pack_float.
+
+    Args:
+        buffer (bytes): Source buffer
+        offset (int): Position of the value
+
+    Returns:
+        tuple: (value, offset after the value)
+    """
+    return _FLOAT.unpack_from(buffer, offset)[0], offset + _FLOAT.size
+
+
+def pack_int(value):
+    """
+    Encode an arbitrary-size integer with a 1-byte length prefix.
+
+    Args:
+        value (int): Value to encode
+
+    Returns:
+        bytes: Encoded value
+    """
+    data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+    return _INT_LENGTH.pack(len(data)) + data
+
+
+def unpack_int(buffer, offset):
+    """
+    Decode an integer written by pack_int.
+
+    Args:
+        buffer (bytes): Source buffer
+        offset (int): Position of the length prefix
+
+    Returns:
+        tuple: (value, offset after the value)
+    """
+    (length,) = _INT_LENGTH.unpack_from(buffer, offset)
+    offset += _INT_LENGTH.size
+    return int.from_bytes(buffer[offset:offset + length], "little", signed=True), offset + length
+
+
+def pack_amount(order, value):
+    """
+    Encode an amount in an order's amount mode.
+
+    Args:
+        order (Order): Order the amount belongs to
+        value (float): Amount to encode
+
+    Returns:
+        bytes: Encoded amount
+    """
+    return pack_int(value) if order.fixed_point else pack_float(value)
+
+
+def unpack_amount(order, buffer, offset):
+    """
+    Decode an amount written by pack_amount.
+
+    Args:
+        order (Order): Order the amount belongs to
+        buffer (bytes): Source buffer
+        offset (int): Position of the amount
+
+    Returns:
+        tuple: (amount, offset after the amount)
+    """
+    if order.fixed_point:
+        return unpack_int(buffer, offset)
+    return unpack_float(buffer, offset)
+
+
+def encode_pair_key(pair_key):
+    """
+    Encode a trading pair key.
+
+    Args:
+        pair_key (PairKey): Key to encode
+
+    Returns:
+        bytes: Encoded key
+    """
+    return b"".join(pack_str(part) for part in pair_key)
+
+
+def decode_pair_key(buffer, offset):
+    """
+    Decode a trading pair key written by encode_pair_key.
+
+    Args:
+        buffer (bytes): Source buffer
+        offset (int): Position of the key
+
+    Returns:
+        tuple: (PairKey, offset after the key)
+    """
+    parts = []
+    for _ in range(4):
+        part, offset = unpack_str(buffer, offset)
+        parts.append(part)
+    return PairKey(*parts), offset
+
+
+# Copies the fields encode_order_state needs from an order, as a tuple that
+# can be encoded on another thread while the order keeps changing
+capture_order = attrgetter(
+    "id", "maker", "order_type", "status", "amount", "price",
+    "timestamp", "filled_amount", "expiration_time", "fixed_point"
+)
+
+
+def encode_order(order):
+    """
+    Encode an order's own fields, without its trading pair.
+
+    Args:
+        order (Order): Order to encode
+
+    Returns:
+        bytes: Encoded order
+
+    Raises:
+        TypeError: If the order ID is neither a str nor an int
+    """
+    return encode_order_state(capture_order(order))
+
+
+def encode_order_state(state):
+    """
+    Encode order fields captured by capture_order.
+
+    Args:
+        state (tuple): Captured order fields
+
+    Returns:
+        bytes: Encoded order, as encode_order writes it
+
+    Raises:
+        TypeError: If the order ID is neither a str nor an int
+    """
+    (order_id, maker, order_type, status, amount, price, timestamp, filled_amount,
+     expiration_time, fixed_point) = state
+    order_id, is_int = _order_id_bytes(order_id)
+    maker = str(maker).encode()
+    flags = _INT_ID_FLAG if is_int else 0
+    if fixed_point:
+        return b"".join((
+            _ORDER_FIELDS.pack(
+                len(order_id),
+                len(maker),
+                _ORDER_TYPE_CODES[order_type] | flags | _FIXED_POINT_FLAG,
+                _ORDER_STATUS_CODES[status],
+                0, 0,
+                timestamp,
+                0,
+                expiration_time
+            ),
+            order_id,
+            maker,
+            pack_int(amount),
+            pack_int(price),
+            pack_int(filled_amount)
+        ))
+    return b"".join((
+        _ORDER_FIELDS.pack(
+            len(order_id),
+            len(maker),
+            _ORDER_TYPE_CODES[order_type] | flags,
+            _ORDER_STATUS_CODES[status],
+            amount,
+            price,
+            timestamp,
+            filled_amount,
+            expiration_time
+        ),
+        order_id,
+        maker
+    ))
+
+
+def decode_order(buffer, offset, order_book):
+    """
+    Decode an order written by encode_order into an order book.
+
+    Args:
+        buffer (bytes): Source buffer
+        offset (int): Position of the encoded order
+        order_book (OrderBookPair): Book whose assets and blockchains the
+            order trades
+
+    Returns:
+        tuple: (Order, offset after the order)
+    """
+    (id_length, maker_length, order_type, status, amount, price, timestamp,
+     filled_amount, expiration_time) = _ORDER_FIELDS.unpack_from(buffer, offset)
+    offset += _ORDER_FIELDS.size
+    order_id = buffer[offset:offset + id_length].decode()
+    offset += id_length
+    maker = buffer[offset:offset + maker_length].decode()
+    offset += maker_length
+
+    if order_type & _INT_ID_FLAG:
+        order_id = int(order_id)
+    fixed_point = bool(order_type & _FIXED_POINT_FLAG)
+    order_type &= ~(_FIXED_POINT_FLAG | _INT_ID_FLAG)
+    if fixed_point:
+        amount, offset = unpack_int(buffer, offset)
+        price, offset = unpack_int(buffer, offset)
+        filled_amount, offset = unpack_int(buffer, offset)
+
+    # Restore the slots directly: the order was validated when it was first
+    # created, and the constructor would overwrite its original timestamp
+    order = Order.__new__(Order)
+    order.id = order_id
+    order.maker = maker
+    order.order_type = ORDER_TYPES[order_type]
+    order.base_asset = order_book.base_asset
+    order.quote_asset = order_book.quote_asset
+    order.base_blockchain = order_book.base_blockchain
+    order.quote_blockchain = order_book.quote_blockchain
+    order.amount = amount
+    order.price = price
+    order.timestamp = timestamp
+    order.status = ORDER_STATUSES[status]
+    order.filled_amount = filled_amount
+    order.expiration_time = expiration_time
+    order.pair_key = order_book.pair_key
+    order.fixed_point = fixed_point
+    return order, offset
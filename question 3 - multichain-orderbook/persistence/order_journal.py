@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import os
+from models.order import OrderStatus
+from persistence.order_codec import (
+    encode_pair_key, decode_pair_key, encode_order, decode_order,
+    pack_order_id, unpack_order_id, pack_float, unpack_float, pack_amount, unpack_amount
+)
+from persistence.snapshot_store import SnapshotStore
+from persistence.write_ahead_log import WriteAheadLog
+
+# WAL record types
+RECORD_ADD = 1
+RECORD_CANCEL = 2
+RECORD_FILL = 3
+RECORD_REDUCE = 4
+RECORD_REPLACE = 5
+
+class OrderJournal:
+    """
+    Makes order book state durable with a write-ahead log plus snapshots.
+
+    Adds, cancels, amends and fills are appended to the WAL as they happen.
+    Expirations are not logged: replayed orders keep their expiration time
+    and are purged again on the first pass after recovery.
+    """
+
+    def __init__(self, order_book, directory, sync_interval=0.005, snapshot_interval=300.0):
+        """
+        Creates a new order journal.
+
+        Args:
+            order_book (MultiChainOrderBook): Order books to persist
+            directory (str): Directory holding the WAL and snapshots
+            sync_interval (float, optional): Group-commit window in seconds
+            snapshot_interval (float, optional): Seconds between snapshots
+        """
+        self.order_book = order_book
+        self.wal = WriteAheadLog(os.path.join(directory, "wal"), sync_interval)
+        self.snapshots = SnapshotStore(os.path.join(directory, "snapshots"))
+        self.snapshot_interval = snapshot_interval
+        self._task = None
+
+    def record_add(self, order):
+        """
+        Log an order added to its book.
+
+        Args:
+            order (Order): The resting order
+        """
+        self.wal.append(RECORD_ADD, encode_pair_key(order.pair_key) + encode_order(order))
+
+    def record_cancel(self, order):
+        """
+        Log an order removed from its book without being filled.
+
+        Args:
+            order (Order): The removed order
+        """
+        self.wal.append(RECORD_CANCEL, encode_pair_key(order.pair_key) + pack_order_id(order.id))
+
+    def record_reduce(self, order):
+        """
+        Log a resting order reduced in place.
+
+        Args:
+            order (Order): The order, already holding its new amount
+        """
+        self.wal.append(
+            RECORD_REDUCE,
+            encode_pair_key(order.pair_key) + pack_order_id(order.id) + pack_amount(order, order.amount)
+        )
+
+    def record_replace(self, order):
+        """
+        Log a resting order replaced with a new price, amount and priority.
+
+        Args:
+            order (Order): The order, already holding its new values
+        """
+        self.wal.append(
+            RECORD_REPLACE,
+            b"".join((
+                encode_pair_key(order.pair_key),
+                pack_order_id(order.id),
+                pack_amount(order, order.price),
+                pack_amount(order, order.amount),
+                pack_float(order.timestamp),
+            ))
+        )
+
+    def record_fill(self, order, fill_amount):
+        """
+        Log a fill against a resting order.
+
+        Args:
+            order (Order): The maker order
+            fill_amount (float): Amount filled
+        """
+        self.wal.append(
+            RECORD_FILL,
+            encode_pair_key(order.pair_key) + pack_order_id(order.id) + pack_amount(order, fill_amount)
+        )
+
+    async def snapshot(self):
+        """
+        Snapshot every book and drop the WAL segments no kept snapshot needs.
+
+        The orders' fields are copied on the event loop, so the image is
+        consistent with a single LSN; encoding the copy and writing it to
+        disk happen on a worker thread. Segments are only dropped up to the
+        oldest kept snapshot, so recovery can still fall back to it if the
+        newest one turns out to be corrupt.
+
+        Returns:
+            int: LSN covered by the snapshot
+        """
+        lsn = self.wal.last_lsn
+        view = self.snapshots.capture(self.order_book)
+        self.wal.rotate()
+        image = await asyncio.to_thread(self.snapshots.encode, view, lsn)
+        await asyncio.to_thread(self.snapshots.write, image, lsn)
+        # Wait for the rotation to land so the covered segments are closed
+        await asyncio.to_thread(self.wal.flush)
+        oldest_lsn, _ = self.snapshots.list_snapshots()[0]
+        self.wal.purge_segments(oldest_lsn)
+        return lsn
+
+    def recover(self):
+        """
+        Rebuild the order books from the latest snapshot and the WAL tail.
+
+        Returns:
+            int: Number of WAL records replayed
+        """
+        lsn = self.snapshots.load_latest(self.order_book)
+        replayed = 0
+        for _, record_type, payload in self.wal.replay(lsn):
+            self._apply(record_type, payload)
+            replayed += 1
+
+        logging.info(f"Recovered order books from snapshot LSN {lsn} and {replayed} WAL records")
+        return replayed
+
+    def _apply(self, record_type, payload):
+        pair_key, offset = decode_pair_key(payload, 0)
+        pair_book = self.order_book.get_or_create_order_book(*pair_key)
+
+        if record_type == RECORD_ADD:
+            order, _ = decode_order(payload, offset, pair_book)
+            pair_book.add_order(order)
+            return
+
+        order_id, offset = unpack_order_id(payload, offset)
+        order = pair_book.get_order(order_id)
+        if order is None:
+            return
+
+        if record_type == RECORD_CANCEL:
+            pair_book.remove_order(order_id)
+            order.status = OrderStatus.CANCELLED
+        elif record_type == RECORD_FILL:
+            fill_amount, _ = unpack_amount(order, payload, offset)
+            pair_book.apply_fill(order, fill_amount)
+        elif record_type == RECORD_REDUCE:
+            new_amount, _ = unpack_amount(order, payload, offset)
+            pair_book.reduce_order(order_id, new_amount)
+        elif record_type == RECORD_REPLACE:
+            price, offset = unpack_amount(order, payload, offset)
+            amount, offset = unpack_amount(order, payload, offset)
+            timestamp, _ = unpack_float(payload, offset)
+            pair_book.replace_order(order_id, price, amount, timestamp)
+
+    async def run(self):
+        """
+        Take periodic snapshots until cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.snapshot()
+            except Exception as e:
+                logging.error(f"Failed to write snapshot: {e}")
+
+    def start(self):
+        """
+        Start periodic snapshots on the running event loop.
+
+        Returns:
+            asyncio.Task: The background task
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        """
+        Stop periodic snapshots and flush the WAL to disk.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.wal.close)
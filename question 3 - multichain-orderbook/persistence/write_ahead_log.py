@@ -0,0 +1,249 @@
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+# crc32, payload length, record type, lsn
+_HEADER = struct.Struct("<IIBQ")
+_SEGMENT_PREFIX = "wal-"
+_SEGMENT_SUFFIX = ".log"
+_ROTATE = object()  # Buffer marker asking the writer to start a new segment
+
+class WriteAheadLog:
+    """
+    Append-only, segmented binary log with group-commit fsync.
+
+    Appends only copy the record into an in-memory buffer. A background
+    writer thread drains the buffer, writes every pending record and issues
+    one fsync per batch, so callers on the matching loop never wait on disk.
+    Each record is checksummed, and a torn tail left by a crash is cut off
+    when the log is reopened.
+    """
+
+    def __init__(self, directory, sync_interval=0.005):
+        """
+        Opens (or creates) a write-ahead log.
+
+        Args:
+            directory (str): Directory holding the log segments
+            sync_interval (float, optional): Maximum seconds a record waits
+                before its batch is written and fsynced
+        """
+        self.directory = directory
+        self.sync_interval = sync_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self.last_lsn = self._recover_tail()
+        self.durable_lsn = self.last_lsn
+        self._written_lsn = self.last_lsn
+
+        self._buffer = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._writing = False
+        self._file = self._open_segment(self.last_lsn + 1, reuse_last=True)
+        self._writer = threading.Thread(target=self._run_writer, name="wal-writer", daemon=True)
+        self._writer.start()
+
+    def _segment_path(self, first_lsn):
+        return os.path.join(self.directory, f"{_SEGMENT_PREFIX}{first_lsn:020d}{_SEGMENT_SUFFIX}")
+
+    def list_segments(self):
+        """
+        List log segments in LSN order.
+
+        Returns:
+            list: (first_lsn, path) for every segment
+        """
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+                first_lsn = int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+                segments.append((first_lsn, os.path.join(self.directory, name)))
+        segments.sort()
+        return segments
+
+    def _recover_tail(self):
+        segments = self.list_segments()
+        if not segments:
+            return 0
+
+        # Only the newest segment can hold a torn write
+        first_lsn, path = segments[-1]
+        last_lsn = first_lsn - 1
+        valid_size = 0
+        with open(path, "rb") as f:
+            data = f.read()
+        for lsn, _, _, end in self._iter_records(data):
+            last_lsn = lsn
+            valid_size = end
+
+        if valid_size < len(data):
+            logging.warning(f"Truncating {len(data) - valid_size} torn bytes from {path}")
+            with open(path, "r+b") as f:
+                f.truncate(valid_size)
+        return last_lsn
+
+    def _open_segment(self, first_lsn, reuse_last=False):
+        segments = self.list_segments()
+        if reuse_last and segments:
+            return open(segments[-1][1], "ab")
+        return open(self._segment_path(first_lsn), "ab")
+
+    @staticmethod
+    def _iter_records(data):
+        offset = 0
+        size = len(data)
+        while offset + _HEADER.size <= size:
+            crc, length, record_type, lsn = _HEADER.unpack_from(data, offset)
+            start = offset + _HEADER.size
+            end = start + length
+            if end > size:
+                return
+            payload = data[start:end]
+            if zlib.crc32(payload, zlib.crc32(data[offset + 4:start])) != crc:
+                return
+            yield lsn, record_type, payload, end
+            offset = end
+
+    def append(self, record_type, payload):
+        """
+        Queue a record for writing without waiting for the disk.
+
+        Args:
+            record_type (int): Record type code (0-255)
+            payload (bytes): Record body
+
+        Returns:
+            int: Log sequence number assigned to the record
+        """
+        with self._condition:
+            if self._closed:
+                raise ValueError("Write-ahead log is closed")
+            self.last_lsn += 1
+            lsn = self.last_lsn
+            header_tail = _HEADER.pack(0, len(payload), record_type, lsn)[4:]
+            crc = zlib.crc32(payload, zlib.crc32(header_tail))
+            self._buffer.append(struct.pack("<I", crc) + header_tail + payload)
+            if len(self._buffer) == 1:
+                self._condition.notify()
+        return lsn
+
+    def rotate(self):
+        """
+        Start a new segment after every record appended so far.
+
+        Older segments can then be removed with purge_segments once a
+        snapshot covers them.
+        """
+        with self._condition:
+            self._buffer.append(_ROTATE)
+            self._condition.notify()
+
+    def _run_writer(self):
+        while True:
+            with self._condition:
+                if not self._buffer and not self._closed:
+                    self._condition.wait()
+                if not self._buffer and self._closed:
+                    return
+            # Let more records join this batch before paying for an fsync
+            if self.sync_interval and not self._closed:
+                time.sleep(self.sync_interval)
+            with self._condition:
+                batch, self._buffer = self._buffer, []
+                target_lsn = self.last_lsn
+                self._writing = True
+
+            self._write_batch(batch)
+            with self._condition:
+                self.durable_lsn = target_lsn
+                self._writing = False
+                self._condition.notify_all()
+
+    def _write_batch(self, batch):
+        chunk = []
+        for item in batch:
+            if item is _ROTATE:
+                self._write_chunk(chunk)
+                chunk = []
+                self._file.close()
+                self._file = self._open_segment(self._written_lsn + 1)
+            else:
+                chunk.append(item)
+        self._write_chunk(chunk)
+
+    def _write_chunk(self, chunk):
+        if chunk:
+            self._file.write(b"".join(chunk))
+            self._written_lsn = _HEADER.unpack_from(chunk[-1])[3]
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def flush(self, timeout=None):
+        """
+        Block until every record (and rotation) queued so far is on disk.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait
+
+        Returns:
+            bool: True if all records are durable
+        """
+        with self._condition:
+            self._condition.notify()
+            return self._condition.wait_for(
+                lambda: not self._buffer and not self._writing, timeout
+            )
+
+    def replay(self, after_lsn=0):
+        """
+        Iterate over durable records newer than an LSN.
+
+        Args:
+            after_lsn (int, optional): Skip records up to and including this LSN
+
+        Yields:
+            tuple: (lsn, record_type, payload)
+        """
+        segments = self.list_segments()
+        for index, (first_lsn, path) in enumerate(segments):
+            # Skip whole segments that end before the requested LSN
+            if index + 1 < len(segments) and segments[index + 1][0] <= after_lsn + 1:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            for lsn, record_type, payload, _ in self._iter_records(data):
+                if lsn > after_lsn:
+                    yield lsn, record_type, payload
+
+    def purge_segments(self, upto_lsn):
+        """
+        Delete segments whose records are all at or below an LSN.
+
+        Args:
+            upto_lsn (int): Highest LSN covered elsewhere (e.g. by a snapshot)
+
+        Returns:
+            int: Number of segments deleted
+        """
+        segments = self.list_segments()
+        deleted = 0
+        # The newest segment is always kept open for appends
+        for (_, path), (next_first_lsn, _) in zip(segments, segments[1:]):
+            if next_first_lsn - 1 <= upto_lsn:
+                os.remove(path)
+                deleted += 1
+        return deleted
+
+    def close(self):
+        """
+        Write out pending records, stop the writer and close the log.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join()
+        self._file.close()
@@ -0,0 +1,94 @@
+import asyncio
+from itertools import count
+from benchmarks.order_flow import InstantBridge
+from execution.cross_chain_manager import CrossChainManager
+from models.asset import Asset
+from models.blockchain import Blockchain
+from models.order import Order, OrderStatus, OrderType
+from orderbook.multi_chain_order_book import MultiChainOrderBook
+
+MAKER_ADDRESS = "0x37BD277C66CdD61bD788825B19A40A5FA3400376"
+TAKER_ADDRESS = "0x9EF3Db7CaF7A6ec9f8e6950b62e255B28275dE86"
+
+
+class GatedBridge(InstantBridge):
+    """
+    Holds every lock until the gate opens; locks can be made to fail.
+    """
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.succeed = True
+
+    async def lock_assets(self, source_chain, asset, amount, sender, recipient):
+        await self.gate.wait()
+        return {"success": self.succeed, "txHash": "lock"}
+
+
+class Market:
+    """
+    ETH/USDC trading between two chains with negligible gas, as used by
+    most tests.
+    """
+
+    def __init__(self, fill_optimizer=None):
+        self.ethereum = Blockchain("ethereum", "Ethereum", 15, lambda: 1e-9)
+        self.polygon = Blockchain("polygon", "Polygon", 2, lambda: 1e-9)
+        self.eth = Asset("eth", "ETH", "Ethereum", 18)
+        self.usdc = Asset("usdc", "USDC", "USD Coin", 6)
+        self.order_book = MultiChainOrderBook(fill_optimizer)
+        for blockchain in (self.ethereum, self.polygon):
+            self.order_book.add_blockchain(blockchain)
+        for asset in (self.eth, self.usdc):
+            self.order_book.add_asset(asset)
+        self._ids = count(1)
+        self._clock = count(1)
+
+    def order(self, order_type, amount, price, id=None, base_chain=None, quote_chain=None,
+              maker=MAKER_ADDRESS, **kwargs):
+        """
+        Build an ETH/USDC order with a strictly increasing timestamp.
+        """
+        order = Order(
+            id if id is not None else f"o{next(self._ids)}", maker, order_type,
+            self.eth, self.usdc, base_chain or self.ethereum, quote_chain or self.polygon,
+            amount, price, **kwargs
+        )
+        order.timestamp = next(self._clock)
+        return order
+
+    def sell(self, amount, price, **kwargs):
+        return self.order(OrderType.SELL, amount, price, **kwargs)
+
+    def buy(self, amount, price, **kwargs):
+        return self.order(OrderType.BUY, amount, price, **kwargs)
+
+    def rest(self, *orders):
+        """
+        Activate orders and add them to their book, as a submitted maker
+        order would be.
+        """
+        for order in orders:
+            order.status = OrderStatus.ACTIVE
+            self.book(order.base_blockchain, order.quote_blockchain).add_order(order)
+        return orders[0] if len(orders) == 1 else orders
+
+    def manager(self, bridge=None, **kwargs):
+        """
+        Build a CrossChainManager over this market, with one bridge
+        (an InstantBridge by default) between every pair of chains.
+        """
+        manager = CrossChainManager(self.order_book, **kwargs)
+        bridge = bridge or InstantBridge()
+        for source in (self.ethereum, self.polygon):
+            for dest in (self.ethereum, self.polygon):
+                manager.register_bridge(source.id, dest.id, bridge)
+        return manager
+
+    def book(self, base_chain=None, quote_chain=None):
+        """
+        Get (creating if needed) the ETH/USDC book on the given chains.
+        """
+        return self.order_book.get_or_create_order_book(
+            "eth", "usdc", (base_chain or self.ethereum).id, (quote_chain or self.polygon).id
+        )
@@ -0,0 +1,88 @@
+import json
+import unittest
+from benchmarks.matching_engine import percentile, run_benchmark
+from benchmarks.order_flow import OrderFlowGenerator, MAKER, TAKER, CANCEL
+from orderbook.pair_key import PairKey
+
+
+def describe(events):
+    # Orders are fresh objects on every run, so compare their fields
+    return [
+        (kind, payload) if kind == CANCEL else
+        (kind, payload.id, payload.order_type, payload.price, payload.amount,
+         PairKey.for_order(payload))
+        for kind, payload in events
+    ]
+
+
+class OrderFlowGeneratorTest(unittest.TestCase):
+
+    def test_equal_seeds_give_equal_flow(self):
+        first = describe(OrderFlowGenerator(seed=3).events(2000))
+        self.assertEqual(describe(OrderFlowGenerator(seed=3).events(2000)), first)
+        self.assertNotEqual(describe(OrderFlowGenerator(seed=4).events(2000)), first)
+
+    def test_mix_follows_the_ratios(self):
+        generator = OrderFlowGenerator(seed=1, cancel_ratio=0.25, taker_ratio=0.25)
+        kinds = [kind for kind, _ in generator.events(20000)]
+        self.assertAlmostEqual(kinds.count(TAKER) / len(kinds), 0.25, delta=0.02)
+        self.assertAlmostEqual(kinds.count(CANCEL) / len(kinds), 0.25, delta=0.02)
+        self.assertAlmostEqual(kinds.count(MAKER) / len(kinds), 0.5, delta=0.02)
+
+    def test_cancels_target_resting_makers_once(self):
+        generator = OrderFlowGenerator(seed=2, cancel_ratio=0.4)
+        makers, cancelled = set(), []
+        for kind, payload in generator.events(5000):
+            if kind == MAKER:
+                makers.add(payload.id)
+            elif kind == CANCEL:
+                self.assertIn(payload, makers)
+                cancelled.append(payload)
+        self.assertEqual(len(cancelled), len(set(cancelled)))
+
+    def test_makers_rest_on_their_own_side_of_the_mid(self):
+        generator = OrderFlowGenerator(seed=5, num_pairs=1, volatility=0, cancel_ratio=0,
+                                       taker_ratio=0.5)
+        mid = generator.pairs[0][4]
+        for kind, order in generator.events(2000):
+            buying = order.order_type.value == "BUY"
+            if kind == MAKER:
+                self.assertTrue(order.price < mid if buying else order.price > mid)
+            else:
+                self.assertTrue(order.price > mid if buying else order.price < mid)
+
+    def test_fixed_point_flow_uses_integer_amounts(self):
+        generator = OrderFlowGenerator(seed=6, fixed_point=True)
+        for kind, order in generator.events(200):
+            if kind != CANCEL:
+                self.assertTrue(order.fixed_point)
+                self.assertIsInstance(order.amount, int)
+                self.assertIsInstance(order.price, int)
+
+
+class MatchingEngineBenchmarkTest(unittest.IsolatedAsyncioTestCase):
+
+    def test_percentile_uses_the_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 51)
+        self.assertEqual(percentile(values, 0.999), 100)
+        self.assertIsNone(percentile([], 0.5))
+
+    async def test_result_is_reproducible_json(self):
+        # Expiry depends on the wall clock, so leave it out of the flow
+        first = await run_benchmark(OrderFlowGenerator(seed=9, expiry_ratio=0), 3000)
+        second = await run_benchmark(OrderFlowGenerator(seed=9, expiry_ratio=0), 3000)
+        counts = ("inserts", "cancels", "takers", "takers_filled", "resting_orders")
+        self.assertEqual({key: first[key] for key in counts}, {key: second[key] for key in counts})
+
+        self.assertEqual(first["expired"], 0)
+        self.assertLessEqual(first["inserts"] + first["takers"] + first["cancels"], 3000)
+        self.assertGreater(first["takers_filled"], 0)
+        latency = first["taker_latency_us"]
+        self.assertLessEqual(latency["p50"], latency["p99"])
+        self.assertLessEqual(latency["p99"], latency["p999"])
+        json.dumps(first)
+
+
+if __name__ == "__main__":
+    unittest.main()
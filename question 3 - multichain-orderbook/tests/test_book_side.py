@@ -0,0 +1,83 @@
+import unittest
+from orderbook.book_side import BookSide
+from tests.fixtures import Market
+
+
+class BookSideTest(unittest.TestCase):
+
+    def test_levels_walk_from_the_best_price(self):
+        bids, asks = BookSide(is_bid=True), BookSide(is_bid=False)
+        for price in (101, 99, 100, 103):
+            bids.get_or_create_level(price)
+            asks.get_or_create_level(price)
+
+        self.assertEqual([level.price for level in bids.levels()], [103, 101, 100, 99])
+        self.assertEqual([level.price for level in asks.levels()], [99, 100, 101, 103])
+        self.assertEqual((bids.best_price(), asks.best_price()), (103, 99))
+
+    def test_existing_level_is_reused(self):
+        side = BookSide(is_bid=True)
+        level = side.get_or_create_level(100)
+        self.assertIs(side.get_or_create_level(100), level)
+        self.assertEqual(len(side), 1)
+
+    def test_levels_can_be_dropped_while_walking(self):
+        side = BookSide(is_bid=False)
+        for price in (1, 2, 3, 4):
+            side.get_or_create_level(price)
+
+        seen = []
+        for level in side.levels():
+            seen.append(level.price)
+            side.remove_level(level)
+            if level.price == 1:
+                side.remove_level(side.get_level(3))
+        self.assertEqual(seen, [1, 2, 4])
+        self.assertIsNone(side.best_level())
+
+
+class PriceLevelBookTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+
+    def test_orders_keep_price_then_time_priority(self):
+        first = self.market.sell(1.0, 2001.0)
+        second = self.market.sell(1.0, 2000.0)
+        third = self.market.sell(1.0, 2001.0)
+        buy = self.market.buy(1.0, 1990.0)
+        for order in (first, second, third, buy):
+            self.book.add_order(order)
+
+        self.assertEqual(self.book.sell_orders, [second, first, third])
+        self.assertEqual(self.book.buy_orders, [buy])
+        self.assertEqual((self.book.get_best_bid(), self.book.get_best_ask()), (1990.0, 2000.0))
+
+    def test_older_timestamp_is_queued_by_time_priority(self):
+        late = self.market.sell(1.0, 2000.0)
+        early = self.market.sell(1.0, 2000.0)
+        early.timestamp = late.timestamp - 1
+        self.book.add_order(late)
+        self.book.add_order(early)
+        self.assertEqual(self.book.sell_orders, [early, late])
+
+    def test_removing_the_last_order_drops_its_level(self):
+        order = self.market.sell(1.0, 2000.0)
+        other = self.market.sell(2.0, 2010.0)
+        self.book.add_order(order)
+        self.book.add_order(other)
+
+        self.assertTrue(self.book.remove_order(order.id))
+        self.assertFalse(self.book.remove_order(order.id))
+        self.assertEqual(len(self.book.asks), 1)
+        self.assertEqual(self.book.get_best_ask(), 2010.0)
+        self.assertEqual(self.book.get_depth()["asks"], [(2010.0, 2.0)])
+
+    def test_order_for_another_pair_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.book.add_order(self.market.sell(1.0, 2000.0, quote_chain=self.market.ethereum))
+
+
+if __name__ == "__main__":
+    unittest.main()
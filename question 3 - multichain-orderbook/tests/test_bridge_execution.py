@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+from models.order import OrderStatus
+from tests.fixtures import Market, MAKER_ADDRESS, TAKER_ADDRESS
+
+
+class RecordingBridge:
+    """
+    Bridge stand-in whose calls take a while, recording what ran and how
+    many calls were in flight at once.
+    """
+
+    def __init__(self, delay=0.01, fail=None):
+        self.delay = delay
+        self.fail = fail  # (step, call number) that reports failure
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self, step, *args):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.calls.append((step,) + args)
+        number = sum(1 for call in self.calls if call[0] == step)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return {"success": self.fail != (step, number), "txHash": f"{step}{number}", "proof": {}}
+
+    async def lock_assets(self, source_chain, asset, amount, sender, recipient):
+        return await self._call("lock", source_chain.id, asset.id, amount, sender, recipient)
+
+    async def generate_proof(self, source_chain, tx_hash, confirmations):
+        return await self._call("proof", source_chain.id, tx_hash)
+
+    async def release_assets(self, dest_chain, asset, amount, recipient, proof):
+        return await self._call("release", dest_chain.id, asset.id, amount, recipient)
+
+    async def unlock_assets(self, source_chain, asset, amount, sender, tx_hash):
+        return await self._call("unlock", source_chain.id, tx_hash)
+
+    def steps(self, step):
+        return [call[1:] for call in self.calls if call[0] == step]
+
+
+class BridgeExecutionTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.makers = self.market.rest(
+            self.market.sell(1.0, 2000.0), self.market.sell(1.0, 2001.0),
+            self.market.sell(1.0, 2002.0),
+        )
+
+    def run_taker(self, bridge, **kwargs):
+        manager = self.market.manager(bridge, **kwargs)
+        return manager.process_taker_order(self.market.buy(3.0, 2005.0, maker=TAKER_ADDRESS))
+
+    async def test_legs_move_each_asset_between_the_right_parties(self):
+        bridge = RecordingBridge(delay=0)
+        self.assertTrue(await self.run_taker(bridge))
+
+        ethereum, polygon = self.market.ethereum.id, self.market.polygon.id
+        locks = bridge.steps("lock")
+        self.assertIn((ethereum, "eth", 1.0, MAKER_ADDRESS, TAKER_ADDRESS), locks)
+        self.assertIn((polygon, "usdc", 2001.0, TAKER_ADDRESS, MAKER_ADDRESS), locks)
+        self.assertEqual(len(locks), 6)
+        self.assertEqual(sorted(release[0] for release in bridge.steps("release")),
+                         [ethereum] * 3 + [polygon] * 3)
+        for maker in self.makers:
+            self.assertEqual(maker.status, OrderStatus.FILLED)
+
+    async def test_legs_lock_and_prove_concurrently(self):
+        bridge = RecordingBridge(delay=0.05)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.assertTrue(await self.run_taker(bridge))
+
+        self.assertEqual(bridge.max_in_flight, 6)
+        # Three sequential stages, not three per leg
+        self.assertLess(loop.time() - started, 0.5)
+        # No release starts before every lock is proven
+        steps = [call[0] for call in bridge.calls]
+        self.assertEqual(steps.index("release"), 12)
+
+    async def test_calls_per_bridge_are_bounded(self):
+        bridge = RecordingBridge()
+        self.assertTrue(await self.run_taker(bridge, bridge_concurrency=2))
+        self.assertEqual(bridge.max_in_flight, 2)
+
+    async def test_failed_proof_unlocks_every_locked_leg(self):
+        bridge = RecordingBridge(fail=("proof", 4))
+        self.assertFalse(await self.run_taker(bridge))
+
+        self.assertEqual(bridge.steps("release"), [])
+        locks = {f"lock{number}" for number in range(1, 7)}
+        self.assertEqual({unlock[1] for unlock in bridge.steps("unlock")}, locks)
+        # The makers' liquidity is back in the book, unfilled
+        book = self.market.book()
+        for maker in self.makers:
+            self.assertEqual(maker.filled_amount, 0)
+            self.assertEqual(book.reservations.get_available_amount(maker), 1.0)
+
+    async def test_failed_lock_unlocks_only_the_other_locks(self):
+        bridge = RecordingBridge(fail=("lock", 2))
+        self.assertFalse(await self.run_taker(bridge))
+
+        self.assertEqual(len(bridge.steps("unlock")), 5)
+        self.assertNotIn("lock2", [unlock[1] for unlock in bridge.steps("unlock")])
+        self.assertEqual(bridge.steps("release"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
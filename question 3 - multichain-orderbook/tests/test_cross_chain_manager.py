@@ -0,0 +1,106 @@
+import unittest
+from benchmarks.order_flow import OrderFlowGenerator, InstantBridge, MAKER, TAKER, CANCEL
+from execution.cross_chain_manager import CrossChainManager
+from orderbook.multi_chain_order_book import MultiChainOrderBook
+
+
+class RefusingBridge(InstantBridge):
+    """
+    Settles instantly, except that locks sent by some addresses fail.
+    """
+
+    def __init__(self, refused_senders):
+        self.refused_senders = refused_senders
+
+    async def lock_assets(self, source_chain, asset, amount, sender, recipient):
+        if sender in self.refused_senders:
+            return {"success": False}
+        return await super().lock_assets(source_chain, asset, amount, sender, recipient)
+
+
+class BatchTakerTest(unittest.IsolatedAsyncioTestCase):
+    """
+    process_taker_orders against the same flow taken one order at a time.
+
+    Fixed-point amounts keep the comparison exact: float fills may be
+    summed in a different order and differ in the last bit.
+    """
+
+    def replay(self, refused_senders=frozenset()):
+        generator = OrderFlowGenerator(
+            seed=7, num_pairs=3, taker_ratio=0.0, expiry_ratio=0.0, fixed_point=True
+        )
+        order_book = MultiChainOrderBook()
+        for blockchain in generator.blockchains:
+            order_book.add_blockchain(blockchain)
+        for asset in generator.assets:
+            order_book.add_asset(asset)
+        manager = CrossChainManager(order_book)
+        bridge = RefusingBridge(refused_senders)
+        for source in generator.blockchains:
+            for dest in generator.blockchains:
+                manager.register_bridge(source.id, dest.id, bridge)
+        return generator, manager
+
+    async def build(self, refused_senders=frozenset()):
+        generator, manager = self.replay(refused_senders)
+        makers = []
+        for kind, payload in generator.events(600):
+            if kind == MAKER:
+                await manager.submit_maker_order(payload)
+                makers.append(payload)
+            elif kind == CANCEL:
+                manager.cancel_order(payload)
+        # Takers of every size, on both sides, crossing a few ticks deep
+        generator.taker_ratio, generator.cancel_ratio = 1.0, 0.0
+        takers = [payload for kind, payload in generator.events(120) if kind == TAKER]
+        return manager, makers, takers
+
+    @staticmethod
+    def state(manager, makers, takers, results):
+        return (
+            results,
+            [(order.status, order.filled_amount) for order in takers],
+            [(order.status, order.filled_amount) for order in makers],
+            {key: book.get_depth() for key, book in manager.order_book.order_books.items()},
+        )
+
+    async def compare(self, refused_senders=frozenset()):
+        manager, makers, takers = await self.build(refused_senders)
+        results = [await manager.process_taker_order(order) for order in takers]
+        sequential = self.state(manager, makers, takers, results)
+
+        manager, makers, takers = await self.build(refused_senders)
+        results = await manager.process_taker_orders(takers)
+        batch = self.state(manager, makers, takers, results)
+        return sequential, batch
+
+    async def test_batch_matches_sequential_processing(self):
+        sequential, batch = await self.compare()
+        self.assertEqual(batch, sequential)
+        self.assertTrue(any(sequential[0]))
+        self.assertFalse(all(sequential[0]))
+
+    async def test_batch_rematches_after_a_failed_settlement(self):
+        _, _, takers = await self.build()
+        refused = {order.maker for order in takers[::9]}
+        sequential, batch = await self.compare(refused)
+        self.assertEqual(batch, sequential)
+
+    async def test_each_maker_is_walked_once_per_batch(self):
+        manager, _, takers = await self.build()
+        visits = []
+        for book in manager.order_book.order_books.values():
+            walk = book._iter_available
+            def counting(side, walk=walk):
+                for item in walk(side):
+                    visits.append(item[1].id)
+                    yield item
+            book._iter_available = counting
+
+        await manager.process_taker_orders(takers)
+        self.assertEqual(len(visits), len(set(visits)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from tests.fixtures import Market
+
+
+def drain(queue):
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+def rebuild(messages):
+    # Apply a snapshot and its deltas the way a subscriber would
+    snapshot, deltas = messages[0], messages[1:]
+    sequence = snapshot["sequence"]
+    levels = {"BUY": dict(snapshot["bids"]), "SELL": dict(snapshot["asks"])}
+    for delta in deltas:
+        sequence += 1
+        assert delta["sequence"] == sequence, "gap in the delta stream"
+        if delta["amount"]:
+            levels[delta["side"]][delta["price"]] = delta["amount"]
+        else:
+            levels[delta["side"]].pop(delta["price"], None)
+    return {
+        "bids": sorted(levels["BUY"].items(), reverse=True),
+        "asks": sorted(levels["SELL"].items()),
+    }
+
+
+class DepthTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+
+    def test_depth_follows_every_book_change(self):
+        first, second, third = self.market.rest(
+            self.market.sell(1.0, 2001.0), self.market.sell(2.0, 2001.0),
+            self.market.sell(1.5, 2003.0),
+        )
+        self.market.rest(self.market.buy(4.0, 1999.0))
+        self.assertEqual(self.book.get_depth(), {
+            "bids": [(1999.0, 4.0)], "asks": [(2001.0, 3.0), (2003.0, 1.5)],
+        })
+
+        self.book.apply_fill(first, 0.25)
+        self.book.reduce_order(second.id, 1.5)
+        self.book.replace_order(third.id, price=2002.0)
+        self.assertEqual(self.book.get_depth()["asks"], [(2001.0, 2.25), (2002.0, 1.5)])
+
+        self.book.apply_fill(first, 0.75)
+        self.book.remove_order(second.id)
+        self.assertEqual(self.book.get_depth()["asks"], [(2002.0, 1.5)])
+
+    def test_top_levels_only(self):
+        for tick in range(10):
+            self.market.rest(self.market.sell(1.0, 2000.0 + tick), self.market.buy(1.0, 1999.0 - tick))
+        depth = self.book.get_depth(levels=2)
+        self.assertEqual(depth["bids"], [(1999.0, 1.0), (1998.0, 1.0)])
+        self.assertEqual(depth["asks"], [(2000.0, 1.0), (2001.0, 1.0)])
+
+
+class DepthFeedTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+
+    async def test_snapshot_plus_deltas_rebuild_the_depth(self):
+        resting = self.market.rest(self.market.sell(1.0, 2001.0))
+        queue = self.book.depth_feed.subscribe()
+
+        other, buy = self.market.rest(self.market.sell(2.0, 2002.0), self.market.buy(1.0, 1999.0))
+        self.book.apply_fill(resting, 1.0)
+        self.book.reduce_order(other.id, 1.0)
+        self.book.replace_order(buy.id, price=1998.0)
+
+        messages = drain(queue)
+        self.assertEqual(messages[0]["type"], "snapshot")
+        self.assertEqual(messages[0]["asks"], [(2001.0, 1.0)])
+        self.assertEqual(rebuild(messages), self.book.get_depth())
+        self.assertIn({"type": "delta", "sequence": messages[0]["sequence"] + 3, "side": "SELL",
+                       "price": 2001.0, "amount": 0}, messages)
+
+    async def test_slow_subscriber_is_resynchronised(self):
+        queue = self.book.depth_feed.subscribe(max_queue_size=3)
+        for tick in range(5):
+            self.market.rest(self.market.sell(1.0, 2000.0 + tick))
+
+        messages = drain(queue)
+        self.assertEqual(messages[0]["type"], "snapshot")
+        self.assertEqual(rebuild(messages), self.book.get_depth())
+
+    async def test_unsubscribed_queue_gets_nothing_more(self):
+        queue = self.book.depth_feed.subscribe()
+        self.book.depth_feed.unsubscribe(queue)
+        self.market.rest(self.market.sell(1.0, 2000.0))
+        self.assertEqual(len(drain(queue)), 1)
+        self.assertFalse(self.book.depth_feed.has_subscribers())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+from datetime import datetime
+from execution.expiry_scheduler import ExpiryScheduler
+from models.order import OrderStatus
+from tests.fixtures import Market
+
+
+class ExpiryHeapTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+
+    def test_orders_are_evicted_in_deadline_order(self):
+        late, lasting, early = self.market.rest(
+            self.market.sell(1.0, 2000.0, expiration_time=3000),
+            self.market.sell(1.0, 2001.0),
+            self.market.sell(1.0, 2002.0, expiration_time=1000),
+        )
+        self.assertEqual(self.book.get_next_expiration(), 1000)
+        self.assertEqual(self.book.purge_expired(now=500), [])
+        self.assertEqual(self.book.purge_expired(now=5000), [early, late])
+
+        self.assertEqual((early.status, late.status), (OrderStatus.CANCELLED, OrderStatus.CANCELLED))
+        self.assertEqual(self.book.sell_orders, [lasting])
+        self.assertEqual(self.book.get_depth()["asks"], [(2001.0, 1.0)])
+        self.assertIsNone(self.book.get_next_expiration())
+
+    def test_stale_entries_are_skipped(self):
+        removed, replaced = self.market.rest(
+            self.market.sell(1.0, 2000.0, expiration_time=1000),
+            self.market.sell(1.0, 2001.0, expiration_time=1000),
+        )
+        self.book.remove_order(removed.id)
+        # Re-added under the same ID with a later deadline: the old entry is stale
+        self.book.remove_order(replaced.id)
+        replaced.expiration_time = 9000
+        self.book.add_order(replaced)
+
+        self.assertEqual(self.book.purge_expired(now=2000), [])
+        self.assertEqual(removed.status, OrderStatus.ACTIVE)
+        self.assertIs(self.book.get_order(replaced.id), replaced)
+        self.assertEqual(self.book.purge_expired(now=10000), [replaced])
+
+    def test_replaced_order_keeps_its_deadline(self):
+        order = self.market.rest(self.market.sell(1.0, 2000.0, expiration_time=1000))
+        self.book.replace_order(order.id, price=2005.0)
+        self.assertEqual(self.book.purge_expired(now=2000), [order])
+
+    def test_stale_entries_do_not_pile_up(self):
+        for _ in range(50):
+            orders = [self.market.rest(self.market.sell(1.0, 2000.0, expiration_time=10**12))
+                      for _ in range(20)]
+            for order in orders:
+                self.book.remove_order(order.id)
+        self.assertLessEqual(len(self.book._expiry_heap), 64 + 1)
+
+    def test_matching_never_sees_expired_orders(self):
+        expired = self.market.rest(self.market.sell(1.0, 2000.0, expiration_time=1))
+        lasting = self.market.rest(self.market.sell(1.0, 2001.0))
+
+        match = self.market.order_book.process_taker_order(self.market.buy(2.0, 2005.0))
+        self.assertEqual([fill.order for fill in match.maker_orders], [lasting])
+        self.assertEqual(expired.status, OrderStatus.CANCELLED)
+        self.assertIsNone(self.book.get_order(expired.id))
+
+
+class ExpirySchedulerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.market = Market()
+        self.scheduler = ExpiryScheduler(self.market.order_book, interval=5.0)
+
+    async def asyncTearDown(self):
+        await self.scheduler.stop()
+
+    async def test_background_task_wakes_for_the_next_deadline(self):
+        evicted = []
+        self.market.order_book.add_expiry_listener(evicted.extend)
+        now = datetime.now().timestamp() * 1000
+        soon = self.market.rest(self.market.sell(1.0, 2000.0, expiration_time=now + 50))
+        # A book with nothing due, which the scheduler must leave alone
+        self.market.rest(self.market.sell(
+            1.0, 2000.0, base_chain=self.market.polygon, quote_chain=self.market.ethereum
+        ))
+        polygon_book = self.market.book(self.market.polygon, self.market.ethereum)
+
+        self.assertLess(self.scheduler.get_sleep_time(), 0.1)
+        self.scheduler.start()
+        await asyncio.sleep(0.3)
+        # Woken by the deadline, well before the 5 s interval
+        self.assertEqual(evicted, [soon])
+        self.assertEqual(soon.status, OrderStatus.CANCELLED)
+        self.assertEqual(polygon_book.get_order_count(), 1)
+        self.assertEqual(self.scheduler.get_sleep_time(), 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from models.fixed_point import from_units, quote_units, to_units
+from models.order import OrderStatus
+from tests.fixtures import Market
+
+ETH = 10**18
+USDC = 10**6
+
+
+class FixedPointTest(unittest.TestCase):
+
+    def test_decimal_amounts_convert_exactly(self):
+        self.assertEqual(to_units(0.1, 18), ETH // 10)
+        self.assertEqual(to_units(2000.5, 6), 2000_500_000)
+        self.assertEqual(from_units(ETH // 10, 18), 0.1)
+
+    def test_finer_than_one_unit_is_truncated(self):
+        self.assertEqual(to_units(1.0000009, 6), USDC)
+        self.assertEqual(to_units(-1.0000009, 6), -USDC)
+
+    def test_quote_amounts_never_round_up(self):
+        # 1 wei at 2000.000001 USDC is far below one USDC unit
+        self.assertEqual(quote_units(1, 2000_000_001, 18), 0)
+        self.assertEqual(quote_units(ETH // 3, 2000 * USDC, 18), 666_666_666)
+
+    def test_cost_per_unit_rounds_up(self):
+        market = Market()
+        order = market.buy(3, 2000 * USDC, fixed_point=True)
+        # 1 USDC unit spread over 3 wei is 333333333333333333.33 per ETH
+        self.assertEqual(order.get_unit_price(1, 3), 333_333_333_333_333_334)
+        self.assertEqual(order.to_quote_amount(0.25), 250_000)
+
+
+class FixedPointBookTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+
+    def test_orders_need_integer_amounts(self):
+        with self.assertRaises(ValueError):
+            self.market.sell(1.5, 2000 * USDC, fixed_point=True)
+
+    def test_book_keeps_one_amount_mode(self):
+        self.market.rest(self.market.sell(ETH, 2000 * USDC, fixed_point=True))
+        with self.assertRaises(ValueError):
+            self.book.add_order(self.market.sell(1.0, 2000.0))
+        with self.assertRaises(ValueError):
+            self.book.find_matching_orders(self.market.buy(1.0, 2000.0))
+
+    def test_tenths_fill_a_maker_without_dust(self):
+        maker = self.market.rest(self.market.sell(ETH, 2000 * USDC, fixed_point=True))
+        for _ in range(10):
+            self.assertTrue(self.book.apply_fill(maker, to_units(0.1, 18)))
+        self.assertEqual(maker.status, OrderStatus.FILLED)
+        self.assertEqual(maker.get_remaining_amount(), 0)
+        self.assertEqual(self.book.get_order_count(), 0)
+
+        # The same fills in floats leave dust that never fills
+        float_market = Market()
+        float_maker = float_market.rest(float_market.sell(1.0, 2000.0))
+        float_book = float_market.book()
+        for _ in range(10):
+            float_book.apply_fill(float_maker, 0.1)
+        self.assertEqual(float_maker.status, OrderStatus.PARTIALLY_FILLED)
+
+    def test_integer_prices_compare_exactly(self):
+        near, far = self.market.rest(
+            self.market.sell(ETH, 2000 * USDC + 1, fixed_point=True),
+            self.market.sell(ETH, 2000 * USDC + 2, fixed_point=True),
+        )
+        taker = self.market.buy(2 * ETH, 2000 * USDC + 1, fixed_point=True)
+        self.assertEqual(self.book.find_matching_orders(taker), [near])
+        self.assertEqual(self.book.get_depth()["asks"], [(2000 * USDC + 1, ETH), (2000 * USDC + 2, ETH)])
+
+
+class FixedPointSettlementTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_settlement_legs_carry_integer_amounts(self):
+        market = Market()
+        manager = market.manager()
+        maker = market.rest(market.sell(ETH, 2000 * USDC, fixed_point=True))
+        taker = market.buy(ETH // 3, 2000 * USDC, fixed_point=True)
+
+        match = manager.match_taker_order(taker)
+        base_leg, quote_leg = manager.build_settlement_legs(match)
+        self.assertEqual((base_leg["amount"], quote_leg["amount"]), (ETH // 3, 666_666_666))
+
+        manager.reserve_match(match)
+        self.assertTrue(await manager.execute_match(match))
+        self.assertEqual(maker.filled_amount, ETH // 3)
+        self.assertEqual(taker.filled_amount, ETH // 3)
+        self.assertEqual(market.book().get_depth()["asks"], [(2000 * USDC, ETH - ETH // 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
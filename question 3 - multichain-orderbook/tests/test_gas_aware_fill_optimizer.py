@@ -0,0 +1,57 @@
+import unittest
+from orderbook.gas_aware_fill_optimizer import GasAwareFillOptimizer
+from tests.fixtures import Market
+
+
+class GasAwareFillOptimizerTest(unittest.TestCase):
+
+    def setup_market(self, leg_cost, **kwargs):
+        self.optimizer = GasAwareFillOptimizer(**kwargs)
+        self.market = Market(self.optimizer)
+        # Each chain's TRANSFER_ASSET fee is half of one maker's leg cost
+        gas_price = leg_cost / 2 / (65000 * 1.1)
+        for blockchain in (self.market.ethereum, self.market.polygon):
+            blockchain.gas_estimator = lambda: gas_price
+        self.book = self.market.book()
+
+    def fills(self, taker):
+        match = self.market.order_book.process_taker_order(taker)
+        return [(fill.order.price, fill.fill_amount) for fill in match.maker_orders]
+
+    def test_one_large_maker_beats_two_when_gas_outweighs_the_price(self):
+        self.setup_market(leg_cost=5.0)
+        self.market.rest(self.market.sell(0.5, 2000.0), self.market.sell(2.0, 2001.0))
+        self.assertAlmostEqual(self.optimizer.estimate_leg_cost(self.book), 5.0)
+
+        # 0.5 cheaper by 1 saves 0.5, a second maker costs 5 more in gas
+        self.assertEqual(self.fills(self.market.buy(2.0, 2005.0)), [(2001.0, 2.0)])
+
+    def test_cheap_gas_keeps_the_best_first_fill(self):
+        self.setup_market(leg_cost=0.1)
+        self.market.rest(self.market.sell(0.5, 2000.0), self.market.sell(2.0, 2001.0))
+        self.assertEqual(self.fills(self.market.buy(2.0, 2005.0)), [(2000.0, 0.5), (2001.0, 1.5)])
+
+    def test_makers_outside_the_tolerance_keep_priority(self):
+        self.setup_market(leg_cost=5.0, price_tolerance=0.0001)
+        self.market.rest(self.market.sell(0.5, 2000.0), self.market.sell(2.0, 2001.0))
+        self.assertEqual(self.fills(self.market.buy(2.0, 2005.0)), [(2000.0, 0.5), (2001.0, 1.5)])
+
+    def test_sell_takers_prefer_fewer_buyers_too(self):
+        self.setup_market(leg_cost=5.0)
+        self.market.rest(self.market.buy(0.5, 2001.0), self.market.buy(2.0, 2000.0))
+        self.assertEqual(self.fills(self.market.sell(2.0, 1995.0)), [(2000.0, 2.0)])
+
+    def test_taker_beyond_the_candidate_window_is_filled_best_first(self):
+        self.setup_market(leg_cost=5.0, max_candidates=8)
+        for tick in range(40):
+            self.market.rest(self.market.sell(0.1, 2000.0 + tick / 100))
+        taker = self.market.buy(2.0, 2005.0)
+
+        self.assertIsNone(self.optimizer.select_fills(taker, self.book))
+        fills = self.fills(taker)
+        self.assertEqual(len(fills), 20)
+        self.assertEqual(fills[0][0], 2000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import unittest
+from execution.gas_oracle import GasOracle
+from models.blockchain import Blockchain
+
+
+class GatedEstimator:
+    """
+    Gas estimator that blocks until released and counts its calls.
+    """
+
+    def __init__(self, gas_price=30):
+        self.gas_price = gas_price
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return self.gas_price
+
+
+class GasOracleTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.oracle = GasOracle(ttl=5.0, clock=lambda: self.now)
+        self.estimator = GatedEstimator()
+        self.chain = Blockchain("ethereum", "Ethereum", 15, self.estimator)
+        self.oracle.register(self.chain)
+
+    async def asyncTearDown(self):
+        self.estimator.release.set()
+        await self.oracle.stop()
+
+    async def test_cached_price_is_served_until_it_goes_stale(self):
+        self.estimator.release.set()
+        self.assertEqual(self.chain.get_gas_price(), 30)
+        self.estimator.gas_price = 40
+        self.now = 4.9
+        self.assertEqual(self.chain.get_gas_price(), 30)
+        self.now = 5.0
+        self.assertEqual(self.chain.get_gas_price(), 40)
+        self.assertEqual(self.estimator.calls, 2)
+
+    async def test_concurrent_refreshes_share_one_call(self):
+        refreshes = [asyncio.ensure_future(self.oracle.refresh(self.chain)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        self.estimator.release.set()
+        self.assertEqual(await asyncio.gather(*refreshes), [30] * 5)
+        self.assertEqual(self.estimator.calls, 1)
+
+    async def test_cancelling_the_first_refresh_does_not_strand_the_others(self):
+        owner = asyncio.ensure_future(self.oracle.refresh(self.chain))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(self.oracle.refresh(self.chain))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        await asyncio.sleep(0)
+
+        self.estimator.release.set()
+        self.assertEqual(await asyncio.wait_for(waiter, 1), 30)
+        self.assertEqual(self.oracle.get_cached_gas_price(self.chain), 30)
+        self.assertEqual(self.estimator.calls, 1)
+
+    async def test_blocking_lookup_joins_a_running_refresh(self):
+        refresh = asyncio.ensure_future(self.oracle.refresh(self.chain))
+        await asyncio.to_thread(self.estimator.started.wait, 1)
+
+        lookup = asyncio.ensure_future(asyncio.to_thread(self.chain.get_gas_price))
+        await asyncio.sleep(0.05)
+        self.estimator.release.set()
+        self.assertEqual(await asyncio.wait_for(lookup, 1), 30)
+        self.assertEqual(await refresh, 30)
+        self.assertEqual(self.estimator.calls, 1)
+
+    async def test_failed_refresh_reaches_every_waiter_and_is_retried(self):
+        def failing():
+            raise RuntimeError("node unavailable")
+        self.chain.gas_estimator = failing
+
+        results = await asyncio.gather(
+            self.oracle.refresh(self.chain), self.oracle.refresh(self.chain),
+            return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+        self.chain.gas_estimator = lambda: 25
+        self.assertEqual(await self.oracle.refresh(self.chain), 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from models.order_match import OrderMatch
+from tests.fixtures import Market
+
+
+class CountingLedger:
+    """
+    Wraps a book's reservation ledger, counting availability lookups.
+    """
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.lookups = 0
+
+    def get_available_amount(self, order):
+        self.lookups += 1
+        return self.ledger.get_available_amount(order)
+
+    def __getattr__(self, name):
+        return getattr(self.ledger, name)
+
+
+class MatchingIteratorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+
+    def deep_book(self, levels):
+        for tick in range(levels):
+            self.market.rest(self.market.sell(1.0, 2000.0 + tick))
+        self.book.reservations = CountingLedger(self.book.reservations)
+
+    def test_makers_are_walked_best_price_first(self):
+        far, near, near_later, too_far = self.market.rest(
+            self.market.sell(1.0, 2002.0), self.market.sell(1.0, 2001.0),
+            self.market.sell(1.0, 2001.0), self.market.sell(1.0, 2010.0),
+        )
+        taker = self.market.buy(5.0, 2005.0)
+        self.assertEqual(self.book.find_matching_orders(taker), [near, near_later, far])
+
+    def test_held_makers_are_skipped(self):
+        held, free = self.market.rest(self.market.sell(1.0, 2000.0), self.market.sell(1.0, 2001.0))
+        match = OrderMatch("m1", self.market.buy(1.0, 2000.0))
+        match.add_maker_order(held, 1.0)
+        self.book.reservations.reserve(match, [(held, 1.0)])
+
+        self.assertEqual(self.book.find_matching_orders(self.market.buy(2.0, 2005.0)), [free])
+
+    def test_taker_only_visits_the_levels_it_consumes(self):
+        self.deep_book(1000)
+        match = self.market.order_book.process_taker_order(self.market.buy(2.5, 3000.0))
+
+        self.assertEqual([fill.fill_amount for fill in match.maker_orders], [1.0, 1.0, 0.5])
+        self.assertLessEqual(self.book.reservations.lookups, 6)
+
+    def test_liquidity_check_stops_once_covered(self):
+        self.deep_book(1000)
+        self.assertTrue(self.book.has_enough_liquidity(self.market.buy(3.0, 3000.0)))
+        self.assertEqual(self.book.reservations.lookups, 6)
+
+        self.book.reservations.lookups = 0
+        self.assertFalse(self.book.has_enough_liquidity(self.market.buy(3.0, 2001.0)))
+        self.assertEqual(self.book.reservations.lookups, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
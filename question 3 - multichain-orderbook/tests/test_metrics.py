@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+import unittest
+from benchmarks.order_flow import InstantBridge
+from execution.cross_chain_manager import CrossChainManager
+from execution.expiry_scheduler import ExpiryScheduler
+from metrics.exporters import render_prometheus
+from metrics.metrics_server import MetricsServer
+from metrics.orderbook_metrics import OrderBookMetrics
+from metrics.registry import MetricsRegistry
+from metrics.sampling_profiler import SamplingProfiler
+from models.order_match import OrderMatch
+from tests.fixtures import Market
+
+
+class OrderBookMetricsTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.market = Market()
+        self.metrics = OrderBookMetrics()
+        self.metrics.track_order_book(self.market.order_book)
+        self.manager = CrossChainManager(self.market.order_book, metrics=self.metrics)
+        bridge = InstantBridge()
+        for source, dest in (("ethereum", "polygon"), ("polygon", "ethereum")):
+            self.manager.register_bridge(source, dest, bridge)
+
+    def expired(self):
+        return self.metrics.cancels["expired"].value
+
+    async def test_lazy_purge_while_matching_is_counted(self):
+        await self.manager.submit_maker_order(self.market.sell(1.0, 2000.0, expiration_time=1))
+        await self.manager.submit_maker_order(self.market.sell(1.0, 2010.0))
+
+        self.assertTrue(await self.manager.process_taker_order(self.market.buy(1.0, 2100.0)))
+        self.assertEqual(self.expired(), 1)
+
+    async def test_scheduler_purge_is_counted_once(self):
+        await self.manager.submit_maker_order(self.market.sell(1.0, 2000.0, expiration_time=1))
+        scheduler = ExpiryScheduler(self.market.order_book)
+        self.assertEqual(len(scheduler.purge_expired()), 1)
+        self.assertEqual(scheduler.purge_expired(), [])
+        self.assertEqual(self.expired(), 1)
+
+    async def test_deferred_eviction_is_counted_when_the_match_settles(self):
+        maker = self.market.sell(1.0, 2000.0, expiration_time=1)
+        await self.manager.submit_maker_order(maker)
+        book = self.market.book()
+        match = OrderMatch("m", self.market.buy(0.5, 2100.0))
+        match.add_maker_order(maker, 0.5)
+        self.manager.reserve_match(match)
+
+        book.purge_expired()
+        self.assertEqual(self.expired(), 0)
+        self.manager.release_match(match)
+        self.assertEqual(self.expired(), 1)
+
+    async def test_rejections_and_stage_latencies_are_recorded(self):
+        await self.manager.submit_maker_order(self.market.sell(1.0, 2000.0))
+        self.assertFalse(await self.manager.process_taker_order(self.market.buy(2.0, 2100.0)))
+        self.assertTrue(await self.manager.process_taker_order(self.market.buy(1.0, 2100.0)))
+
+        snapshot = self.metrics.registry.snapshot()
+        self.assertEqual(snapshot["orderbook_rejections_total"]["reason=liquidity"], 1)
+        self.assertEqual(snapshot["orderbook_matches_total"][""], 1)
+        self.assertEqual(snapshot["orderbook_stage_latency_seconds"]["stage=taker_total"]["count"], 2)
+        self.assertEqual(snapshot["orderbook_stage_latency_seconds"]["stage=settle"]["count"], 1)
+        self.assertEqual(
+            snapshot["orderbook_resting_orders"]["pair=eth/usdc,chains=ethereum/polygon"], 0
+        )
+
+
+class RegistryTest(unittest.IsolatedAsyncioTestCase):
+
+    def test_histogram_buckets_buffered_observations(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency", bounds=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.quantile(0.5), 1.0)
+        self.assertEqual(histogram.quantile(1.0), float("inf"))
+
+    def test_series_are_shared_by_name_and_labels(self):
+        registry = MetricsRegistry()
+        self.assertIs(registry.counter("hits", route="a"), registry.counter("hits", route="a"))
+        self.assertIsNot(registry.counter("hits", route="a"), registry.counter("hits", route="b"))
+        with self.assertRaises(ValueError):
+            registry.gauge("hits")
+
+    def test_prometheus_output_has_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests", path='a"b').inc(3)
+        histogram = registry.histogram("latency_seconds", bounds=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        _, body = render_prometheus(registry)
+        lines = body.decode().splitlines()
+        self.assertIn('requests_total{path="a\\"b"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 2', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn("latency_seconds_count 2", lines)
+
+    async def test_server_serves_every_exporter(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total").inc()
+        server = MetricsServer(registry, port=0)
+        port = await server.start()
+        try:
+            for path, expected in (("/metrics", b"requests_total 1"), ("/missing", b"404")):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+                response = await reader.read()
+                writer.close()
+                self.assertIn(expected, response)
+        finally:
+            await server.stop()
+
+
+class SamplingProfilerTest(unittest.TestCase):
+
+    def test_busy_function_dominates_the_samples(self):
+        def spin():
+            deadline = time.perf_counter() + 0.3
+            while time.perf_counter() < deadline:
+                pass
+
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        spin()
+        profiler.stop()
+
+        self.assertGreater(profiler.samples, 0)
+        top = dict(profiler.get_top_functions(limit=None))
+        spin_share = next(share for frame, share in top.items() if frame.startswith("spin "))
+        self.assertGreater(spin_share, 0.5)
+        self.assertIn("spin (", profiler.get_folded_stacks())
+
+    def test_reading_while_sampling_is_safe(self):
+        stop = threading.Event()
+
+        def recurse(depth):
+            if depth:
+                recurse(depth - 1)
+            else:
+                time.sleep(0.0001)
+
+        def churn():
+            # A different stack depth on every call keeps adding new keys
+            depth = 0
+            while not stop.is_set():
+                recurse(depth)
+                depth = (depth + 1) % 50
+
+        target = threading.Thread(target=churn)
+        target.start()
+        profiler = SamplingProfiler(interval=0.0001, thread_id=target.ident)
+        profiler.start()
+        try:
+            deadline = time.perf_counter() + 0.5
+            while time.perf_counter() < deadline:
+                profiler.get_folded_stacks()
+                profiler.get_top_functions()
+        finally:
+            stop.set()
+            profiler.stop()
+            target.join()
+        self.assertGreater(profiler.samples, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
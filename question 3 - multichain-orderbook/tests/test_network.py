@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+from network.order_client import OrderClient
+from network.order_server import OrderServer
+from network.protocol import (
+    MAX_FRAME_SIZE, OP_DEPTH, encode_frame, decode_frames, encode_order, decode_order,
+    encode_depth, decode_depth
+)
+from models.order import OrderStatus
+from orderbook.pair_key import PairKey
+from tests.fixtures import GatedBridge, Market
+
+
+class ProtocolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+
+    def test_frames_are_split_as_bytes_arrive(self):
+        stream = encode_frame(1, 7, b"abc") + encode_frame(OP_DEPTH, 8) + encode_frame(2, 9, b"x" * 50)
+        buffer = bytearray()
+        frames = []
+        for start in range(0, len(stream), 5):
+            buffer += stream[start:start + 5]
+            frames.extend(decode_frames(buffer))
+        self.assertEqual(frames, [(1, 7, b"abc"), (OP_DEPTH, 8, b""), (2, 9, b"x" * 50)])
+        self.assertEqual(buffer, bytearray())
+
+    def test_oversized_frame_is_refused(self):
+        buffer = bytearray((MAX_FRAME_SIZE + 1).to_bytes(4, "little") + b"\x00" * 5)
+        with self.assertRaises(ValueError):
+            decode_frames(buffer)
+
+    def test_orders_round_trip_in_both_amount_modes(self):
+        fields = lambda o: (o.id, o.maker, o.order_type, o.base_asset, o.quote_asset,
+                            o.base_blockchain, o.quote_blockchain, o.amount, o.price,
+                            o.expiration_time, o.fixed_point)
+        for order in (self.market.sell(1.25, 2000.5, expiration_time=5000),
+                      self.market.buy(10**18 + 1, 2000 * 10**6, fixed_point=True)):
+            decoded = decode_order(encode_order(order), self.market.order_book)
+            self.assertEqual(fields(decoded), fields(order))
+
+    def test_depth_round_trips(self):
+        depth = {"bids": [(1999.5, 0.25), (1999, 3)], "asks": []}
+        self.assertEqual(decode_depth(encode_depth(depth)), depth)
+
+
+class OrderServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.market = Market()
+        self.bridge = GatedBridge()
+        self.bridge.gate.set()
+        self.server = OrderServer(self.market.manager(self.bridge), port=0, max_batch=4)
+        port = await self.server.start()
+        self.client = OrderClient(port=port)
+        await self.client.connect()
+
+    async def asyncTearDown(self):
+        self.bridge.gate.set()
+        await self.client.close()
+        await self.server.stop()
+
+    async def test_pipelined_requests_reach_the_book(self):
+        makers = [self.market.sell(1.0, 2000.0 + tick) for tick in range(10)]
+        self.assertEqual(
+            await asyncio.gather(*(self.client.submit_maker_order(order) for order in makers)),
+            [True] * 10
+        )
+        book = self.market.book()
+        self.assertEqual(book.get_order_count(), 10)
+
+        taker = self.market.buy(1.5, 2001.0)
+        self.assertTrue(await self.client.process_taker_order(taker))
+        self.assertEqual((taker.status, taker.filled_amount), (OrderStatus.FILLED, 1.5))
+
+        self.assertTrue(await self.client.cancel_order(makers[5]))
+        self.assertFalse(await self.client.cancel_order(makers[5]))
+        self.assertTrue(await self.client.reduce_order(makers[2], 0.5))
+        self.assertTrue(await self.client.replace_order(makers[3], price=2002.0))
+        depth = await self.client.get_depth(book.pair_key, levels=3)
+        self.assertEqual(depth, {"bids": [], "asks": [(2001.0, 0.5), (2002.0, 1.5), (2004.0, 1.0)]})
+
+    async def test_replies_after_a_take_wait_for_its_settlement(self):
+        await self.client.submit_maker_order(self.market.sell(1.0, 2000.0))
+        self.bridge.gate.clear()
+        take = asyncio.ensure_future(self.client.process_taker_order(self.market.buy(1.0, 2000.0)))
+        depth = asyncio.ensure_future(self.client.get_depth(self.market.book().pair_key))
+        await asyncio.sleep(0.05)
+        self.assertFalse(take.done() or depth.done())
+
+        self.bridge.gate.set()
+        self.assertTrue(await take)
+        self.assertEqual(await depth, {"bids": [], "asks": [(2000.0, 1.0)]})
+
+    async def test_failures_come_back_as_errors(self):
+        self.market.order_book.supported_assets.pop("usdc")
+        with self.assertRaises(RuntimeError):
+            await self.client.submit_maker_order(self.market.sell(1.0, 2000.0))
+        # The connection stays usable
+        self.assertIsNone(await self.client.get_depth(PairKey("eth", "btc", "ethereum", "polygon")))
+
+    async def test_bad_frame_drops_the_connection(self):
+        # A frame too short to hold a header, followed by a valid request
+        self.client._transport.write(b"\x00\x00\x00\x00")
+        with self.assertRaises(ConnectionError):
+            await asyncio.wait_for(self.client.get_depth(self.market.book().pair_key), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from models.order import OrderStatus
+from models.order_match import OrderMatch
+from tests.fixtures import Market
+
+
+class OrderAmendmentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+        self.manager = self.market.manager()
+        self.first, self.second, self.third = self.market.rest(
+            self.market.sell(2.0, 2000.0), self.market.sell(2.0, 2000.0),
+            self.market.sell(2.0, 2001.0),
+        )
+
+    def hold(self, order, amount):
+        match = OrderMatch("m1", self.market.buy(amount, 2001.0))
+        match.add_maker_order(order, amount)
+        self.manager.reserve_match(match)
+        return match
+
+    def test_reduce_keeps_the_queue_position(self):
+        self.assertTrue(self.manager.reduce_order(self.first.id, 1.5))
+        self.assertEqual(self.book.sell_orders, [self.first, self.second, self.third])
+        self.assertEqual(self.book.get_depth()["asks"], [(2000.0, 3.5), (2001.0, 2.0)])
+
+    def test_reduce_must_shrink_and_leave_something(self):
+        self.book.apply_fill(self.first, 0.5)
+        for new_amount in (2.0, 3.0, 0.5, 0.25):
+            self.assertFalse(self.manager.reduce_order(self.first.id, new_amount), new_amount)
+        self.assertEqual(self.first.amount, 2.0)
+        self.assertFalse(self.manager.reduce_order("missing", 1.0))
+
+    def test_reduce_cannot_cut_into_held_liquidity(self):
+        self.hold(self.first, 1.5)
+        self.assertFalse(self.manager.reduce_order(self.first.id, 1.0))
+        self.assertTrue(self.manager.reduce_order(self.first.id, 1.5))
+
+    def test_replace_sends_the_order_to_the_back(self):
+        self.assertTrue(self.manager.replace_order(self.first.id, amount=3.0))
+        self.assertEqual(self.book.sell_orders, [self.second, self.first, self.third])
+
+        self.assertTrue(self.manager.replace_order(self.third.id, price=1999.0))
+        self.assertEqual(self.book.sell_orders, [self.third, self.second, self.first])
+        self.assertEqual(self.book.get_depth()["asks"], [(1999.0, 2.0), (2000.0, 5.0)])
+
+    def test_held_orders_cannot_be_replaced_or_cancelled(self):
+        match = self.hold(self.first, 0.5)
+        self.assertFalse(self.manager.replace_order(self.first.id, price=1999.0))
+        self.assertFalse(self.manager.cancel_order(self.first.id))
+
+        self.manager.release_match(match)
+        self.assertTrue(self.manager.cancel_order(self.first.id))
+        self.assertEqual(self.first.status, OrderStatus.CANCELLED)
+        self.assertIsNone(self.market.order_book.get_order(self.first.id))
+
+    def test_fixed_point_amendments_need_integers(self):
+        order = self.market.rest(self.market.sell(
+            2 * 10**18, 2000 * 10**6, base_chain=self.market.polygon, fixed_point=True
+        ))
+        self.assertFalse(self.manager.reduce_order(order.id, 1.5))
+        self.assertFalse(self.manager.replace_order(order.id, price=2000.5))
+        self.assertTrue(self.manager.reduce_order(order.id, 10**18))
+
+
+class OrderIdIndexTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_ids_are_unique_across_books(self):
+        market = Market()
+        manager = market.manager()
+        order = market.sell(1.0, 2000.0, id="same")
+        self.assertTrue(await manager.submit_maker_order(order))
+
+        elsewhere = market.sell(1.0, 2000.0, id="same", base_chain=market.polygon)
+        self.assertFalse(await manager.submit_maker_order(elsewhere))
+        self.assertEqual(elsewhere.status, OrderStatus.FAILED)
+        self.assertIs(market.order_book.get_order_book_for_id("same"), market.book())
+
+        # Once the first order leaves its book the ID is free again
+        self.assertTrue(manager.cancel_order("same"))
+        self.assertIsNone(market.order_book.get_order_book_for_id("same"))
+        elsewhere = market.sell(1.0, 2000.0, id="same", base_chain=market.polygon)
+        self.assertTrue(await manager.submit_maker_order(elsewhere))
+        self.assertIs(market.order_book.get_order_book_for_id("same"),
+                      market.book(market.polygon, market.polygon))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from benchmarks.order_memory import (
+    LegacyOrder, LegacyOrderMatch, make_matches, make_orders, traced
+)
+from models.order import Order
+from models.order_match import OrderMatch
+from tests.fixtures import Market
+
+
+class SlottedLayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+
+    def test_order_and_match_carry_no_instance_dict(self):
+        maker = self.market.sell(1.0, 2000.0)
+        match = OrderMatch("m1", self.market.buy(0.5, 2000.0))
+        match.add_maker_order(maker, 0.5)
+        for obj in (maker, match, match.maker_orders[0]):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+        with self.assertRaises(AttributeError):
+            maker.note = "extra"
+
+    def test_maker_fill_keeps_dict_style_lookups(self):
+        maker = self.market.sell(1.0, 2000.0)
+        match = OrderMatch("m1", self.market.buy(0.75, 2000.0))
+        match.add_maker_order(maker, 0.75)
+        fill = match.maker_orders[0]
+        self.assertIs(fill["order"], maker)
+        self.assertEqual(fill["fill_amount"], 0.75)
+        with self.assertRaises(KeyError):
+            fill["price"]
+        self.assertEqual(match.get_total_fill_amount(), 0.75)
+
+
+class OrderMemoryBenchmarkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.assets = (self.market.eth, self.market.usdc)
+        self.blockchains = (self.market.ethereum, self.market.polygon)
+
+    def test_legacy_order_has_the_same_fields_as_before_slots(self):
+        legacy = make_orders(LegacyOrder, 1, self.assets, self.blockchains)[0]
+        compact = make_orders(Order, 1, self.assets, self.blockchains)[0]
+        # Only the fields added alongside __slots__ are missing from the legacy layout
+        self.assertEqual(
+            set(Order.__slots__) - set(vars(legacy)), {"pair_key", "fixed_point"}
+        )
+        for field in vars(legacy):
+            if field != "timestamp":
+                self.assertEqual(getattr(legacy, field), getattr(compact, field), field)
+
+    def test_slotted_layout_retains_less_memory(self):
+        legacy = traced(lambda: make_orders(LegacyOrder, 5000, self.assets, self.blockchains))
+        compact = traced(lambda: make_orders(Order, 5000, self.assets, self.blockchains))
+        self.assertLess(compact, legacy)
+
+        orders = make_orders(Order, 10, self.assets, self.blockchains)
+        legacy = traced(lambda: make_matches(LegacyOrderMatch, 2000, 3, orders))
+        compact = traced(lambda: make_matches(OrderMatch, 2000, 3, orders))
+        self.assertLess(compact, legacy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from models.asset import Asset
+from models.blockchain import Blockchain
+from orderbook.pair_key import PairKey
+from tests.fixtures import Market
+
+
+class PairKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+
+    def test_ids_with_separators_do_not_collide(self):
+        # Both joined as "a_b_c_d" under the old string keys
+        self.assertNotEqual(PairKey("a_b", "c", "d", "e"), PairKey("a", "b_c", "d", "e"))
+
+    def test_book_interns_the_key_it_is_stored_under(self):
+        book = self.market.book()
+        key = PairKey("eth", "usdc", "ethereum", "polygon")
+        self.assertIsNot(key, book.pair_key)
+        self.assertIs(self.market.order_book.order_books[key], book)
+        self.assertIs(next(iter(self.market.order_book.order_books)), book.pair_key)
+        self.assertIs(self.market.book(), book)
+
+    def test_order_caches_the_interned_key(self):
+        book = self.market.book()
+        order = self.market.sell(1.0, 2000.0)
+        self.assertIsNone(order.pair_key)
+        self.assertIs(self.market.order_book.get_order_book_for(order), book)
+        self.assertIs(order.pair_key, book.pair_key)
+
+        other = self.market.sell(1.0, 2000.0)
+        book.add_order(other)
+        self.assertIs(other.pair_key, book.pair_key)
+
+    def test_unknown_pair_has_no_book(self):
+        order = self.market.sell(1.0, 2000.0)
+        self.assertIsNone(self.market.order_book.get_order_book_for(order))
+        self.assertEqual(order.pair_key, PairKey("eth", "usdc", "ethereum", "polygon"))
+        self.assertEqual(self.market.order_book.order_books, {})
+
+    def test_underscored_ids_get_separate_books(self):
+        order_book = self.market.order_book
+        for asset_id in ("a_b", "c", "a", "b_c"):
+            order_book.add_asset(Asset(asset_id, asset_id.upper(), asset_id, 18))
+        order_book.add_blockchain(Blockchain("d", "D", 1, lambda: 1e-9))
+        first = order_book.get_or_create_order_book("a_b", "c", "d", "d")
+        second = order_book.get_or_create_order_book("a", "b_c", "d", "d")
+        self.assertIsNot(first, second)
+        self.assertEqual(len(order_book.order_books), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import tempfile
+import unittest
+from models.fixed_point import to_units
+from models.order import OrderStatus
+from persistence.order_journal import OrderJournal
+from persistence.write_ahead_log import WriteAheadLog
+from tests.fixtures import Market
+
+
+class WriteAheadLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def write(self, *payloads):
+        wal = WriteAheadLog(self.directory, sync_interval=0)
+        lsns = [wal.append(1, payload) for payload in payloads]
+        wal.close()
+        return lsns
+
+    def replay(self, after_lsn=0):
+        wal = WriteAheadLog(self.directory, sync_interval=0)
+        try:
+            return [(lsn, payload) for lsn, _, payload in wal.replay(after_lsn)], wal.last_lsn
+        finally:
+            wal.close()
+
+    def segment(self):
+        (name,) = os.listdir(self.directory)
+        return os.path.join(self.directory, name)
+
+    def test_records_survive_a_reopen(self):
+        self.assertEqual(self.write(b"a", b"bb"), [1, 2])
+        self.assertEqual(self.write(b"ccc"), [3])
+        self.assertEqual(self.replay(), ([(1, b"a"), (2, b"bb"), (3, b"ccc")], 3))
+        self.assertEqual(self.replay(after_lsn=2)[0], [(3, b"ccc")])
+
+    def test_torn_tail_is_cut_off(self):
+        self.write(b"first", b"second")
+        path = self.segment()
+        size = os.path.getsize(path)
+        # A crash midway through writing the third record
+        with open(path, "ab") as f:
+            f.write(b"\x01\x02\x03\x04\x05\x00")
+
+        self.assertEqual(self.replay(), ([(1, b"first"), (2, b"second")], 2))
+        self.assertEqual(os.path.getsize(path), size)
+        self.assertEqual(self.write(b"third"), [3])
+        self.assertEqual(self.replay()[0][-1], (3, b"third"))
+
+    def test_corrupt_record_ends_the_log(self):
+        self.write(b"first", b"second", b"third")
+        path = self.segment()
+        with open(path, "r+b") as f:
+            data = f.read()
+            f.seek(data.index(b"second"))
+            f.write(b"SECOND")
+
+        self.assertEqual(self.replay(), ([(1, b"first")], 1))
+
+    def test_rotated_segments_are_purged_once_covered(self):
+        wal = WriteAheadLog(self.directory, sync_interval=0)
+        wal.append(1, b"a")
+        wal.rotate()
+        wal.append(1, b"b")
+        wal.flush()
+        self.assertEqual(len(wal.list_segments()), 2)
+        self.assertEqual(wal.purge_segments(1), 1)
+        self.assertEqual([(lsn, payload) for lsn, _, payload in wal.replay()], [(2, b"b")])
+        wal.close()
+
+
+class OrderJournalTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.market, self.manager = self.open()
+
+    async def asyncTearDown(self):
+        await self.manager.journal.stop()
+
+    def open(self):
+        market = Market()
+        journal = OrderJournal(market.order_book, self.directory, sync_interval=0)
+        return market, market.manager(journal=journal)
+
+    async def reopen(self):
+        await self.manager.journal.stop()
+        self.market, self.manager = self.open()
+        return self.manager.journal.recover()
+
+    @staticmethod
+    def state(market):
+        return {
+            key: [
+                (order.id, order.order_type, order.status, order.amount, order.price,
+                 order.timestamp, order.filled_amount, order.expiration_time)
+                for order in book.buy_orders + book.sell_orders
+            ]
+            for key, book in market.order_book.order_books.items()
+        }
+
+    async def trade(self, market, manager, ids):
+        for order_id, price in zip(ids, (2000.0, 2001.0, 2002.0, 2003.0)):
+            await manager.submit_maker_order(market.sell(1.0, price, id=order_id))
+        await manager.submit_maker_order(market.buy(2.0, 1990.0, expiration_time=10**13))
+        await manager.process_taker_order(market.buy(1.5, 2005.0))
+        manager.cancel_order(ids[2])
+        manager.reduce_order(ids[3], 0.5)
+        manager.replace_order(ids[1], price=2004.0)
+
+    async def test_wal_alone_rebuilds_the_books(self):
+        await self.trade(self.market, self.manager, [1, 2, "c", "d"])
+        expected = self.state(self.market)
+
+        self.assertEqual(await self.reopen(), 10)
+        self.assertEqual(self.state(self.market), expected)
+        # Integer IDs come back as integers
+        self.assertIsNotNone(self.market.order_book.get_order(2))
+
+    async def test_snapshot_plus_tail_rebuilds_the_books(self):
+        await self.trade(self.market, self.manager, ["a", "b", "c", "d"])
+        await self.manager.journal.snapshot()
+        await self.trade(self.market, self.manager, ["e", "f", "g", "h"])
+        expected = self.state(self.market)
+
+        # Only the records after the snapshot are replayed
+        self.assertEqual(await self.reopen(), 10)
+        self.assertEqual(self.state(self.market), expected)
+
+    async def test_corrupt_snapshot_falls_back_to_the_previous_one(self):
+        await self.trade(self.market, self.manager, ["a", "b", "c", "d"])
+        await self.manager.journal.snapshot()
+        await self.trade(self.market, self.manager, ["e", "f", "g", "h"])
+        await self.manager.journal.snapshot()
+        await self.trade(self.market, self.manager, ["i", "j", "k", "l"])
+        expected = self.state(self.market)
+
+        _, newest = self.manager.journal.snapshots.list_snapshots()[-1]
+        with open(newest, "r+b") as f:
+            f.seek(40)
+            f.write(b"\xff\xff")
+
+        self.assertEqual(await self.reopen(), 20)
+        self.assertEqual(self.state(self.market), expected)
+
+    async def test_fixed_point_amounts_are_exact(self):
+        eth = self.market.eth
+        amount = to_units(1.123456789012345678, eth.decimals)
+        maker = self.market.sell(amount, 2000 * 10**6, fixed_point=True)
+        await self.manager.submit_maker_order(maker)
+        await self.manager.process_taker_order(
+            self.market.buy(to_units(0.1, eth.decimals), 2000 * 10**6, fixed_point=True)
+        )
+
+        await self.reopen()
+        recovered = self.market.order_book.get_order(maker.id)
+        self.assertEqual(recovered.amount, amount)
+        self.assertEqual(recovered.filled_amount, to_units(0.1, eth.decimals))
+        self.assertEqual(recovered.status, OrderStatus.PARTIALLY_FILLED)
+        self.assertTrue(recovered.fixed_point)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from models.order import OrderStatus
+from models.order_match import OrderMatch
+from tests.fixtures import Market
+
+
+class ReservationLedgerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+
+    def reserve(self, *fills):
+        match = OrderMatch(f"m{len(fills)}", self.market.buy(1.0, 2100.0))
+        for order, amount in fills:
+            match.add_maker_order(order, amount)
+        self.book.reservations.reserve(match, fills)
+        return match
+
+    def test_reserve_is_all_or_nothing(self):
+        first = self.market.sell(1.0, 2000.0)
+        second = self.market.sell(1.0, 2000.0)
+        self.book.add_order(first)
+        self.book.add_order(second)
+
+        with self.assertRaises(ValueError):
+            self.reserve((first, 0.5), (second, 1.5))
+        self.assertEqual(self.book.reservations.get_reserved_amount(first), 0)
+        self.assertEqual(self.book.reservations.get_available_amount(second), 1.0)
+
+    def test_held_liquidity_is_hidden_until_released(self):
+        maker = self.market.sell(1.0, 2000.0)
+        self.book.add_order(maker)
+        match = self.reserve((maker, 0.75))
+
+        self.assertEqual(self.book.reservations.get_available_amount(maker), 0.25)
+        with self.assertRaises(ValueError):
+            self.reserve((maker, 0.5))
+
+        self.book.release_reservation(match)
+        self.assertFalse(self.book.reservations.holds(match))
+        self.assertEqual(self.book.reservations.get_available_amount(maker), 1.0)
+
+    def test_commit_after_fill_leaves_the_remainder_available(self):
+        maker = self.market.sell(1.0, 2000.0)
+        self.book.add_order(maker)
+        match = self.reserve((maker, 0.75))
+
+        self.assertTrue(self.book.apply_fill(maker, 0.75))
+        self.book.commit_reservation(match)
+        self.assertEqual(self.book.reservations.get_available_amount(maker), 0.25)
+        self.assertEqual(self.book.get_depth()["asks"], [(2000.0, 0.25)])
+
+    def test_expired_order_stays_until_its_match_settles(self):
+        maker = self.market.sell(2.0, 2000.0, id="m1", expiration_time=1000)
+        self.book.add_order(maker)
+        match = self.reserve((maker, 1.0))
+
+        # Expired while held: the purge must not evict it yet
+        self.assertEqual(self.book.purge_expired(now=2000), [])
+        self.assertIs(self.book.get_order("m1"), maker)
+        self.assertEqual(maker.status, OrderStatus.PENDING)
+
+        self.assertTrue(self.book.apply_fill(maker, 1.0))
+        evicted = self.book.commit_reservation(match)
+        self.assertEqual(evicted, [maker])
+        self.assertEqual(maker.status, OrderStatus.CANCELLED)
+        self.assertEqual(maker.filled_amount, 1.0)
+        self.assertIsNone(self.book.get_order("m1"))
+        self.assertEqual(self.book.get_depth()["asks"], [])
+
+    def test_expired_order_is_evicted_when_its_match_fails(self):
+        maker = self.market.sell(1.0, 2000.0, expiration_time=1000)
+        self.book.add_order(maker)
+        match = self.reserve((maker, 1.0))
+        self.book.purge_expired(now=2000)
+
+        self.assertEqual(self.book.release_reservation(match), [maker])
+        self.assertEqual(maker.status, OrderStatus.CANCELLED)
+        self.assertEqual(self.book.get_order_count(), 0)
+
+    def test_fill_is_refused_once_the_order_left_the_book(self):
+        maker = self.market.sell(1.0, 2000.0)
+        self.book.add_order(maker)
+        self.book.remove_order(maker.id)
+        maker.status = OrderStatus.CANCELLED
+
+        self.assertFalse(self.book.apply_fill(maker, 0.5))
+        self.assertEqual(maker.status, OrderStatus.CANCELLED)
+        self.assertEqual(maker.filled_amount, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
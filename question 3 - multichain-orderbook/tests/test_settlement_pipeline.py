@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from execution.settlement_pipeline import SettlementPipeline
+from models.order import OrderStatus
+from tests.fixtures import GatedBridge, Market
+
+
+class SettlementPipelineTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.market = Market()
+        self.book = self.market.book()
+        self.maker = self.market.rest(self.market.sell(2.0, 2000.0))
+        self.bridge = GatedBridge()
+        self.pipeline = SettlementPipeline(
+            self.market.manager(self.bridge), num_workers=2, max_queue_size=1
+        )
+
+    async def asyncTearDown(self):
+        self.bridge.gate.set()
+        await self.pipeline.stop()
+
+    async def test_matching_does_not_wait_for_settlement(self):
+        self.pipeline.start()
+        first = await self.pipeline.submit_taker_order(self.market.buy(1.5, 2000.0))
+        await asyncio.sleep(0)
+        second = await self.pipeline.submit_taker_order(self.market.buy(1.0, 2000.0))
+
+        # The first match holds its liquidity, so the second is rejected
+        self.assertFalse(first.done())
+        self.assertFalse(await second)
+        self.assertEqual(self.book.reservations.get_available_amount(self.maker), 0.5)
+        self.assertEqual(self.pipeline.get_in_flight_count(), 1)
+
+        self.bridge.gate.set()
+        self.assertTrue(await first)
+        self.assertEqual(self.maker.filled_amount, 1.5)
+        self.assertEqual(self.maker.status, OrderStatus.PARTIALLY_FILLED)
+        self.assertEqual((self.pipeline.settled_count, self.pipeline.failed_count), (1, 0))
+
+    async def test_failed_settlement_hands_liquidity_back(self):
+        self.bridge.succeed = False
+        self.pipeline.start()
+        result = await self.pipeline.submit_taker_order(self.market.buy(2.0, 2000.0))
+        self.bridge.gate.set()
+
+        self.assertFalse(await result)
+        self.assertEqual(self.pipeline.failed_count, 1)
+        self.assertEqual(self.maker.filled_amount, 0)
+        self.assertEqual(self.book.reservations.get_available_amount(self.maker), 2.0)
+
+    async def test_full_queue_holds_up_the_submitter(self):
+        # No workers yet, so the queue fills up
+        await self.pipeline.submit_taker_order(self.market.buy(0.5, 2000.0))
+        blocked = asyncio.ensure_future(
+            self.pipeline.submit_taker_order(self.market.buy(0.5, 2000.0))
+        )
+        await asyncio.sleep(0.01)
+        self.assertFalse(blocked.done())
+        self.assertEqual(self.pipeline.get_queue_depth(), 1)
+        self.assertEqual(self.pipeline.get_in_flight_count(), 2)
+
+        self.pipeline.start()
+        self.bridge.gate.set()
+        self.assertTrue(await (await asyncio.wait_for(blocked, 1)))
+        await self.pipeline.stop()
+        self.assertEqual(self.maker.filled_amount, 1.0)
+        self.assertEqual(self.pipeline.get_in_flight_count(), 0)
+
+    async def test_stop_without_draining_releases_queued_matches(self):
+        result = await self.pipeline.submit_taker_order(self.market.buy(2.0, 2000.0))
+        await self.pipeline.stop(drain=False)
+
+        self.assertFalse(await result)
+        self.assertEqual(self.pipeline.get_queue_depth(), 0)
+        self.assertEqual(self.book.reservations.get_available_amount(self.maker), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
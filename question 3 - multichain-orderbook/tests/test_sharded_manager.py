@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+from benchmarks.order_flow import InstantBridge
+from execution.sharded_manager import ShardedCrossChainManager, decode_order, encode_order
+from models.order import OrderStatus
+from tests.fixtures import Market
+
+
+class ShardedManagerTest(unittest.IsolatedAsyncioTestCase):
+    """
+    ShardedCrossChainManager with two forked shards.
+    """
+
+    def setUp(self):
+        # Shards fork, which must happen before the test's event loop runs
+        self.market = Market()
+        self.manager = ShardedCrossChainManager(self.market.order_book, num_shards=2)
+        bridge = InstantBridge()
+        for source, dest in (("ethereum", "polygon"), ("polygon", "ethereum"),
+                             ("ethereum", "ethereum")):
+            self.manager.register_bridge(source, dest, bridge)
+        self.manager.start()
+        self.processes = list(self.manager._processes)
+
+    async def asyncTearDown(self):
+        await self.manager.stop()
+
+    def test_orders_survive_encoding(self):
+        order = self.market.sell(1.5, 2000.0, id=7, expiration_time=123)
+        order.filled_amount = 0.5
+        order.status = OrderStatus.PARTIALLY_FILLED
+        decoded = decode_order(encode_order(order), self.market.order_book)
+        self.assertEqual(encode_order(decoded), encode_order(order))
+        self.assertIs(decoded.base_asset, self.market.eth)
+
+    async def test_fills_are_mirrored_onto_submitted_makers(self):
+        makers = [self.market.sell(1.0, 2000.0 + i) for i in range(3)]
+        # A second pair, which may hash to the other shard
+        other = self.market.sell(1.0, 2000.0, quote_chain=self.market.ethereum)
+        self.assertEqual(await self.manager.submit_maker_orders(makers + [other]), [True] * 4)
+
+        takers = [
+            self.market.buy(1.5, 2100.0),
+            self.market.buy(1.0, 2100.0, quote_chain=self.market.ethereum),
+            self.market.buy(5.0, 2100.0),
+        ]
+        self.assertEqual(await self.manager.process_taker_orders(takers), [True, True, False])
+        self.assertEqual(takers[0].status, OrderStatus.FILLED)
+        self.assertEqual([maker.status for maker in makers],
+                         [OrderStatus.FILLED, OrderStatus.PARTIALLY_FILLED, OrderStatus.ACTIVE])
+        self.assertEqual(makers[1].filled_amount, 0.5)
+        self.assertEqual(other.status, OrderStatus.FILLED)
+
+    async def test_stop_waits_for_a_request_still_being_written(self):
+        # Large enough that the sender thread is still writing it when
+        # stop runs, so the stop sentinel has to queue behind it
+        makers = [self.market.sell(1.0, 2000.0 + i % 50) for i in range(20000)]
+        request = asyncio.ensure_future(self.manager.submit_maker_orders(makers))
+        await asyncio.sleep(0.01)
+        await self.manager.stop()
+
+        # The request was written whole, and handled before the sentinel
+        self.assertEqual(await asyncio.wait_for(request, 1), [True] * len(makers))
+        # Shards exit on the sentinel rather than on a broken frame or a kill
+        self.assertEqual([process.exitcode for process in self.processes], [0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from models.order import OrderStatus
+from orderbook.smart_order_router import SmartOrderRouter, settlement_chains
+from tests.fixtures import Market
+
+
+def list_everywhere(market):
+    # Both assets have contracts on both chains, so any book can be routed to
+    for asset in (market.eth, market.usdc):
+        for blockchain in (market.ethereum, market.polygon):
+            asset.add_blockchain_address(blockchain.id, "0x" + "1" * 40)
+
+
+class SmartOrderRouterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.market = Market()
+        list_everywhere(self.market)
+        self.ethereum, self.polygon = self.market.ethereum, self.market.polygon
+
+    def rest(self, amount, price, base_chain, quote_chain):
+        return self.market.rest(self.market.sell(
+            amount, price, base_chain=base_chain, quote_chain=quote_chain
+        ))
+
+    def fills(self, matches):
+        return [
+            ((match.maker_orders[0].order.base_blockchain.id,
+              match.maker_orders[0].order.quote_blockchain.id),
+             [(fill.order.price, fill.fill_amount) for fill in match.maker_orders])
+            for match in matches
+        ]
+
+    def test_taker_reaches_books_on_other_chains(self):
+        self.rest(1.0, 2000.0, self.ethereum, self.ethereum)
+        self.rest(1.0, 2001.0, self.polygon, self.polygon)
+        self.rest(5.0, 2002.0, self.ethereum, self.polygon)
+        taker = self.market.buy(3.0, 2005.0)
+
+        matches = SmartOrderRouter(self.market.order_book).route(taker)
+        self.assertEqual(sorted(self.fills(matches)), [
+            (("ethereum", "ethereum"), [(2000.0, 1.0)]),
+            (("ethereum", "polygon"), [(2002.0, 1.0)]),
+            (("polygon", "polygon"), [(2001.0, 1.0)]),
+        ])
+
+    def test_allowed_chains_limit_the_books(self):
+        self.rest(1.0, 2000.0, self.ethereum, self.ethereum)
+        self.rest(5.0, 2002.0, self.ethereum, self.polygon)
+        router = SmartOrderRouter(self.market.order_book)
+        matches = router.route(self.market.buy(3.0, 2005.0), {("ethereum", "polygon")})
+        self.assertEqual(self.fills(matches), [(("ethereum", "polygon"), [(2002.0, 3.0)])])
+
+    def test_books_are_ranked_net_of_bridge_costs(self):
+        # The taker's own book is cheaper by 1, but its fills bridge both
+        # legs between ethereum and polygon; the polygon book's stay on polygon
+        self.rest(3.0, 2000.0, self.ethereum, self.polygon)
+        self.rest(3.0, 2001.0, self.polygon, self.polygon)
+        bridge_cost = lambda source, dest, asset: 6.0
+        router = SmartOrderRouter(self.market.order_book, bridge_cost_estimator=bridge_cost)
+
+        matches = router.route(self.market.buy(3.0, 2005.0))
+        self.assertEqual(self.fills(matches), [(("polygon", "polygon"), [(2001.0, 3.0)])])
+
+        # Free bridging: the cheaper book wins again
+        matches = SmartOrderRouter(self.market.order_book).route(self.market.buy(3.0, 2005.0))
+        self.assertEqual(self.fills(matches), [(("ethereum", "polygon"), [(2000.0, 3.0)])])
+
+    def test_legs_run_between_the_book_and_the_taker_chains(self):
+        taker = self.market.buy(1.0, 2000.0)  # ETH on ethereum, USDC on polygon
+        base_leg, quote_leg = settlement_chains(taker, self.polygon, self.ethereum)
+        # Seller's ETH comes from the book's base chain to the taker's quote chain
+        self.assertEqual(base_leg, (self.polygon, self.polygon))
+        self.assertEqual(quote_leg, (self.polygon, self.polygon))
+
+        seller = self.market.sell(1.0, 2000.0)
+        base_leg, quote_leg = settlement_chains(seller, self.polygon, self.ethereum)
+        self.assertEqual(base_leg, (self.ethereum, self.ethereum))
+        self.assertEqual(quote_leg, (self.ethereum, self.ethereum))
+
+
+class RoutedSettlementTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_every_share_settles(self):
+        market = Market()
+        list_everywhere(market)
+        here = market.rest(market.sell(1.0, 2001.0))
+        there = market.rest(market.sell(1.0, 2000.0, base_chain=market.polygon))
+        taker = market.buy(2.0, 2005.0)
+
+        self.assertTrue(await market.manager().process_routed_taker_order(taker))
+        self.assertEqual((here.status, there.status), (OrderStatus.FILLED, OrderStatus.FILLED))
+        self.assertEqual(taker.filled_amount, 2.0)
+        self.assertEqual(taker.status, OrderStatus.FILLED)
+
+
+if __name__ == "__main__":
+    unittest.main()